@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+## Copyright 2016-2025 by LivingLogic AG, Bayreuth/Germany
+##
+## All Rights Reserved
+
+"""
+Memory benchmark for records with fully materialized fields.
+
+This creates a synthetic app (without any database connection) with string,
+int, bool, lookup and geo controls and a number of records for it. Then it
+reports how many bytes each record (including its :class:`~ll.la.Field`
+objects, :class:`~ll.la.Geo` values etc.) needs.
+
+To compare the memory usage of two versions of :mod:`ll.la` run the script
+once with each version.
+
+Usage::
+
+	python bench/bench_memory.py --records 10000 --controls 20
+"""
+
+import sys, argparse, tracemalloc
+
+from ll import la
+
+
+def make_app(controlcount):
+	"""
+	Create an app with ``controlcount`` controls of various types.
+	"""
+	app = la.App(id="bench", name="Benchmark")
+	app.globals = la.Globals()
+
+	lookupdata = {f"option{i}": la.LookupItem(id=f"option{i}", key=f"option{i}", label=f"Option {i}") for i in range(10)}
+
+	controls = {}
+	for i in range(controlcount):
+		match i % 5:
+			case 0:
+				control = la.StringControl(id=f"c{i}", identifier=f"string{i}", fieldname=f"c{i}", label=f"String {i}")
+			case 1:
+				control = la.IntControl(id=f"c{i}", identifier=f"int{i}", fieldname=f"c{i}", label=f"Int {i}")
+			case 2:
+				control = la.BoolControl(id=f"c{i}", identifier=f"bool{i}", fieldname=f"c{i}", label=f"Bool {i}")
+			case 3:
+				control = la.LookupSelectControl(id=f"c{i}", identifier=f"lookup{i}", fieldname=f"c{i}", label=f"Lookup {i}", lookupdata=lookupdata)
+			case 4:
+				control = la.GeoControl(id=f"c{i}", identifier=f"geo{i}", fieldname=f"c{i}", label=f"Geo {i}")
+		control.app = app
+		control.order = i * 10
+		controls[control.identifier] = control
+	app.controls = controls
+	return (app, list(lookupdata.values()))
+
+
+def make_values(app, lookupitems, i):
+	values = {}
+	for control in app.controls.values():
+		if isinstance(control, la.StringControl):
+			values[control.identifier] = f"Value {i}"
+		elif isinstance(control, la.IntControl):
+			values[control.identifier] = i
+		elif isinstance(control, la.BoolControl):
+			values[control.identifier] = bool(i % 2)
+		elif isinstance(control, la.LookupControl):
+			values[control.identifier] = lookupitems[i % len(lookupitems)]
+		elif isinstance(control, la.GeoControl):
+			values[control.identifier] = la.Geo(49.95 + i / 100000, 11.57, f"Location {i}")
+	return values
+
+
+def measure(factory, count):
+	"""
+	Return the average number of bytes allocated by calling ``factory``.
+	"""
+	tracemalloc.start()
+	before = tracemalloc.take_snapshot()
+	objects = [factory() for i in range(count)]
+	after = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+	# Subtract the list itself
+	size = sum(stat.size_diff for stat in after.compare_to(before, "filename")) - sys.getsizeof(objects)
+	return size / count
+
+
+def main(args=None):
+	p = argparse.ArgumentParser(description="Measure the memory used by LivingAPI records")
+	p.add_argument("-r", "--records", dest="records", help="Number of records (default %(default)s)", type=int, default=10000)
+	p.add_argument("-c", "--controls", dest="controls", help="Number of controls in the app (default %(default)s)", type=int, default=20)
+	args = p.parse_args(args)
+
+	(app, lookupitems) = make_app(args.controls)
+	valuesets = [make_values(app, lookupitems, i) for i in range(args.records)]
+
+	tracemalloc.start()
+	before = tracemalloc.take_snapshot()
+	records = []
+	for values in valuesets:
+		record = app(**values)
+		record.fields # Make sure that all fields are materialized
+		records.append(record)
+	after = tracemalloc.take_snapshot()
+	tracemalloc.stop()
+
+	size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+	print(f"Python {sys.version.split()[0]}")
+	print(f"{args.records:,} records with {args.controls} fields each")
+	print(f"total: {size:,} bytes")
+	print(f"per record: {size/args.records:,.0f} bytes")
+	print(f"per field: {size/(args.records*args.controls):,.0f} bytes")
+
+	print("per object (without referenced objects):")
+	field = records[0].fields[next(iter(app.controls))]
+	control = field.control
+	record = records[0]
+	for (name, factory) in (
+		(field.__class__.__qualname__, lambda: field.__class__(control, record, None)),
+		("Geo", lambda: la.Geo(49.95, 11.57, "Location")),
+		("LookupItem", lambda: la.LookupItem(id="option", key="option", label="Option")),
+		("ViewLookupItem", lambda: la.ViewLookupItem(id="option", key="option", label="Option", visible=True)),
+	):
+		print(f"	{name}: {measure(factory, args.records):,.0f} bytes")
+
+
+if __name__ == "__main__":
+	main()
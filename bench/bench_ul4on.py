@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+## Copyright 2016-2025 by LivingLogic AG, Bayreuth/Germany
+##
+## All Rights Reserved
+
+"""
+Benchmark for decoding and encoding UL4ON dumps of LivingAPI objects.
+
+This compares the generic implementation of :meth:`ll.la.Base.ul4onload` and
+:meth:`ll.la.Base.ul4ondump` with the specialized versions that are enabled
+via :func:`ll.la.specialize_ul4on`. Loading is measured both with type checks
+and with a trusted decoder (see :attr:`ll.la.handlers.Handler.trusted`).
+
+Usage::
+
+	python bench/bench_ul4on.py --count 10000 --repeat 5
+"""
+
+import argparse, timeit
+
+from ll import ul4on, la
+
+
+def make_objects(count):
+	"""
+	Create a list of ``count`` groups of LivingAPI objects that can be created
+	without any database connection.
+	"""
+	objects = []
+	for i in range(count):
+		objects.append(la.Geo(49.95 + i / count, 11.57, f"Location {i}"))
+		objects.append(la.LookupItem(id=f"li{i}", key=f"key{i}", label=f"Label {i}"))
+		objects.append(la.ViewLookupItem(id=f"vli{i}", key=f"key{i}", label=f"View label {i}", visible=bool(i % 2)))
+		objects.append(la.DataSource(id=f"ds{i}", identifier=f"datasource{i}"))
+	return objects
+
+
+def load(dump, trusted):
+	decoder = ul4on.Decoder()
+	decoder.trusted = trusted
+	return decoder.loads(dump)
+
+
+def bench(label, function, repeat):
+	times = timeit.repeat(function, number=1, repeat=repeat)
+	print(f"{label:<32} best {min(times)*1000:10.2f} ms   mean {sum(times)/len(times)*1000:10.2f} ms")
+	return min(times)
+
+
+def main(args=None):
+	p = argparse.ArgumentParser(description="Benchmark generic vs. specialized UL4ON methods for LivingAPI objects")
+	p.add_argument("-c", "--count", dest="count", help="Number of object groups in the dump (default %(default)s)", type=int, default=10000)
+	p.add_argument("-r", "--repeat", dest="repeat", help="Number of repetitions (default %(default)s)", type=int, default=5)
+	args = p.parse_args(args)
+
+	objects = make_objects(args.count)
+
+	la.specialize_ul4on(False)
+	dump = ul4on.dumps(objects)
+	print(f"Dump with {len(objects):,} objects ({len(dump):,} characters)")
+
+	generic_load = bench("generic ul4onload", lambda: load(dump, False), args.repeat)
+	bench("generic ul4onload (trusted)", lambda: load(dump, True), args.repeat)
+	generic_dump = bench("generic ul4ondump", lambda: ul4on.dumps(objects), args.repeat)
+
+	la.specialize_ul4on(True)
+	if ul4on.dumps(objects) != dump:
+		raise ValueError("specialized ul4ondump produces a different dump")
+
+	specialized_load = bench("specialized ul4onload", lambda: load(dump, False), args.repeat)
+	bench("specialized ul4onload (trusted)", lambda: load(dump, True), args.repeat)
+	specialized_dump = bench("specialized ul4ondump", lambda: ul4on.dumps(objects), args.repeat)
+
+	la.specialize_ul4on(False)
+
+	print(f"Speedup load: {generic_load/specialized_load:.2f}x")
+	print(f"Speedup dump: {generic_dump/specialized_dump:.2f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -12,7 +12,7 @@
 See http://www.living-apps.de/ or http://www.living-apps.com/ for more info.
 """
 
-import os, io, re, unicodedata, datetime, mimetypes, operator, string, json, pathlib, types, enum, math, base64
+import os, io, re, unicodedata, datetime, mimetypes, operator, string, json, pathlib, types, enum, math, base64, array, threading, itertools
 import urllib.parse as urlparse
 import collections
 from collections import abc
@@ -43,9 +43,16 @@ T_opt_handler = Optional["ll.la.handlers.Handler"]
 
 NoneType = type(None)
 
+# Returned by the functions from :meth:`Field._make_value_converter` for
+# values that require a :class:`Field` object for conversion
+_unconverted = object()
+
 module = types.ModuleType("la", "LivingAPI types")
 module.ul4_attrs = {"__name__", "__doc__"}
 
+# All classes registered for UL4ON via :func:`register` (in registration order)
+_ul4on_classes = []
+
 def register(name):
 	"""
 	Used for registering a class for the UL4ON machinery.
@@ -57,6 +64,7 @@ def register(name):
 		if name is not None:
 			cls.ul4onname = "de.livinglogic.livingapi." + name
 			ul4on._registry[cls.ul4onname] = cls.ul4oncreate
+			_ul4on_classes.append(cls)
 		setattr(module, cls.__name__, cls.ul4_type)
 		module.ul4_attrs.add(cls.__name__)
 		return cls
@@ -189,6 +197,111 @@ def makeattrs(value: Any) -> Any:
 	return value
 
 
+class VSQLCache:
+	"""
+	A bounded process wide LRU cache for compiled vSQL expressions.
+
+	Compiling a vSQL expression (i.e. parsing it and doing type inference
+	against the :class:`vsql.Group` objects of the variables) is expensive.
+	Since the resulting :class:`vsql.AST` doesn't depend on the query it's used
+	in, it can be reused by all queries that use the same expression with the
+	same variables.
+
+	Entries are keyed by the expression source and the variables (the fields
+	and the identity of the groups they reference). When the controls of an
+	app change, entries referencing the old vSQL group of the app will be
+	removed via :meth:`invalidate`.
+
+	The module level instance :data:`vsqlcache` is used by :class:`VSQLQuery`.
+	"""
+
+	def __init__(self, maxsize:int=1000):
+		self.maxsize = maxsize
+		# Maps keys to ``(ast, groups)`` where ``groups`` are the :class:`vsql.Group`
+		# objects referenced by ``ast`` (which keeps their ids from being reused)
+		self._cache = collections.OrderedDict()
+		self._lock = threading.Lock()
+		self.stats = attrdict(hits=0, misses=0, evictions=0, invalidations=0)
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__module__}.{self.__class__.__qualname__} size={len(self._cache)} maxsize={self.maxsize} hits={self.stats.hits} misses={self.stats.misses} at {id(self):#x}>"
+
+	def __len__(self) -> int:
+		return len(self._cache)
+
+	def compile(self, source:str, **vars:vsql.Field) -> vsql.AST:
+		"""
+		Return the compiled vSQL expression for ``source`` (see
+		:meth:`vsql.AST.fromsource`).
+		"""
+		key = (
+			source,
+			tuple(
+				(name, field.identifier, field.datatype, field.fieldsql, field.joinsql, id(field.refgroup))
+				for (name, field) in sorted(vars.items())
+				if field is not None
+			),
+		)
+		with self._lock:
+			entry = self._cache.get(key)
+			if entry is not None:
+				self._cache.move_to_end(key)
+				self.stats["hits"] += 1
+				return entry[0]
+			self.stats["misses"] += 1
+
+		ast = vsql.AST.fromsource(source, **vars)
+
+		groups = {id(field.refgroup): field.refgroup for field in vars.values() if field is not None and field.refgroup is not None}
+		for fieldref in ast.fieldrefs():
+			if fieldref.field is not None and fieldref.field.refgroup is not None:
+				groups[id(fieldref.field.refgroup)] = fieldref.field.refgroup
+
+		with self._lock:
+			self._cache[key] = (ast, tuple(groups.values()))
+			while len(self._cache) > self.maxsize:
+				self._cache.popitem(last=False)
+				self.stats["evictions"] += 1
+		return ast
+
+	def invalidate(self, group:vsql.Group) -> int:
+		"""
+		Remove all entries that reference the :class:`vsql.Group` ``group``.
+
+		Return the number of entries removed.
+		"""
+		with self._lock:
+			keys = [key for (key, (ast, groups)) in self._cache.items() if any(g is group for g in groups)]
+			for key in keys:
+				del self._cache[key]
+			self.stats["invalidations"] += len(keys)
+		return len(keys)
+
+	def clear(self) -> None:
+		"""
+		Remove all entries.
+		"""
+		with self._lock:
+			self._cache.clear()
+
+
+vsqlcache = VSQLCache()
+
+
+class VSQLQuery(vsql.Query):
+	"""
+	A :class:`vsql.Query` that gets compiled vSQL expressions from
+	:data:`vsqlcache`.
+	"""
+
+	def _vsql(self, expr:str, context:str) -> vsql.AST:
+		vsqlexpr = vsqlcache.compile(expr, **self.vars)
+		vsqlexpr.check_valid(context)
+		for fieldref in vsqlexpr.fieldrefs():
+			self._register(fieldref)
+		return vsqlexpr
+
+
 def _make_filter(filter: list[str] | str | None) -> list[str]:
 	if filter is None:
 		return []
@@ -229,6 +342,110 @@ def _make_limit(limit: int | None) -> int | None:
 	return limit
 
 
+_keyset_sort_pattern = re.compile(r"^\s*(r\.(?:id|createdat|updatedat|updatecount|v_([A-Za-z_][A-Za-z0-9_]*)))(?:\s+(asc|desc))?(?:\s+nulls\s+(first|last))?\s*$", re.IGNORECASE)
+
+
+def _keyset_sort(sort: list[str]) -> list[tuple[str, str | None, bool, bool]] | None:
+	"""
+	Parse the sort expressions ``sort`` for keyset pagination.
+
+	Return a list of tuples ``(expr, identifier, descending, nulls_first)``
+	(with ``r.id`` appended as a final tie breaker) or :const:`None` if any
+	of the sort expressions is more complicated than a simple record attribute
+	or field reference. ``identifier`` is the field identifier or :const:`None`
+	for record attributes.
+	"""
+	keys = []
+	for s in sort:
+		match = _keyset_sort_pattern.match(s)
+		if match is None:
+			return None
+		(expr, identifier, direction, nulls) = match.groups()
+		descending = direction is not None and direction.lower() == "desc"
+		# The database default is ``nulls last`` for ascending sort order and ``nulls first`` for descending
+		nulls_first = nulls.lower() == "first" if nulls is not None else descending
+		keys.append((expr, identifier, descending, nulls_first))
+	# ``r.id`` is never ``None``, so we don't have to check for ``r.id is None``
+	keys.append(("r.id", None, False, True))
+	return keys
+
+
+def _keyset_filter(keys: list[tuple[str, str | None, bool, bool]], record: Record) -> str | None:
+	"""
+	Return a vSQL condition that is true for all records that are sorted after
+	``record`` according to the sort keys ``keys`` (as returned by
+	:func:`_keyset_sort`).
+
+	Return :const:`None` if the values of ``record`` can't be used in a vSQL
+	expression.
+	"""
+	equal = []
+	conditions = []
+	for (expr, identifier, descending, nulls_first) in keys:
+		if identifier is not None:
+			value = record.values.get(identifier, None)
+		else:
+			value = getattr(record, expr[2:])
+		if isinstance(value, LookupItem):
+			# Lookup fields are compared via the key
+			value = value.key
+		# vSQL datetime constants have no microseconds
+		if isinstance(value, datetime.datetime) and value.microsecond:
+			return None
+		try:
+			source = vsql.ConstAST.make(value).source()
+		except TypeError:
+			return None
+		if value is None:
+			after = f"{expr} is not None" if nulls_first else None
+		else:
+			after = f"{expr} {'<' if descending else '>'} {source}"
+			if not nulls_first:
+				after = f"({after} or {expr} is None)"
+		if after is not None:
+			conditions.append(" and ".join([*equal, after]))
+		equal.append(f"{expr} is None" if value is None else f"{expr} == {source}")
+	if not conditions:
+		return "False"
+	return " or ".join(f"({c})" for c in conditions)
+
+
+def _iter_records(handler, globals: Globals, fetch: Callable, sort: list[str], batch_size: int) -> Generator[Record, None, None]:
+	"""
+	Implementation of :meth:`App.iter_records` and :meth:`AppGroup.iter_records`.
+
+	``fetch`` will be called with the positional arguments ``extrafilter``,
+	``sort``, ``offset`` and ``limit`` and must return a :class:`dict` of
+	records.
+	"""
+	if not isinstance(batch_size, int) or batch_size <= 0:
+		raise ValueError(f"batch_size must be a positive integer, got {batch_size!r}")
+	keys = _keyset_sort(sort)
+	# Append ``r.id`` so that the sort order is unique
+	sort = [*sort, "r.id"]
+	consumed = 0
+	last = None
+	while True:
+		extrafilter = None
+		if last is not None and keys is not None:
+			extrafilter = _keyset_filter(keys, last)
+		start = len(handler.ul4on_decoder._objects)
+		if last is None or extrafilter is not None:
+			records = fetch(extrafilter, sort, 0, batch_size)
+		else:
+			# Fall back to offset based pagination
+			records = fetch(None, sort, consumed, batch_size)
+		if not records:
+			break
+		yield from records.values()
+		consumed += len(records)
+		last = next(reversed(records.values()))
+		# Release the records and everything else that has been loaded with them
+		handler.release_objects(globals, records.values(), start)
+		if len(records) < batch_size:
+			break
+
+
 def error_attribute_doesnt_exist(instance: Any, name: str) -> str:
 	return f"{misc.format_class(instance)!r} object has no attribute {name!r}."
 
@@ -641,6 +858,25 @@ class VersionMismatchError(ValueError):
 		return f"invalid LivingAPI version: expected {self.expected_version!r}, got {self.encountered_version!r}"
 
 
+class DeleteManyError(ValueError):
+	"""
+	Exception that is raised by :meth:`Handler.delete_many` when some of the
+	records couldn't be deleted.
+
+	:attr:`count` is the number of records that have been deleted and
+	:attr:`errors` is a list of ``(record, message)`` tuples for the records
+	that couldn't be deleted.
+	"""
+
+	def __init__(self, count: int, errors: list[tuple[Record, str]]):
+		self.count = count
+		self.errors = errors
+
+	def __str__(self) -> str:
+		(record, message) = self.errors[0]
+		return f"Deleting {len(self.errors)} record(s) failed ({self.count} deleted), first error for {record!r}: {message}"
+
+
 class UnsavedObjectError(ValueError):
 	"""
 	Exception that is raised when we are saving an object that references another object
@@ -764,6 +1000,7 @@ class Attr:
 			The signature of the callback method is ``(instance)``.
 		"""
 		self.name = None
+		self._slot = None # The slot descriptor, if the value is stored in a slot
 		if not types:
 			types = object
 		else:
@@ -812,6 +1049,11 @@ class Attr:
 
 	def __set_name__(self, owner, name):
 		self.name = name
+		# If the class uses ``__slots__`` and has a slot named ``_{name}``, the
+		# value will be stored in this slot instead of the instance dict.
+		slot = getattr(owner, f"_{name}", None)
+		if isinstance(slot, types.MemberDescriptorType):
+			self._slot = slot
 		self._wireattr(owner, name, "get", self._default_get, self._method_get, self._dont_get)
 		self._wireattr(owner, name, "set", self._default_set, self._method_set, self._dont_set)
 		self._wireattr(owner, name, "repr", self._default_repr, self._method_repr, self._dont_repr)
@@ -820,8 +1062,17 @@ class Attr:
 		self._wireattr(owner, name, "ul4onget", self._default_ul4onget, self._method_ul4onget, None)
 		self._wireattr(owner, name, "ul4onset", self._default_ul4onset, self._method_ul4onset, None)
 		self._wireattr(owner, name, "ul4ondefault", self._default_ul4ondefault, self._method_ul4ondefault, None)
+		# Used instead of ``ul4onset`` when the UL4ON dump comes from a trusted
+		# source. Only the canonical implementation can skip the type check,
+		# subclasses that convert values still have to do that.
+		if self.ul4onset == self._default_ul4onset and type(self)._default_set is Attr._default_set:
+			self.ul4onset_trusted = self._trusted_ul4onset
+		else:
+			self.ul4onset_trusted = self.ul4onset
 
 	def _default_get(self, instance):
+		if self._slot is not None:
+			return self._slot.__get__(instance)
 		return instance.__dict__[self.name]
 
 	def _method_get(self, instance):
@@ -835,18 +1086,33 @@ class Attr:
 			value = self.make_default_value()
 		if not isinstance(value, self.types):
 			raise TypeError(error_attribute_wrong_type(instance, self.name, value, self.types))
-		instance.__dict__[self.name] = value
+		self._store(instance, value)
 
 	def _method_set(self, instance, value):
 		return getattr(instance, self._name_set)(value)
 
 	def _dont_set(self, instance, value):
-		# If the attribute is not in the instance dict we allow setting it once.
-		if self.name not in instance.__dict__:
+		# If the attribute hasn't been set yet we allow setting it once.
+		if not self._isset(instance):
 			self._default_set(instance, value)
 		else:
 			raise AttributeError(error_attribute_readonly(instance, self.name))
 
+	def _store(self, instance, value):
+		if self._slot is not None:
+			self._slot.__set__(instance, value)
+		else:
+			instance.__dict__[self.name] = value
+
+	def _isset(self, instance):
+		if self._slot is not None:
+			try:
+				self._slot.__get__(instance)
+			except AttributeError:
+				return False
+			return True
+		return self.name in instance.__dict__
+
 	def _default_repr(self, instance):
 		"""
 		Format the attribute of ``instance`` for :meth:`__repr__` output.
@@ -889,6 +1155,11 @@ class Attr:
 	def _method_ul4onset(self, instance, value):
 		getattr(instance, self._name_ul4onset)(value)
 
+	def _trusted_ul4onset(self, instance, value):
+		if value is None:
+			value = self.make_default_value()
+		self._store(instance, value)
+
 	def _default_ul4ondefault(self, instance):
 		self.ul4onset(instance, self.make_default_value())
 
@@ -1168,6 +1439,56 @@ class CaseInsensitiveDictAttr(Attr):
 		super()._default_set(instance, value)
 
 
+class AttrPlan:
+	"""
+	Precomputed information about the :class:`Attr` descriptors of a class.
+
+	An :class:`!AttrPlan` is created once for every subclass of :class:`Base`
+	when the class is defined. It contains tuples of the :class:`Attr`
+	descriptors that take part in the various access scenarios (in the order
+	in which they are defined), so that :meth:`Base.__repr__`,
+	:meth:`Base.ul4ondump` and :meth:`Base.ul4onload` don't have to walk the
+	MRO for every object.
+
+	The following attributes are available:
+
+	``attrs``
+		All :class:`Attr` descriptors;
+
+	``repr``
+		All descriptors that produce :meth:`__repr__` output;
+
+	``ul4onget``
+		All descriptors that will be output in an UL4ON dump;
+
+	``ul4onset``
+		All descriptors that will be set from an UL4ON dump;
+
+	``ul4ondefault``
+		The descriptors that will be set to their default value when the UL4ON
+		dump doesn't contain a value for them. This is the same sequence as
+		``ul4onset`` (since attributes that are missing from the dump are always
+		the trailing part of ``ul4onset``).
+	"""
+
+	__slots__ = ("attrs", "repr", "ul4onget", "ul4onset", "ul4ondefault")
+
+	def __init__(self, cls:type[Base]):
+		attrs = {}
+		for checkcls in reversed(cls.__mro__):
+			for attr in checkcls.__dict__.values():
+				if isinstance(attr, Attr):
+					attrs[attr.name] = attr
+		self.attrs = tuple(attrs.values())
+		self.repr = tuple(attr for attr in self.attrs if attr.repr != attr._dont_repr)
+		self.ul4onget = tuple(attr for attr in self.attrs if attr.ul4onget is not None)
+		self.ul4onset = tuple(attr for attr in self.attrs if attr.ul4onset is not None)
+		self.ul4ondefault = self.ul4onset
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__module__}.{self.__class__.__qualname__} attrs={[attr.name for attr in self.attrs]!r} at {id(self):#x}>"
+
+
 ###
 ### Core classes
 ###
@@ -1176,20 +1497,27 @@ class CaseInsensitiveDictAttr(Attr):
 class Base:
 	"""
 	Base class of all LivingAPI classes.
+
+	Subclasses that don't define ``__slots__`` get an instance dict as usual.
+	Subclasses with many instances can use ``__slots__`` instead: The value of
+	an :class:`Attr` named ``foo`` will then be stored in the slot ``_foo``.
 	"""
+	__slots__ = ()
+
 	ul4_attrs = set()
 
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		# At this point ``__set_name__`` has already been called for all
+		# :class:`Attr` descriptors of ``cls``, so we can build the plan.
+		cls._attrplan = AttrPlan(cls)
+
 	@classmethod
 	def attrs(cls) -> Iterable[Attr]:
 		"""
 		Returns an iterator over all :class:`Attr` descriptors for this class.
 		"""
-		attrs = {}
-		for checkcls in reversed(cls.__mro__):
-			for attr in checkcls.__dict__.values():
-				if isinstance(attr, Attr):
-					attrs[attr.name] = attr
-		return attrs.values()
+		return cls._attrplan.attrs
 
 	@classmethod
 	def ul4oncreate(cls, id: str | None=None) -> Base:
@@ -1205,7 +1533,7 @@ class Base:
 	def __repr__(self) -> str:
 		v = [f"<{self.__class__.__module__}.{self.__class__.__qualname__}"]
 
-		for attr in self.attrs():
+		for attr in self._attrplan.repr:
 			repr_value = attr.repr(self)
 			if repr_value is not None:
 				v.append(repr_value)
@@ -1213,27 +1541,32 @@ class Base:
 		return " ".join(v)
 
 	def ul4ondump(self, encoder:ul4on.Encoder) -> None:
-		for attr in self.attrs():
-			if attr.ul4onget is not None:
-				value = attr.ul4onget(self)
-				encoder.dump(value)
+		for attr in self._attrplan.ul4onget:
+			encoder.dump(attr.ul4onget(self))
 
 	def ul4onload(self, decoder:ul4on.Decoder) -> None:
 		self.ul4onload_begin(decoder)
-		attrs = (attr for attr in self.attrs() if attr.ul4onset is not None)
+		plan = self._attrplan
 		dump = decoder.loadcontent()
 
 		# Load all attributes that we get from the UL4ON dump
 		# Stop when the dump is exhausted or we've loaded all known attributes.
-		for (attr, value) in zip(attrs, dump):
-			attr.ul4onset(self, value)
+		count = 0
+		if getattr(decoder, "trusted", False):
+			for (attr, value) in zip(plan.ul4onset, dump):
+				attr.ul4onset_trusted(self, value)
+				count += 1
+		else:
+			for (attr, value) in zip(plan.ul4onset, dump):
+				attr.ul4onset(self, value)
+				count += 1
 
 		# Exhaust the UL4ON dump
 		for value in dump:
 			pass
 
 		# Initialize the rest of the attributes with default values
-		for attr in attrs:
+		for attr in plan.ul4ondefault[count:]:
 			attr.ul4ondefault(self)
 		self.ul4onload_end(decoder)
 
@@ -1282,7 +1615,166 @@ class Base:
 		raise AttributeError(error_attribute_doesnt_exist(self, name))
 
 
+Base._attrplan = AttrPlan(Base)
+
+
+def _is_canonical(attr:Attr, *methodnames:str) -> bool:
+	"""
+	Return whether the methods named ``methodnames`` of the :class:`Attr`
+	descriptor ``attr`` are the ones from :class:`Attr` (i.e. haven't been
+	overwritten in a subclass).
+	"""
+	return all(getattr(type(attr), methodname) is getattr(Attr, methodname) for methodname in methodnames)
+
+
+def _make_ul4on_methods(cls:type[Base]) -> tuple[Callable, Callable]:
+	"""
+	Create specialized versions of :meth:`Base.ul4onload` and
+	:meth:`Base.ul4ondump` for the class ``cls``.
+
+	The generated code stores attributes that use the canonical
+	implementation for ``ul4onset`` directly in the instance dict or slot (with
+	the same type checks :meth:`Attr._default_set` would do, unless the decoder
+	is trusted) and calls callback methods directly. Everything else falls back
+	to calling the methods of the :class:`Attr` descriptor.
+
+	Returns a tuple with the two functions.
+	"""
+	plan = cls._attrplan
+	namespace = dict(
+		cls=cls,
+		Base=Base,
+		nothing=object(),
+		error_attribute_wrong_type=error_attribute_wrong_type,
+	)
+
+	def store(attr):
+		if attr._slot is not None:
+			return f"self.{attr._slot.__name__}"
+		else:
+			return f"d[{attr.name!r}]"
+
+	def setcode(i, attr, indent):
+		if attr._name_ul4onset is not None:
+			return [f"{indent}self.{attr._name_ul4onset}(value)"]
+		elif _is_canonical(attr, "_default_ul4onset", "_default_set"):
+			code = []
+			if attr.default is not None or attr.default_factory is not None:
+				code.append(f"{indent}if value is None:")
+				code.append(f"{indent}\tvalue = attr_{i}.make_default_value()")
+			types = attr.types
+			if types is not object:
+				namespace[f"types_{i}"] = types
+				code.append(f"{indent}if not trusted and not isinstance(value, types_{i}):")
+				code.append(f"{indent}\traise TypeError(error_attribute_wrong_type(self, {attr.name!r}, value, types_{i}))")
+			code.append(f"{indent}{store(attr)} = value")
+			return code
+		elif _is_canonical(attr, "_default_ul4onset"):
+			return [f"{indent}attr_{i}._default_set(self, value)"]
+		else:
+			return [f"{indent}attr_{i}.ul4onset(self, value)"]
+
+	def defaultcode(i, attr, indent):
+		if attr._name_ul4ondefault is not None:
+			return [f"{indent}self.{attr._name_ul4ondefault}()"]
+		elif _is_canonical(attr, "_default_ul4ondefault"):
+			return [f"{indent}value = attr_{i}.make_default_value()", *setcode(i, attr, indent)]
+		else:
+			return [f"{indent}attr_{i}.ul4ondefault(self)"]
+
+	def getcode(i, attr, indent):
+		if attr._name_ul4onget is not None:
+			return [f"{indent}dump(self.{attr._name_ul4onget}())"]
+		elif _is_canonical(attr, "_default_ul4onget", "_default_get"):
+			return [f"{indent}dump({store(attr)})"]
+		else:
+			return [f"{indent}dump(attr_{i}.ul4onget(self))"]
+
+	for (i, attr) in enumerate(plan.attrs):
+		namespace[f"attr_{i}"] = attr
+	indexes = {attr.name: i for (i, attr) in enumerate(plan.attrs)}
+
+	# Classes with ``__slots__`` might not have an instance dict
+	def usesdict(lines):
+		if any("d[" in line for line in lines):
+			return ["\td = self.__dict__"]
+		return []
+
+	loadcode = []
+	if cls.ul4onload_begin is not Base.ul4onload_begin:
+		loadcode.append("\tself.ul4onload_begin(decoder)")
+	loadcode.append("\ttrusted = getattr(decoder, 'trusted', False)")
+	loadcode.append("\tdump = decoder.loadcontent()")
+	for attr in plan.ul4onset:
+		i = indexes[attr.name]
+		loadcode.append("\tvalue = next(dump, nothing)")
+		loadcode.append("\tif value is nothing:")
+		loadcode.extend(defaultcode(i, attr, "\t\t"))
+		loadcode.append("\telse:")
+		loadcode.extend(setcode(i, attr, "\t\t"))
+	loadcode.append("\tfor value in dump:")
+	loadcode.append("\t\tpass")
+	if cls.ul4onload_end is not Base.ul4onload_end:
+		loadcode.append("\tself.ul4onload_end(decoder)")
+
+	dumpcode = ["\tdump = encoder.dump"]
+	for attr in plan.ul4onget:
+		dumpcode.extend(getcode(indexes[attr.name], attr, "\t"))
+
+	# Subclasses might have additional attributes, so they use the generic version
+	code = [
+		"def ul4onload(self, decoder):",
+		"\tif self.__class__ is not cls:",
+		"\t\treturn Base.ul4onload(self, decoder)",
+		*usesdict(loadcode),
+		*loadcode,
+		"def ul4ondump(self, encoder):",
+		"\tif self.__class__ is not cls:",
+		"\t\treturn Base.ul4ondump(self, encoder)",
+		*usesdict(dumpcode),
+		*dumpcode,
+	]
+
+	exec(compile("\n".join(code), f"<ul4on methods for {format_class(cls)}>", "exec"), namespace)
+	ul4onload = namespace["ul4onload"]
+	ul4ondump = namespace["ul4ondump"]
+	for function in (ul4onload, ul4ondump):
+		function.__qualname__ = f"{cls.__qualname__}.{function.__name__}"
+		function.__module__ = cls.__module__
+		function._specialized = True
+	return (ul4onload, ul4ondump)
+
+
+def specialize_ul4on(enabled:bool=True) -> None:
+	"""
+	Enable or disable specialized UL4ON methods for all LivingAPI classes.
+
+	If ``enabled`` is true, every class registered via :func:`register` that
+	uses the generic implementation of :meth:`Base.ul4onload` and
+	:meth:`Base.ul4ondump` gets specialized versions of those methods that
+	are generated from its :class:`Attr` descriptors. This avoids several
+	levels of Python calls per attribute when loading large UL4ON dumps.
+
+	If ``enabled`` is false the generic implementation is restored.
+	"""
+	# Remove the methods from a previous call, so that we get the correct
+	# inherited methods in the checks below.
+	for cls in _ul4on_classes:
+		for name in ("ul4onload", "ul4ondump"):
+			if getattr(cls.__dict__.get(name), "_specialized", False):
+				delattr(cls, name)
+
+	if enabled:
+		# Determine the classes first, since specializing a base class would
+		# change what its subclasses inherit.
+		classes = [cls for cls in _ul4on_classes if cls.ul4onload is Base.ul4onload and cls.ul4ondump is Base.ul4ondump]
+		for cls in classes:
+			(cls.ul4onload, cls.ul4ondump) = _make_ul4on_methods(cls)
+
+
 class WithTemplates(Base):
+	__slots__ = ()
+
 	@misc.notimplemented
 	def _template_candidates(self) -> Generator[dict[str, ul4c.Template], None, None]:
 		yield from []
@@ -1363,6 +1855,9 @@ class WithTemplates(Base):
 
 
 class CustomAttributes(WithTemplates):
+	# ``x_`` attributes are stored in the instance dict
+	__slots__ = ("__dict__",)
+
 	ul4_attrs = WithTemplates.ul4_attrs.union({"custom"})
 
 	def __init__(self):
@@ -1664,6 +2159,8 @@ class Geo(WithTemplates):
 	ul4_attrs = WithTemplates.ul4_attrs.union({"lat", "long", "info"})
 	ul4_type = ul4c.Type("la", "Geo", "Geographical coordinates and location information")
 
+	__slots__ = ("_globals", "_lat", "_long", "_info")
+
 	globals = Attr(lambda: Globals, get=True, set=True, ul4get=True, ul4onget=True, ul4onset=True)
 	lat = FloatAttr(get=True, repr=True, ul4get=True, ul4onget=True, ul4onset=True)
 	long = FloatAttr(get=True, repr=True, ul4get=True, ul4onget=True, ul4onset=True)
@@ -2178,6 +2675,7 @@ class Globals(CustomAttributes):
 		"scaled_url",
 		"qrcode_url",
 		"seq",
+		"prefetch",
 		"flash_info",
 		"flash_notice",
 		"flash_warning",
@@ -2316,6 +2814,48 @@ class Globals(CustomAttributes):
 					self._groups = groups
 		return groups
 
+	def prefetch(self, *names:str, apps:Iterable[App] | None=None) -> None:
+		"""
+		Fetch the lazily loaded metadata ``names`` for the apps ``apps`` with
+		as few database calls as possible.
+
+		``names`` can contain ``"menus"``, ``"panels"``, ``"views"``,
+		``"child_controls"``, ``"data_actions"``, ``"ownparams"`` and
+		``"attachments"``. If ``names`` is empty, all of them will be fetched.
+
+		If ``apps`` is :const:`None`, the metadata will be fetched for
+		:attr:`app` and all apps in all app groups in :attr:`groups` (the apps
+		of the app groups will be fetched with one call too).
+
+		Metadata that has already been fetched will not be fetched again.
+		Handlers other than :class:`~ll.la.handlers.DBHandler` don't support
+		fetching multiple metadata at once, so with them the metadata will
+		still be fetched when it is accessed.
+		"""
+		for name in names:
+			if name not in App._prefetch_slots:
+				raise ValueError(f"unknown metadata {name!r}")
+		names = names or tuple(App._prefetch_slots)
+
+		if apps is None:
+			allapps = {}
+			if self.app is not None:
+				allapps[self.app.id] = self.app
+			groups = self.groups
+			if groups:
+				self._prefetch([(group, "apps") for group in groups.values() if group._apps is None])
+				for group in groups.values():
+					if group._apps is not None:
+						allapps.update(group._apps)
+			apps = allapps.values()
+		self._prefetch([(app, name) for app in apps if app.id is not None for name in names if getattr(app, App._prefetch_slots[name]) is None])
+
+	def _prefetch(self, requests:list[tuple[App | AppGroup, str]]) -> None:
+		if requests:
+			values = self._gethandler().incremental_data_many(self, requests)
+			for ((owner, name), value) in zip(requests, values):
+				owner._prefetch_set(name, value)
+
 	def _record_ul4onset(self, value):
 		if value is not None:
 			self.record = value
@@ -3140,6 +3680,7 @@ class App(CustomAttributes, WithParams, WithAttachments):
 			"delete_records",
 			"fetch_records",
 			"fetch_recordpage",
+			"prefetch",
 		}
 	)
 	ul4_type = ul4c.Type("la", "App", "A LivingApps application")
@@ -3165,7 +3706,7 @@ class App(CustomAttributes, WithParams, WithAttachments):
 	iconlarge = Attr(File, get="_image_get", ul4get="_image_get")
 	iconsmall = Attr(File, get="_image_get", ul4get="_image_get")
 	createdby = Attr(User, get=True, set=True, ul4get=True, ul4onget=True, ul4onset=True)
-	controls = AttrDictAttr(get=True, set=True, ul4get=True, ul4onget=True, ul4onset=True)
+	controls = AttrDictAttr(get=True, set="", ul4get=True, ul4onget=True, ul4onset="_controls_set")
 	layout_controls = AttrDictAttr(get="", ul4get="_layout_controls_get")
 	records = AttrDictAttr(get=True, set=True, ul4get=True, ul4onget=True, ul4onset="")
 	recordpage = Attr(lambda: RecordPage, get="", ul4get="_recordpage_get")
@@ -3263,6 +3804,7 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		self._data_actions = None
 		self._vsqlgroup_records = None
 		self._vsqlgroup_app = None
+		self._value_converters_cache = None
 		self._add_param(*args)
 
 	def __str__(self) -> str:
@@ -3558,6 +4100,31 @@ class App(CustomAttributes, WithParams, WithAttachments):
 	def _permissions_ul4onset(self, value):
 		self.__dict__["permissions"] = Permissions(value)
 
+	# Maps the names of the metadata that can be fetched by :meth:`prefetch` to
+	# the attributes that cache it
+	_prefetch_slots = {
+		"menus": "_menus",
+		"panels": "_panels",
+		"views": "_views",
+		"child_controls": "_child_controls",
+		"data_actions": "_data_actions",
+		"ownparams": "_ownparams",
+		"attachments": "_attachments",
+	}
+
+	def prefetch(self, *names:str) -> None:
+		"""
+		Fetch the lazily loaded metadata ``names`` of this app with one database
+		call (see :meth:`Globals.prefetch`).
+		"""
+		self.globals.prefetch(*names, apps=[self])
+
+	def _prefetch_set(self, name:str, value:Any) -> None:
+		if value is not None:
+			if name in {"data_actions", "ownparams", "attachments"}:
+				value = attrdict(value)
+			setattr(self, self._prefetch_slots[name], value)
+
 	def _menus_get(self):
 		menus = self._menus
 		if menus is None:
@@ -3591,6 +4158,35 @@ class App(CustomAttributes, WithParams, WithAttachments):
 	def _child_controls_set(self, value):
 		self._child_controls = value
 
+	def _controls_set(self, value):
+		if value is not None and not isinstance(value, dict):
+			raise TypeError(error_attribute_wrong_type(self, "controls", value, [dict]))
+		self.__dict__["controls"] = makeattrs(value)
+		# The vSQL group for records depends on the controls, so we have to
+		# recreate it and drop compiled vSQL expressions that use it
+		group = self.__dict__.get("_vsqlgroup_records")
+		if group is not None:
+			vsqlcache.invalidate(group)
+			self._vsqlgroup_records = None
+		self._value_converters_cache = None
+
+	def _value_converters(self) -> dict[str, Callable[[Any], Any] | None]:
+		"""
+		Return a dictionary mapping the identifiers of the controls to the
+		functions that convert field values for these controls (see
+		:meth:`Field._make_value_converter`).
+
+		The functions are created once and reused until :attr:`controls` is
+		replaced.
+		"""
+		converters = self.__dict__.get("_value_converters_cache")
+		if converters is None:
+			converters = self._value_converters_cache = {
+				identifier: control.fieldtype._make_value_converter(control)
+				for (identifier, control) in self.controls.items()
+			}
+		return converters
+
 	def _views_get(self):
 		views = self._views
 		if views is None:
@@ -3676,6 +4272,108 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		record.save(force=True)
 		return record
 
+	def insert_many(self, rows:Iterable[dict[str, Any]], batch_size:int = 100) -> list[Record | list[str]]:
+		"""
+		Create and save new records from ``rows`` (an iterable of dictionaries
+		mapping control identifiers to field values).
+
+		This works like calling :meth:`insert` for each row, but the field
+		values are converted with converter functions that are created once per
+		control (see :meth:`Field._make_converter`) and the records are saved
+		in batches of ``batch_size`` records via :meth:`Handler.save_records`.
+
+		Rows that fail validation will not be saved.
+
+		Return a list with one entry per row: The :class:`Record` if it has been
+		saved or the list of error messages for the record and its fields if it
+		hasn't.
+		"""
+		identifiers = self.controls.keys()
+		converters = [(control, control.fieldtype._make_converter(control)) for control in self.controls.values()]
+		handler = self._gethandler()
+
+		def errors(record):
+			return [*record.errors, *(error for field in record.fields.values() for error in field.errors)]
+
+		results = []
+		rows = iter(rows)
+		while True:
+			batch = list(itertools.islice(rows, batch_size))
+			if not batch:
+				break
+			records = []
+			indexes = []
+			for row in batch:
+				if not identifiers >= row.keys():
+					identifier = misc.first(identifier for identifier in row if identifier not in identifiers)
+					raise TypeError(f"insert_many() got an unexpected key {identifier!r}")
+				record = Record(
+					id=None,
+					app=self,
+					createdat=None,
+					createdby=None,
+					updatedat=None,
+					updatedby=None,
+					updatecount=0
+				)
+				record._make_fields_converted(row, converters)
+				if record.has_errors():
+					results.append(errors(record))
+				else:
+					indexes.append(len(results))
+					results.append(record)
+					records.append(record)
+			saved = handler.save_records(records, batch_size=batch_size)
+			for (i, record, result) in zip(indexes, records, saved):
+				record._new = False
+				if not result:
+					results[i] = errors(record)
+		return results
+
+	def save_records(self, records:Iterable[Record], batch_size:int = 100, force:bool = False) -> list[bool | None]:
+		"""
+		Save all records in ``records`` (which must belong to this app).
+
+		This works like calling :meth:`Record.save` for each record, but the
+		handler will save the records in batches of ``batch_size`` records with
+		one database or HTTP request per batch.
+
+		If ``force`` is false, all records will be checked for errors before and
+		after saving them (via :meth:`Record.check_errors`) and an exception will
+		be raised for the first record that has errors.
+
+		Return a list with the result of :meth:`Record.save` for each record.
+		"""
+		records = list(records)
+		for record in records:
+			if record.app is not self:
+				raise ValueError(f"{record!r} doesn't belong to {self!r}")
+			if not force and not record._deleted:
+				record.check_errors()
+		result = self._gethandler().save_records(records, batch_size=batch_size)
+		for record in records:
+			if not record._deleted:
+				record._new = False
+		if not force:
+			for record in records:
+				if not record._deleted:
+					record.check_errors()
+		return result
+
+	async def ainsert_many(self, rows:Iterable[dict[str, Any]], batch_size:int = 100) -> list[Record | list[str]]:
+		"""
+		Asynchronous version of :meth:`insert_many` (see
+		:class:`~ll.la.handlers.AsyncHandler`).
+		"""
+		return await self._gethandler()._run_async(self.insert_many, rows, batch_size=batch_size)
+
+	async def asave_records(self, records:Iterable[Record], batch_size:int = 100, force:bool = False) -> list[bool | None]:
+		"""
+		Asynchronous version of :meth:`save_records` (see
+		:class:`~ll.la.handlers.AsyncHandler`).
+		"""
+		return await self._gethandler()._run_async(self.save_records, records, batch_size=batch_size, force=force)
+
 	def __call__(self, **kwargs) -> Record:
 		record = Record(app=self)
 		for identifier in kwargs:
@@ -3774,6 +4472,13 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		handler = self._gethandler()
 		return handler.count_records(self, filter)
 
+	async def acount_records(self, filter:str | list[str]) -> int:
+		"""
+		Asynchronous version of :meth:`count_records` (see
+		:class:`~ll.la.handlers.AsyncHandler`).
+		"""
+		return await self._gethandler()._run_async(self.count_records, filter)
+
 	def delete_records(self, filter: list[str] | str) -> int:
 		"""
 		Delete records in this app matching the vSQL condition ``filter``.
@@ -3802,7 +4507,7 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		handler = self._gethandler()
 		return handler.delete_records(self, filter)
 
-	def fetch_records(self, filter:list[str] | str, sort:list[str] | str | None = None, offset: int | None = 0, limit: int | None = None) -> dict[str, Record]:
+	def fetch_records(self, filter:list[str] | str, sort:list[str] | str | None = None, offset: int | None = 0, limit: int | None = None, batch:bool=False) -> dict[str, Record] | RecordBatch:
 		"""
 		Return records in this app matching the vSQL condition ``filter``.
 
@@ -3822,7 +4527,11 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		returned.
 
 		Records will be returned as a dictionary which record ids as the keys and
-		:class:`Record` objects as the value.
+		:class:`Record` objects as the value. If ``batch`` is true, records will
+		be returned as a :class:`RecordBatch` instead. In this case the fetched
+		records (and everything else that has been loaded with them) will be
+		removed from the handler's UL4ON registry after the batch has been
+		created.
 		"""
 
 		filter = _make_filter(filter)
@@ -3831,9 +4540,20 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		limit = _make_limit(limit)
 
 		handler = self._gethandler()
-		return handler.fetch_records(self, filter=filter, sort=sort, offset=offset, limit=limit)
+		start = len(handler.ul4on_decoder._objects)
+		records = handler.fetch_records(self, filter=filter, sort=sort, offset=offset, limit=limit)
+		if batch:
+			records = RecordBatch._from_fetched_records(handler, self.globals, records, start)
+		return records
+
+	async def afetch_records(self, filter:list[str] | str, sort:list[str] | str | None = None, offset: int | None = 0, limit: int | None = None, batch:bool=False) -> dict[str, Record] | RecordBatch:
+		"""
+		Asynchronous version of :meth:`fetch_records` (see
+		:class:`~ll.la.handlers.AsyncHandler`).
+		"""
+		return await self._gethandler()._run_async(self.fetch_records, filter, sort=sort, offset=offset, limit=limit, batch=batch)
 
-	def fetch_recordpage(self, filter:list[str] | str, sort:list[str] | str | None = None, offset: int | None = 0, limit: int | None = None) -> RecordPage:
+	def fetch_recordpage(self, filter:list[str] | str, sort:list[str] | str | None = None, offset: int | None = 0, limit: int | None = None, fetch_total:bool=False, prefetch:str | None=None) -> RecordPage:
 		"""
 		Return records in this app matching the vSQL condition ``filter``.
 
@@ -3852,6 +4572,13 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		how may records (starting at the record defined by ``offset``) should be
 		returned.
 
+		If ``fetch_total`` is true the total number of matching records will be
+		fetched by the same query as the records themselves.
+
+		``prefetch`` can be ``"next"`` or ``"adjacent"`` to fetch the next (and
+		previous) page in the background after this page has been fetched (see
+		:class:`RecordPage`).
+
 		Records will be returned as an :class:`AppRecordPage`.
 		"""
 
@@ -3860,7 +4587,34 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		offset = _make_offset(offset)
 		limit = _make_limit(limit)
 
-		return AppRecordPage(self, filter=filter, sort=sort, offset=offset, limit=limit)
+		return AppRecordPage(self, filter=filter, sort=sort, offset=offset, limit=limit, fetch_total=fetch_total, prefetch=prefetch)
+
+	def iter_records(self, filter:list[str] | str, sort:list[str] | str | None = None, batch_size:int = 1000) -> Generator[Record, None, None]:
+		"""
+		Iterate through the records in this app matching the vSQL condition
+		``filter``.
+
+		``filter`` and ``sort`` have the same meaning as for
+		:meth:`fetch_records`.
+
+		Records will be fetched from the database in batches of ``batch_size``
+		records. If all sort expressions are simple references to fields or
+		record attributes (like ``r.v_name desc`` or ``r.createdat``) the next
+		batch will be fetched by filtering for records that are sorted after the
+		last record of the previous batch, otherwise ``offset`` will be used.
+		Records in a batch that has been consumed will be removed from the
+		handler's UL4ON registry.
+		"""
+
+		filter = _make_filter(filter)
+		sort = _make_sort(sort)
+
+		handler = self._gethandler()
+
+		def fetch(extrafilter, sort, offset, limit):
+			return handler.fetch_records(self, filter=filter if extrafilter is None else [*filter, extrafilter], sort=sort, offset=offset, limit=limit)
+
+		return _iter_records(handler, self.globals, fetch, sort, batch_size)
 
 	def aggregate_records(self, filter:list[str] | str, value:list[str] | str | None = None) -> list[list[Any]]:
 		"""
@@ -3913,6 +4667,13 @@ class App(CustomAttributes, WithParams, WithAttachments):
 		handler = self._gethandler()
 		return handler.aggregate_records(self, filter=filter, value=value)
 
+	async def aaggregate_records(self, filter:list[str] | str, value:list[str] | str | None = None) -> list[list[Any]]:
+		"""
+		Asynchronous version of :meth:`aggregate_records` (see
+		:class:`~ll.la.handlers.AsyncHandler`).
+		"""
+		return await self._gethandler()._run_async(self.aggregate_records, filter, value)
+
 
 @register("appgroup")
 class AppGroup(CustomAttributes, WithParams, WithAttachments):
@@ -4069,6 +4830,10 @@ class AppGroup(CustomAttributes, WithParams, WithAttachments):
 				self._apps = apps
 		return apps
 
+	def _prefetch_set(self, name:str, value:Any) -> None:
+		if value is not None:
+			self._apps = attrdict(value)
+
 	def _ownparams_fetch(self):
 		return self.globals._incremental_data(
 			t"livingapi_pkg.appgroup_params_inc_ful4on({self.id})",
@@ -4116,7 +4881,7 @@ class AppGroup(CustomAttributes, WithParams, WithAttachments):
 		filter = self._make_filter(filter)
 		return handler.count_records_from_apps(self.globals, filter)
 
-	def fetch_records(self, filter:dict[App, list[str] | str], sort:list[str] | str | None=None, offset:int | None = 0, limit: int | None=None) -> dict[str, Record]:
+	def fetch_records(self, filter:dict[App, list[str] | str], sort:list[str] | str | None=None, offset:int | None = 0, limit: int | None=None, batch:bool=False) -> dict[str, Record] | RecordBatch:
 		"""
 		Return records in this app group matching the vSQL conditions in ``filter``.
 
@@ -4139,19 +4904,49 @@ class AppGroup(CustomAttributes, WithParams, WithAttachments):
 		returned.
 
 		Records will be returned as a dictionary which record ids as the keys and
-		:class:`Record` objects as the value.
+		:class:`Record` objects as the value. If ``batch`` is true, records will
+		be returned as a :class:`RecordBatch` instead (see
+		:meth:`App.fetch_records`).
 		"""
 
 		handler = self._gethandler()
-		return handler.fetch_records_from_apps(
+		start = len(handler.ul4on_decoder._objects)
+		records = handler.fetch_records_from_apps(
 			globals=self.globals,
 			filter=self._make_filter(filter),
 			sort=_make_sort(sort),
 			offset=_make_offset(offset),
 			limit=_make_limit(limit),
 		)
+		if batch:
+			records = RecordBatch._from_fetched_records(handler, self.globals, records, start)
+		return records
+
+	def iter_records(self, filter:dict[App, list[str] | str], sort:list[str] | str | None = None, batch_size:int = 1000) -> Generator[Record, None, None]:
+		"""
+		Iterate through the records in this app group matching the vSQL
+		conditions in ``filter``.
 
-	def fetch_recordpage(self, filter:dict[App, list[str] | str], sort:list[str] | str | None = None, offset: int | None = 0, limit: int | None = None) -> RecordPage:
+		``filter`` and ``sort`` have the same meaning as for
+		:meth:`fetch_records`, ``batch_size`` has the same meaning as for
+		:meth:`App.iter_records`.
+		"""
+
+		filter = self._make_filter(filter)
+		sort = _make_sort(sort)
+
+		handler = self._gethandler()
+
+		def fetch(extrafilter, sort, offset, limit):
+			if extrafilter is not None:
+				appfilter = {app: [*f, extrafilter] for (app, f) in filter.items()}
+			else:
+				appfilter = filter
+			return handler.fetch_records_from_apps(globals=self.globals, filter=appfilter, sort=sort, offset=offset, limit=limit)
+
+		return _iter_records(handler, self.globals, fetch, sort, batch_size)
+
+	def fetch_recordpage(self, filter:dict[App, list[str] | str], sort:list[str] | str | None = None, offset: int | None = 0, limit: int | None = None, fetch_total:bool=False) -> RecordPage:
 		"""
 		Return records in this app group matching the vSQL conditions in ``filter``.
 
@@ -4170,6 +4965,9 @@ class AppGroup(CustomAttributes, WithParams, WithAttachments):
 		how may records (starting at the record defined by ``offset``) should be
 		returned.
 
+		If ``fetch_total`` is true the total number of matching records will be
+		fetched by the same query as the records themselves.
+
 		Records will be returned as an :class:`AppRecordPage`.
 		"""
 
@@ -4178,7 +4976,7 @@ class AppGroup(CustomAttributes, WithParams, WithAttachments):
 		offset = _make_offset(offset)
 		limit = _make_limit(limit)
 
-		return AppGroupRecordPage(self, filter=filter, sort=sort, offset=offset, limit=limit)
+		return AppGroupRecordPage(self, filter=filter, sort=sort, offset=offset, limit=limit, fetch_total=fetch_total)
 
 
 class Field(CustomAttributes):
@@ -4284,6 +5082,8 @@ a
 	ul4_attrs = CustomAttributes.ul4_attrs.union({"control", "record", "label", "description", "value", "is_empty", "is_dirty", "errors", "priority", "in_list", "in_mobile_list", "in_text", "required", "mode", "has_errors", "add_error", "set_error", "clear_errors", "enabled", "writable", "visible"})
 	ul4_type = ul4c.Type("la", "Field", "The value of a field of a record (and related information)")
 
+	__slots__ = ("custom", "control", "record", "_label", "_description", "_lookupdata", "_value", "_dirty", "errors", "_in_text", "_required", "_mode", "enabled", "writable", "visible")
+
 	def __init__(self, control, record, value):
 		super().__init__()
 		self.control = control
@@ -4372,6 +5172,48 @@ a
 			self.record.values[self.control.identifier] = self._value
 			self._dirty = True
 
+	@classmethod
+	def _make_value_converter(cls, control: Control) -> Callable[[Any], Any] | None:
+		"""
+		Return a function that converts common values for a new field for
+		``control`` (i.e. a field without any field specific settings) without
+		requiring a :class:`Field` object (or :const:`None` if there is no such
+		function for this field type).
+
+		The function will be called with the value and must return the value
+		that :meth:`_set_value` would set (if :meth:`_set_value` wouldn't add
+		any errors) or ``_unconverted`` if the value can't be handled
+		without a :class:`Field` object.
+
+		Subclasses may return a function that uses control attributes that have
+		been fetched beforehand.
+		"""
+		return None
+
+	@classmethod
+	def _make_converter(cls, control: Control) -> Callable[[Field, Any], None]:
+		"""
+		Return a function that sets the value of a new field for ``control``
+		(i.e. a field without any field specific settings) the same way
+		:meth:`_set_value` does.
+
+		The function will be called with the field and the value. Common values
+		are handled by the function returned from :meth:`_make_value_converter`,
+		all other values are passed on to :meth:`_set_value`.
+		"""
+		set_value = cls._set_value
+		convert_value = cls._make_value_converter(control)
+		if convert_value is None:
+			return set_value
+
+		def convert(field, value):
+			result = convert_value(value)
+			if result is _unconverted:
+				set_value(field, value)
+			else:
+				field._value = result
+		return convert
+
 	def is_empty(self) -> bool:
 		return self._value is None or (isinstance(self._value, list) and not self._value)
 
@@ -4455,6 +5297,20 @@ a
 
 
 class BoolField(Field):
+	__slots__ = ()
+
+	@classmethod
+	def _make_value_converter(cls, control):
+		if cls._set_value is not BoolField._set_value:
+			return super()._make_value_converter(control)
+		required = control.required
+
+		def convert(value):
+			if (value is True) or (not required and (value is False or value is None)):
+				return value
+			return _unconverted
+		return convert
+
 	def _set_value(self, value):
 		if value is None:
 			if self.required:
@@ -4481,6 +5337,20 @@ class BoolField(Field):
 
 
 class IntField(Field):
+	__slots__ = ()
+
+	@classmethod
+	def _make_value_converter(cls, control):
+		if cls._set_value is not IntField._set_value:
+			return super()._make_value_converter(control)
+		required = control.required
+
+		def convert(value):
+			if value.__class__ is int or (value is None and not required):
+				return value
+			return _unconverted
+		return convert
+
 	def _set_value(self, value):
 		if value is None or value == "":
 			if self.required:
@@ -4500,6 +5370,22 @@ class IntField(Field):
 
 
 class NumberField(Field):
+	__slots__ = ()
+
+	@classmethod
+	def _make_value_converter(cls, control):
+		if cls._set_value is not NumberField._set_value:
+			return super()._make_value_converter(control)
+		required = control.required
+
+		def convert(value):
+			if value.__class__ is float or (value is None and not required):
+				return value
+			elif value.__class__ is int:
+				return float(value)
+			return _unconverted
+		return convert
+
 	def _set_value(self, value):
 		if value is None or value == "":
 			if self.required:
@@ -4535,6 +5421,8 @@ class NumberField(Field):
 
 
 class StringField(Field):
+	__slots__ = ("_placeholder",)
+
 	ul4_attrs = Field.ul4_attrs.union({"placeholder"})
 
 	def __init__(self, control, record, value):
@@ -4549,6 +5437,23 @@ class StringField(Field):
 	def placeholder(self, placeholder: str | None) -> None:
 		self._placeholder = placeholder
 
+	@classmethod
+	def _make_value_converter(cls, control):
+		# Subclasses that do additional checks use the generic version
+		if cls._set_value is not StringField._set_value:
+			return super()._make_value_converter(control)
+		required = control.required
+		minlength = control.minlength or 0
+		maxlength = control.maxlength
+
+		def convert(value):
+			if value.__class__ is str and value and minlength <= len(value) and (maxlength is None or len(value) <= maxlength):
+				return value
+			elif value is None and not required:
+				return value
+			return _unconverted
+		return convert
+
 	def _set_value(self, value):
 		if value is None or value == "":
 			if self.required:
@@ -4568,10 +5473,12 @@ class StringField(Field):
 
 
 class TextField(StringField):
-	pass
+	__slots__ = ()
 
 
 class URLField(StringField):
+	__slots__ = ()
+
 	def _set_value(self, value):
 		if isinstance(value, str) and value:
 			if not validators.url(value):
@@ -4580,6 +5487,8 @@ class URLField(StringField):
 
 
 class EmailField(StringField):
+	__slots__ = ()
+
 	_pattern = re.compile("^[a-zA-Z0-9_#$%&’*+/=?^.-]+(?:\\.[a-zA-Z0-9_+&*-]+)*@(?:[a-zA-Z0-9-]+\\.)+[a-zA-Z]{2,7}$")
 
 	def _set_value(self, value):
@@ -4594,6 +5503,8 @@ class EmailField(StringField):
 
 
 class TelField(StringField):
+	__slots__ = ()
+
 	_pattern = re.compile("^\\+?[0-9 /()-]+$")
 
 	def _set_value(self, value):
@@ -4603,18 +5514,36 @@ class TelField(StringField):
 
 
 class PasswordField(StringField):
-	pass
+	__slots__ = ()
 
 
 class TextAreaField(StringField):
-	pass
+	__slots__ = ()
 
 
 class HTMLField(StringField):
-	pass
+	__slots__ = ()
 
 
 class DateField(Field):
+	__slots__ = ()
+
+	@classmethod
+	def _make_value_converter(cls, control):
+		if cls._set_value is not DateField._set_value:
+			return super()._make_value_converter(control)
+		convert_date = cls._convert
+		required = control.required
+
+		def convert(value):
+			if isinstance(value, datetime.date):
+				# :meth:`_convert` doesn't use the field
+				return convert_date(None, value)
+			elif value is None and not required:
+				return value
+			return _unconverted
+		return convert
+
 	def _convert(self, value):
 		if isinstance(value, datetime.datetime):
 			value = value.date()
@@ -4653,6 +5582,8 @@ class DateField(Field):
 
 
 class DatetimeMinuteField(DateField):
+	__slots__ = ()
+
 	def _convert(self, value):
 		if isinstance(value, datetime.datetime):
 			value = value.replace(second=0, microsecond=0)
@@ -4662,6 +5593,8 @@ class DatetimeMinuteField(DateField):
 
 
 class DatetimeSecondField(DateField):
+	__slots__ = ()
+
 	def _convert(self, value):
 		if isinstance(value, datetime.datetime):
 			value = value.replace(microsecond=0)
@@ -4671,6 +5604,8 @@ class DatetimeSecondField(DateField):
 
 
 class FileField(Field):
+	__slots__ = ()
+
 	def _set_value(self, value):
 		if value is None or value == "":
 			if self.required:
@@ -4690,6 +5625,8 @@ class FileField(Field):
 
 
 class FileSignatureField(FileField):
+	__slots__ = ()
+
 	def _set_value(self, value):
 		if isinstance(value, str) and value:
 			pos_slash = value.find("/")
@@ -4732,6 +5669,8 @@ class FileSignatureField(FileField):
 
 
 class GeoField(Field):
+	__slots__ = ()
+
 	def _set_value(self, value):
 		if value is None or value == "":
 			if self.required:
@@ -4768,6 +5707,8 @@ class LookupField(Field):
 		in input forms.
 	"""
 
+	__slots__ = ()
+
 	ul4_attrs = Field.ul4_attrs.union({"lookupdata", "has_custom_lookupdata"})
 
 	def __init__(self, control, record, value):
@@ -4804,6 +5745,22 @@ class LookupField(Field):
 	def has_custom_lookupdata(self):
 		return self._lookupdata is not None
 
+	@classmethod
+	def _make_value_converter(cls, control):
+		if cls._set_value is not LookupField._set_value:
+			return super()._make_value_converter(control)
+		required = control.required
+		lookupdata = control.lookupdata or {}
+		none_key = control.none_key
+
+		def convert(value):
+			if value.__class__ is str and value and value != none_key and value in lookupdata:
+				return lookupdata[value]
+			elif value is None and not required:
+				return value
+			return _unconverted
+		return convert
+
 	def _find_lookupitem(self, value) -> tuple[None | LookupItem | str, str | None]:
 		lookupdata = self.control.lookupdata
 		if isinstance(value, str):
@@ -4839,15 +5796,15 @@ class LookupField(Field):
 
 
 class LookupSelectField(LookupField):
-	pass
+	__slots__ = ()
 
 
 class LookupRadioField(LookupField):
-	pass
+	__slots__ = ()
 
 
 class LookupChoiceField(LookupField):
-	pass
+	__slots__ = ()
 
 
 class AppLookupField(Field):
@@ -4866,6 +5823,8 @@ class AppLookupField(Field):
 		in input forms.
 	"""
 
+	__slots__ = ()
+
 	ul4_attrs = Field.ul4_attrs.union({"lookupdata", "has_custom_lookupdata"})
 
 	def __init__(self, control, record, value):
@@ -4946,11 +5905,11 @@ class AppLookupField(Field):
 
 
 class AppLookupSelectField(AppLookupField):
-	pass
+	__slots__ = ()
 
 
 class AppLookupRadioField(AppLookupField):
-	pass
+	__slots__ = ()
 
 
 class AppLookupChoiceField(AppLookupField):
@@ -4975,6 +5934,9 @@ class AppLookupChoiceField(AppLookupField):
 		The name for the parameter containing css selector for the target html element.
 		This value is inherited from the control and can be changed.
 	"""
+
+	__slots__ = ("_search_url", "_search_param_name", "_target_param_name")
+
 	ul4_attrs = AppLookupField.ul4_attrs.union({"search_url", "search_param_name", "target_param_name"})
 
 	def __init__(self, control, record, value):
@@ -5009,6 +5971,24 @@ class AppLookupChoiceField(AppLookupField):
 
 
 class MultipleLookupField(LookupField):
+	__slots__ = ()
+
+	@classmethod
+	def _make_value_converter(cls, control):
+		if cls._set_value is not MultipleLookupField._set_value:
+			return super()._make_value_converter(control)
+		required = control.required
+		lookupdata = control.lookupdata or {}
+		none_key = control.none_key
+
+		def convert(value):
+			if value.__class__ is list and value and all(v.__class__ is str and v and v != none_key and v in lookupdata for v in value):
+				return [lookupdata[v] for v in value]
+			elif (value is None or value == []) and not required:
+				return []
+			return _unconverted
+		return convert
+
 	def _set_value(self, value):
 		if value is None or value == "" or value == self.control.none_key:
 			if self.required:
@@ -5040,18 +6020,20 @@ class MultipleLookupField(LookupField):
 
 
 class MultipleLookupSelectField(MultipleLookupField):
-	pass
+	__slots__ = ()
 
 
 class MultipleLookupCheckboxField(MultipleLookupField):
-	pass
+	__slots__ = ()
 
 
 class MultipleLookupChoiceField(MultipleLookupField):
-	pass
+	__slots__ = ()
 
 
 class MultipleAppLookupField(AppLookupField):
+	__slots__ = ()
+
 	def _set_value(self, value):
 		if value is None or value == "" or value == self.control.none_key:
 			if self.required:
@@ -5091,15 +6073,15 @@ class MultipleAppLookupField(AppLookupField):
 
 
 class MultipleAppLookupSelectField(MultipleAppLookupField):
-	pass
+	__slots__ = ()
 
 
 class MultipleAppLookupCheckboxField(MultipleAppLookupField):
-	pass
+	__slots__ = ()
 
 
 class MultipleAppLookupChoiceField(MultipleAppLookupField):
-	pass
+	__slots__ = ()
 
 
 class Control(CustomAttributes):
@@ -6976,6 +7958,105 @@ class State(misc.Enum):
 	DELETED = "deleted"
 
 
+class FieldDict(attrdict):
+	"""
+	A :class:`FieldDict` is the value of :attr:`Record.fields` for records that
+	have been loaded from an UL4ON dump.
+
+	The :class:`Field` objects will be created on first access. Accessing a
+	single field (via ``fields[identifier]``, ``fields.identifier`` or
+	:meth:`get`) only creates this field. Everything that needs all fields
+	(iterating, :meth:`values`, :meth:`items`, :func:`len` etc.) creates all
+	missing fields.
+	"""
+
+	def __init__(self, record:Record):
+		super().__init__()
+		self.__dict__["_record"] = record
+		self.__dict__["_complete"] = False
+
+	def __missing__(self, identifier:str) -> Field:
+		record = self._record
+		control = record.app.controls[identifier]
+		values = record._sparse_values
+		value = values.get(identifier, None) if values is not None else None
+		field = control.fieldtype(control, record, value)
+		dict.__setitem__(self, identifier, field)
+		return field
+
+	def _materialize(self) -> None:
+		"""
+		Create all missing :class:`Field` objects.
+		"""
+		if not self._complete:
+			fields = [(identifier, self[identifier]) for identifier in self._record.app.controls]
+			# Make sure that the order of the fields is the order of the controls
+			dict.clear(self)
+			dict.update(self, fields)
+			self.__dict__["_complete"] = True
+			self._record._sparse_values = None
+			self._record._sparse_fielderrors = None
+			self._record._sparse_lookupdata = None
+
+	def materialized(self) -> Iterable[Field]:
+		"""
+		Return the :class:`Field` objects that have been created so far.
+		"""
+		return dict.values(self)
+
+	def is_materialized(self, identifier:str) -> bool:
+		"""
+		Return whether the :class:`Field` for ``identifier`` has been created.
+		"""
+		return dict.__contains__(self, identifier)
+
+	def get(self, identifier:str, default:Any=None) -> Any:
+		if identifier in self:
+			return self[identifier]
+		return default
+
+	def __contains__(self, identifier:str) -> bool:
+		return identifier in self._record.app.controls
+
+	def __iter__(self):
+		self._materialize()
+		return super().__iter__()
+
+	def __len__(self) -> int:
+		return len(self._record.app.controls)
+
+	def keys(self):
+		self._materialize()
+		return super().keys()
+
+	def values(self):
+		self._materialize()
+		return super().values()
+
+	def items(self):
+		self._materialize()
+		return super().items()
+
+	def copy(self) -> attrdict:
+		self._materialize()
+		return attrdict(super().items())
+
+	def __eq__(self, other:Any) -> bool:
+		self._materialize()
+		return super().__eq__(other)
+
+	def __ne__(self, other:Any) -> bool:
+		self._materialize()
+		return super().__ne__(other)
+
+	def __repr__(self) -> str:
+		self._materialize()
+		return super().__repr__()
+
+	def __dir__(self) -> set[str]:
+		return set(dir(dict)) | set(self._record.app.controls)
+
+
 @register("record")
 class Record(CustomAttributes, WithAttachments):
 	"""
@@ -7165,6 +8246,31 @@ class Record(CustomAttributes, WithAttachments):
 		self._sparse_fielderrors = None
 		self._sparse_lookupdata = None
 
+	def _make_fields_converted(self, values, converters):
+		"""
+		Create the fields of this new record from ``values`` (a dictionary
+		mapping identifiers to field values) using ``converters`` (a list of
+		controls and converter functions as returned by
+		:meth:`Field._make_converter`).
+
+		Fields that are set from ``values`` are marked as dirty like they are
+		when setting :attr:`Field.value`.
+		"""
+		fields = attrdict()
+		for (control, convert) in converters:
+			identifier = control.identifier
+			field = control.fieldtype(control, self, None)
+			if identifier in values:
+				value = values[identifier]
+				field.errors.clear()
+				convert(field, value)
+				field._dirty = value is not None
+			fields[identifier] = field
+		self.__dict__["fields"] = fields
+		self._sparse_values = None
+		self._sparse_fielderrors = None
+		self._sparse_lookupdata = None
+
 	def _template_candidates(self):
 		handler = self._gethandler()
 		yield handler.fetch_internaltemplates(self.app.id, "record_instance", None)
@@ -7172,23 +8278,80 @@ class Record(CustomAttributes, WithAttachments):
 
 	def _fields_get(self):
 		if self.__dict__["fields"] is None:
-			self._make_fields(False, self._sparse_values, self._sparse_fielderrors, self._sparse_lookupdata)
+			# Create the :class:`Field` objects only when they are accessed
+			self.__dict__["fields"] = FieldDict(self)
 		return self.__dict__["fields"]
 
+	def _materialized_fields(self) -> Iterable[Field]:
+		"""
+		Return the :class:`Field` objects that have been created so far.
+
+		Fields that haven't been created yet can't be dirty or have errors.
+		"""
+		fields = self.__dict__["fields"]
+		if fields is None:
+			return ()
+		elif isinstance(fields, FieldDict):
+			return fields.materialized()
+		else:
+			return fields.values()
+
+	def _field_if_materialized(self, identifier:str) -> Field | None:
+		"""
+		Return the :class:`Field` object for ``identifier`` if it has been
+		created already, else return ``None``.
+		"""
+		fields = self.__dict__["fields"]
+		if fields is None:
+			return None
+		elif isinstance(fields, FieldDict):
+			return fields[identifier] if fields.is_materialized(identifier) else None
+		else:
+			return fields.get(identifier, None)
+
+	def _field_values(self) -> Generator[tuple[str, Any], None, None]:
+		"""
+		Generate the identifiers and values of all fields of this record.
+
+		Values of fields that haven't been created yet are converted via the
+		functions from :meth:`App._value_converters`. Only values that can't be
+		converted this way create the :class:`Field` object.
+		"""
+		fields = self.__dict__["fields"]
+		if fields is not None and not isinstance(fields, FieldDict):
+			for (identifier, field) in fields.items():
+				yield (identifier, field.value)
+			return
+		sparse_values = self._sparse_values or {}
+		converters = self.app._value_converters()
+		for identifier in self.app.controls:
+			if fields is not None and fields.is_materialized(identifier):
+				yield (identifier, fields[identifier].value)
+				continue
+			convert = converters[identifier]
+			value = convert(sparse_values.get(identifier, None)) if convert is not None else _unconverted
+			if value is _unconverted:
+				fields = self.fields
+				value = fields[identifier].value
+			yield (identifier, value)
+
 	def _values_get(self):
 		values = self.__dict__["values"]
 		if values is None:
-			values = attrdict()
-			for field in self.fields.values():
-				values[field.control.identifier] = field.value
-			self._sparse_values = None
-			self.__dict__["values"] = values
+			values = self.__dict__["values"] = attrdict(self._field_values())
 		return values
 
 	def _values_ul4onget(self):
 		values = self._sparse_values
-		if values is None:
-			values = {field.control.identifier: field.value for field in self.fields.values() if not field.is_empty()}
+		if values is None or self.__dict__["fields"] is not None:
+			# Only fields that have been created might have been changed
+			values = dict(values or {})
+			for field in self._materialized_fields():
+				identifier = field.control.identifier
+				if field.is_empty():
+					values.pop(identifier, None)
+				else:
+					values[identifier] = field.value
 		return values
 
 	def _values_ul4onset(self, value):
@@ -7198,10 +8361,17 @@ class Record(CustomAttributes, WithAttachments):
 		self.__dict__["fields"] = None
 
 	def _fielderrors_ul4onget(self):
-		if self._sparse_fielderrors is not None:
+		if self.__dict__["fields"] is None and self._sparse_fielderrors is not None:
 			return self._sparse_fielderrors
 
-		result = {field.control.identifier: field.errors for field in self.fields.values() if field.has_errors()}
+		result = {}
+		if self._sparse_fielderrors is not None:
+			for (identifier, errors) in self._sparse_fielderrors.items():
+				if self._field_if_materialized(identifier) is None:
+					result[identifier] = errors
+		for field in self._materialized_fields():
+			if field.has_errors():
+				result[field.control.identifier] = field.errors
 		return result or None
 
 	def _fielderrors_ul4onset(self, value):
@@ -7411,6 +8581,13 @@ class Record(CustomAttributes, WithAttachments):
 		self._new = False
 		return result
 
+	async def asave(self, force=False, sync=False):
+		"""
+		Asynchronous version of :meth:`save` (see
+		:class:`~ll.la.handlers.AsyncHandler`).
+		"""
+		return await self._gethandler()._run_async(self.save, force=force, sync=sync)
+
 	def update(self, **kwargs):
 		for (identifier, value) in kwargs.items():
 			if identifier not in self.app.controls:
@@ -7421,6 +8598,13 @@ class Record(CustomAttributes, WithAttachments):
 	def delete(self):
 		self._gethandler().delete_record(self)
 
+	async def adelete(self):
+		"""
+		Asynchronous version of :meth:`delete` (see
+		:class:`~ll.la.handlers.AsyncHandler`).
+		"""
+		return await self._gethandler()._run_async(self.delete)
+
 	def executeaction(self, identifier, sync=False):
 		self._gethandler()._executeaction(self, identifier, sync=sync)
 
@@ -7514,32 +8698,29 @@ class Record(CustomAttributes, WithAttachments):
 			record=self,
 		)
 
-	def fetch_child_recordpage(self, filter:dict[App, list[str] | str], sort:list[str] | str | None=None, offset:int | None=0, limit:int | None=None) -> RecordPage:
+	def fetch_child_recordpage(self, filter:dict[App, list[str] | str], sort:list[str] | str | None=None, offset:int | None=0, limit:int | None=None, fetch_total:bool=False) -> RecordPage:
 		return RecordChildrenRecordPage(
 			self,
 			filter,
 			_make_sort(sort),
 			_make_offset(offset),
 			_make_limit(limit),
+			fetch_total,
 		)
 
 	def has_errors(self):
 		if self.errors:
 			return True
-		elif self._sparse_values is not None:
-			# Shortcut: If we haven't constructed the :class:`Field` objects yet, they can't contain errors
-			return False
 		else:
-			return any(field.has_errors() for field in self.fields.values())
+			# Shortcut: :class:`Field` objects that haven't been constructed yet can't contain errors
+			return any(field.has_errors() for field in self._materialized_fields())
 
 	def has_errors_in_active_view(self):
 		if self.errors:
 			return True
-		elif self._sparse_values is not None:
-			# Shortcut: If we haven't constructed the :class:`Field` objects yet, they can't contain errors
-			return False
 		elif self.app.active_view is not None:
-			for field in self.fields.values():
+			# Shortcut: :class:`Field` objects that haven't been constructed yet can't contain errors
+			for field in self._materialized_fields():
 				if field.control.identifier in self.app.active_view.controls and field.has_errors():
 					return True
 		else:
@@ -7553,27 +8734,23 @@ class Record(CustomAttributes, WithAttachments):
 
 	def clear_all_errors(self):
 		self.clear_errors()
-		# Shortcut: If we haven't constructed the :class:`Field` objects yet, they can't contain errors
-		if self._sparse_values is None:
-			for field in self.fields.values():
-				field.clear_errors()
+		# Shortcut: :class:`Field` objects that haven't been constructed yet can't contain errors
+		for field in self._materialized_fields():
+			field.clear_errors()
 
 	def check_errors(self):
 		if self.errors:
 			raise RecordValidationError(self, self.errors[0])
-		# Shortcut: If we haven't constructed the :class:`Field` objects yet, they can't contain errors
-		if self._sparse_values is None:
-			for field in self.fields.values():
-				field.check_errors()
+		# Shortcut: :class:`Field` objects that haven't been constructed yet can't contain errors
+		for field in list(self._materialized_fields()):
+			field.check_errors()
 
 	def is_dirty(self):
 		if self.id is None:
 			return True
-		elif self._sparse_values is not None:
-			# Shortcut: If we haven't constructed the :class:`Field` objects yet, they can't be dirty
-			return False
 		else:
-			return any(field._dirty for field in self.fields.values())
+			# Shortcut: :class:`Field` objects that haven't been constructed yet can't be dirty
+			return any(field._dirty for field in self._materialized_fields())
 
 	def is_deleted(self):
 		return self._deleted
@@ -7919,6 +9096,219 @@ class EMailAttachment(Base):
 		return len(self.content) if self.content is not None else None
 
 
+class RecordBatch:
+	"""
+	A :class:`!RecordBatch` stores records in columnar form.
+
+	Record metadata (:attr:`ids`, :attr:`apps`, :attr:`createdat`,
+	:attr:`createdby`, :attr:`updatedat`, :attr:`updatedby` and
+	:attr:`updatecount`) and the field values are stored as one list per
+	column (field values are stored in :mod:`array` objects if all values in
+	the column are :class:`int` or :class:`float` objects). :class:`Record`
+	objects will only be created when a row is accessed via indexing or
+	iteration. This makes scanning, filtering and aggregating large numbers of
+	records much faster and requires much less memory.
+
+	A :class:`!RecordBatch` can be created via passing ``batch=True`` to
+	:meth:`App.fetch_records` or :meth:`AppGroup.fetch_records` or via
+	:meth:`DataSource.record_batch`.
+
+	The columns contain the same values as :attr:`Record.values`. The
+	:class:`Record` object for a row is the object from the UL4ON registry of
+	the handler if the registry contains a record with this id, otherwise a
+	new :class:`Record` object will be created and put into the registry.
+
+	For example::
+
+		batch = app.fetch_records("True", batch=True)
+		total = sum(v for v in batch.column("amount") if v is not None)
+		big = batch.where(v is not None and v > 1000 for v in batch.column("amount"))
+		for record in big:
+			print(record)
+	"""
+
+	_metacolumns = ("ids", "apps", "createdat", "createdby", "updatedat", "updatedby", "updatecount")
+
+	def __init__(self, ids:list[str], apps:list[App], createdat:list, createdby:list, updatedat:list, updatedby:list, updatecount:list, columns:dict[str, list]):
+		self.ids = ids
+		self.apps = apps
+		self.createdat = createdat
+		self.createdby = createdby
+		self.updatedat = updatedat
+		self.updatedby = updatedby
+		self.updatecount = updatecount
+		self.columns = columns
+		self._records = {}
+
+	@classmethod
+	def from_records(cls, records:Iterable[Record]) -> RecordBatch:
+		"""
+		Create a :class:`!RecordBatch` from the :class:`Record` objects ``records``.
+
+		The columns contain the field values as returned by :attr:`Record.values`
+		(but the values are converted without creating :class:`Field` objects
+		where possible).
+		"""
+		records = list(records)
+		identifiers = {}
+		for app in {id(record.app): record.app for record in records}.values():
+			for identifier in app.controls:
+				identifiers[identifier] = None
+		columns = {identifier: [] for identifier in identifiers}
+		for record in records:
+			values = record.__dict__["values"]
+			if values is None:
+				values = dict(record._field_values())
+			for (identifier, column) in columns.items():
+				column.append(values.get(identifier, None))
+		return cls(
+			ids=[record.id for record in records],
+			apps=[record.app for record in records],
+			createdat=[record.createdat for record in records],
+			createdby=[record.createdby for record in records],
+			updatedat=[record.updatedat for record in records],
+			updatedby=[record.updatedby for record in records],
+			updatecount=[record.updatecount for record in records],
+			columns={identifier: cls._compact(column) for (identifier, column) in columns.items()},
+		)
+
+	@classmethod
+	def _from_fetched_records(cls, handler:Handler, globals:Globals, records:dict[str, Record], start:int) -> RecordBatch:
+		"""
+		Create a :class:`!RecordBatch` from the records ``records`` that have
+		just been fetched by ``handler`` and remove them (and all other objects
+		loaded since the backreference registry had the length ``start``) from
+		the handler's UL4ON registry.
+		"""
+		batch = cls.from_records(records.values())
+		handler.release_objects(globals, records.values(), start)
+		return batch
+
+	@staticmethod
+	def _compact(column:list) -> list | array.array:
+		"""
+		Return ``column`` as an :class:`array.array` if possible.
+		"""
+		if column:
+			if all(type(value) is int for value in column):
+				try:
+					return array.array("q", column)
+				except OverflowError:
+					return column
+			elif all(type(value) is float for value in column):
+				return array.array("d", column)
+		return column
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__module__}.{self.__class__.__qualname__} count={len(self)} columns={len(self.columns)} at {id(self):#x}>"
+
+	def __len__(self) -> int:
+		return len(self.ids)
+
+	def __iter__(self) -> Generator[Record, None, None]:
+		for i in range(len(self)):
+			yield self[i]
+
+	def __getitem__(self, index:int | slice) -> Record | RecordBatch:
+		"""
+		Return the :class:`Record` for row ``index`` or a new
+		:class:`!RecordBatch` if ``index`` is a slice.
+		"""
+		if isinstance(index, slice):
+			return self.take(range(len(self))[index])
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError(f"RecordBatch index {index} out of range")
+		try:
+			return self._records[index]
+		except KeyError:
+			record = self._records[index] = self._make_record(index)
+			return record
+
+	def _make_record(self, index:int) -> Record:
+		app = self.apps[index]
+		try:
+			decoder = app._gethandler().ul4on_decoder
+		except NoHandlerError:
+			decoder = None
+		if decoder is not None:
+			record = decoder.persistent_object(Record.ul4onname, self.ids[index])
+			if record is not None:
+				return record
+		record = Record(
+			id=self.ids[index],
+			app=app,
+			createdat=self.createdat[index],
+			createdby=self.createdby[index],
+			updatedat=self.updatedat[index],
+			updatedby=self.updatedby[index],
+			updatecount=self.updatecount[index],
+		)
+		values = attrdict()
+		for identifier in app.controls:
+			value = self.columns[identifier][index]
+			if value is not None:
+				values[identifier] = value
+		record._sparse_values = values
+		record._new = False
+		if decoder is not None:
+			decoder.store_persistent_object(record)
+		return record
+
+	def column(self, identifier:str, numpy:bool=False) -> list | array.array:
+		"""
+		Return the values of the field ``identifier`` for all rows.
+
+		``identifier`` may also be the name of a metadata column (i.e. ``ids``,
+		``apps``, ``createdat``, ``createdby``, ``updatedat``, ``updatedby`` or
+		``updatecount``).
+
+		If ``numpy`` is true the column will be returned as a NumPy array (this
+		requires that :mod:`numpy` is installed).
+		"""
+		if identifier in self._metacolumns:
+			column = getattr(self, identifier)
+		else:
+			column = self.columns[identifier]
+		if numpy:
+			import numpy # This requires the :mod:`numpy` module, install with ``pip install numpy``
+			if isinstance(column, array.array):
+				column = numpy.frombuffer(column, dtype=numpy.int64 if column.typecode == "q" else numpy.float64)
+			else:
+				column = numpy.array(column, dtype=object)
+		return column
+
+	def take(self, indices:Iterable[int]) -> RecordBatch:
+		"""
+		Return a new :class:`!RecordBatch` containing the rows with the
+		indexes ``indices``.
+		"""
+		indices = list(indices)
+		def pick(column):
+			picked = [column[i] for i in indices]
+			return array.array(column.typecode, picked) if isinstance(column, array.array) else picked
+		return self.__class__(
+			**{name: pick(getattr(self, name)) for name in self._metacolumns},
+			columns={identifier: pick(column) for (identifier, column) in self.columns.items()},
+		)
+
+	def where(self, mask:Iterable[bool]) -> RecordBatch:
+		"""
+		Return a new :class:`!RecordBatch` containing the rows for which the
+		corresponding item in ``mask`` is true.
+		"""
+		return self.take(i for (i, keep) in enumerate(mask) if keep)
+
+	def records(self) -> dict[str, Record]:
+		"""
+		Return all records as a dictionary with record ids as the keys and
+		:class:`Record` objects as the value (i.e. the same format that
+		:meth:`App.fetch_records` returns without ``batch=True``).
+		"""
+		return {record.id: record for record in self}
+
+
 @register("recordpage")
 class RecordPage(Base):
 	"""
@@ -7977,6 +9367,17 @@ class RecordPage(Base):
 
 		The total number of recors matching ``filter`` (i.e. then number of
 		records that would have been return without ``limit`` and ``offset``.
+
+	If ``fetch_total`` is true (and ``offset`` or ``limit`` is used) the
+	records and the total will be fetched with the same database query instead
+	of issueing a separate count query when ``total`` is accessed.
+
+	``prefetch`` specifies whether adjacent pages should be fetched in the
+	background once the records of this page have been fetched: ``"next"``
+	prefetches the next page, ``"adjacent"`` the next and the previous page
+	and :const:`None` disables prefetching. Currently this is only supported
+	by :class:`AppRecordPage` with a :class:`~ll.la.handlers.DBHandler` that
+	has a ``prefetch_pool`` (see :meth:`~ll.la.handlers.DBHandler.prefetch_records`).
 	"""
 
 	ul4_attrs = Base.ul4_attrs.union({"filter", "sort", "offset", "limit", "records", "count", "total"})
@@ -7990,11 +9391,15 @@ class RecordPage(Base):
 	count = Attr(int, get=True, ul4get=True, ul4onget=True, ul4onset=True)
 	total = Attr(int, get=True, ul4get=True, ul4onget=True, ul4onset=True)
 
-	def __init__(self, filter: list[str], sort: list[str] | None=None, offset: int=0, limit: int | None=None):
+	def __init__(self, filter: list[str], sort: list[str] | None=None, offset: int=0, limit: int | None=None, fetch_total: bool=False, prefetch: str | None=None):
+		if prefetch not in (None, "next", "adjacent"):
+			raise ValueError(f"prefetch must be None, 'next' or 'adjacent', got {prefetch!r}")
 		self.filter = filter
 		self.sort = sort
 		self.offset = offset or 0
 		self.limit = limit
+		self.fetch_total = fetch_total
+		self.prefetch = prefetch
 		self._records = None
 		self._count = None
 		self._total = None
@@ -8015,7 +9420,12 @@ class RecordPage(Base):
 	@property
 	def records(self) -> dict[str, Record]:
 		if self._records is None:
-			self._records = self._fetch_records()
+			if self.fetch_total and self._total is None and (self.offset > 0 or self.limit is not None):
+				(self._records, self._total) = self._fetch_records_and_total()
+			else:
+				self._records = self._fetch_records()
+			if self.prefetch is not None:
+				self._prefetch()
 		return self._records
 
 	@property
@@ -8028,7 +9438,10 @@ class RecordPage(Base):
 	def total(self) -> int:
 		if self._total is None:
 			if self.offset > 0 or self.limit is not None:
-				self._total = self._count_records()
+				if self.fetch_total and self._records is None:
+					self.records
+				if self._total is None:
+					self._total = self._count_records()
 			else:
 				self._total = self.count
 		return self._total
@@ -8037,6 +9450,23 @@ class RecordPage(Base):
 	def _fetch_records(self) -> dict[str, Record]:
 		pass
 
+	def _fetch_records_and_total(self) -> tuple[dict[str, Record], int | None]:
+		"""
+		Fetch the records and the total number of matching records in one go.
+
+		The total may be :const:`None` if it isn't available (in this case
+		:meth:`_count_records` will be used for getting it).
+		"""
+		return (self._fetch_records(), None)
+
+	def _prefetch(self) -> None:
+		"""
+		Start fetching the pages adjacent to this one in the background (as
+		specified by :attr:`prefetch`).
+
+		The default implementation does nothing.
+		"""
+
 	@misc.notimplemented
 	def _count_records(self) -> int:
 		pass
@@ -8059,13 +9489,29 @@ class AppRecordPage(RecordPage):
 
 	app = Attr(App, get=True, ul4get=True, ul4onget=True, ul4onset=True)
 
-	def __init__(self, app, filter, sort=None, offset=0, limit=None):
-		super().__init__(filter=filter, sort=sort, offset=offset, limit=limit)
+	def __init__(self, app, filter, sort=None, offset=0, limit=None, fetch_total=False, prefetch=None):
+		super().__init__(filter=filter, sort=sort, offset=offset, limit=limit, fetch_total=fetch_total, prefetch=prefetch)
 		self.app = app
 
 	def _fetch_records(self) -> dict[str, Record]:
 		return self.app.fetch_records(self.filter, self.sort, self.offset, self.limit)
 
+	def _fetch_records_and_total(self) -> tuple[dict[str, Record], int | None]:
+		handler = self.app._gethandler()
+		if not isinstance(handler, DBHandler):
+			return super()._fetch_records_and_total()
+		return handler.fetch_records(self.app, filter=self.filter, sort=self.sort, offset=self.offset, limit=self.limit, total=True)
+
+	def _prefetch(self) -> None:
+		handler = self.app._gethandler()
+		if self.limit is None or not isinstance(handler, DBHandler):
+			return
+		# If this page isn't full (or we know that it's the last one), there is no next page
+		if len(self._records) >= self.limit and (self._total is None or self.offset + self.limit < self._total):
+			handler.prefetch_records(self.app, self.filter, self.sort, self.offset + self.limit, self.limit)
+		if self.prefetch == "adjacent" and self.offset > 0:
+			handler.prefetch_records(self.app, self.filter, self.sort, max(0, self.offset - self.limit), self.limit)
+
 	def _count_records(self) -> int:
 		return self.app.count_records(self.filter)
 
@@ -8089,13 +9535,27 @@ class RecordChildrenRecordPage(RecordPage):
 	filter = Attr(dict, get=True, ul4get=True, ul4onget=True, ul4onset=True)
 	record = Attr(Record, get=True, ul4get=True, ul4onget=True, ul4onset=True)
 
-	def __init__(self, record, filter, sort=None, offset=0, limit=None):
-		super().__init__(filter=filter, sort=sort, offset=offset, limit=limit)
+	def __init__(self, record, filter, sort=None, offset=0, limit=None, fetch_total=False):
+		super().__init__(filter=filter, sort=sort, offset=offset, limit=limit, fetch_total=fetch_total)
 		self.record = record
 
 	def _fetch_records(self) -> dict[str, Record]:
 		return self.record.fetch_child_records(self.filter, self.sort, self.offset, self.limit)
 
+	def _fetch_records_and_total(self) -> tuple[dict[str, Record], int | None]:
+		handler = self.record._gethandler()
+		if not isinstance(handler, DBHandler):
+			return super()._fetch_records_and_total()
+		return handler.fetch_records_from_apps(
+			globals=self.record.app.globals,
+			filter=self.record._make_children_filter(self.filter),
+			sort=self.sort,
+			offset=self.offset,
+			limit=self.limit,
+			record=self.record,
+			total=True,
+		)
+
 	def _count_records(self) -> int:
 		return self.record.count_child_records(self.filter)
 
@@ -8119,13 +9579,26 @@ class AppGroupRecordPage(RecordPage):
 	filter = Attr(dict, get=True, ul4get=True, ul4onget=True, ul4onset=True)
 	appgroup = Attr(AppGroup, get=True, ul4get=True, ul4onget=True, ul4onset=True)
 
-	def __init__(self, appgroup, filter, sort=None, offset=0, limit=None):
-		super().__init__(filter=filter, sort=sort, offset=offset, limit=limit)
+	def __init__(self, appgroup, filter, sort=None, offset=0, limit=None, fetch_total=False):
+		super().__init__(filter=filter, sort=sort, offset=offset, limit=limit, fetch_total=fetch_total)
 		self.appgroup = appgroup
 
 	def _fetch_records(self) -> dict[str, Record]:
 		return self.appgroup.fetch_records(self.filter, self.sort, self.offset, self.limit)
 
+	def _fetch_records_and_total(self) -> tuple[dict[str, Record], int | None]:
+		handler = self.appgroup._gethandler()
+		if not isinstance(handler, DBHandler):
+			return super()._fetch_records_and_total()
+		return handler.fetch_records_from_apps(
+			globals=self.appgroup.globals,
+			filter=self.appgroup._make_filter(self.filter),
+			sort=self.sort,
+			offset=self.offset,
+			limit=self.limit,
+			total=True,
+		)
+
 	def _count_records(self) -> int:
 		return self.appgroup.count_records(self.filter)
 
@@ -10032,6 +11505,20 @@ class DataSource(Base):
 	def __str__(self) -> str:
 		return f"datasource={self.identifier}"
 
+	def record_batch(self) -> RecordBatch:
+		"""
+		Return the records of all apps in this data source as a
+		:class:`RecordBatch`.
+		"""
+		apps = self.apps
+		if not apps:
+			apps = {self.app.id: self.app} if self.app is not None else {}
+		records = []
+		for app in apps.values():
+			if app.records:
+				records.extend(app.records.values())
+		return RecordBatch.from_records(records)
+
 
 @register("externaldatasource")
 class ExternalDataSource(Base):
@@ -10206,6 +11693,8 @@ class LookupItem(Base):
 	ul4_attrs = Base.ul4_attrs.union({"id", "control", "key", "label", "visible"})
 	ul4_type = ul4c.Type("la", "LookupItem", "An option in a lookup control/field")
 
+	__slots__ = ("_id", "_control", "_key", "_label")
+
 	id = Attr(str, get=True, set=True, repr=True, ul4get=True)
 	control = Attr(lambda: LookupControl, get=True, set=True, ul4get=True, ul4onget=True, ul4onset=True)
 	key = Attr(str, get=True, set=True, repr=True, ul4get=True, ul4onget=True, ul4onset=True)
@@ -10291,6 +11780,8 @@ class ViewLookupItem(Base):
 	ul4_attrs = Base.ul4_attrs.union({"id", "key", "label", "visible"})
 	ul4_type = ul4c.Type("la", "ViewLookupItem", "View specific information about a lookup item")
 
+	__slots__ = ("_id", "_key", "_label", "_visible")
+
 	id = Attr(str, get=True, set=True, repr=True, ul4get=True)
 	key = Attr(str, get=True, set=True, repr=True, ul4get=True, ul4onget=True, ul4onset=True)
 	label = Attr(str, get=True, set=True, repr=True, ul4get=True, ul4onget=True, ul4onset=True)
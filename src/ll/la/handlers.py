@@ -30,7 +30,8 @@
 	and their configuration into and out of LivingApps.
 """
 
-import datetime, pathlib, itertools, json, operator, warnings, random
+import io, time, datetime, pathlib, itertools, json, operator, warnings, random, collections, contextlib, threading, asyncio, functools
+import concurrent.futures
 
 import requests, requests.exceptions # This requires :mod:`request`, which you can install with ``pip install requests``
 
@@ -60,7 +61,7 @@ from ll import la
 
 __docformat__ = "reStructuredText"
 
-__all__ = ["Handler", "HTTPHandler", "DBHandler", "FileHandler"]
+__all__ = ["Handler", "HTTPHandler", "DBHandler", "DBHandlerPool", "FileHandler", "AsyncHandler", "AsyncDBHandler", "AsyncHTTPHandler", "HandlerTrace"]
 
 
 ###
@@ -94,6 +95,255 @@ def raise_403(response):
 	raise requests.exceptions.HTTPError(http_error_msg, response=response)
 
 
+class _BLOBStream(io.RawIOBase):
+	"""
+	A readable binary stream that reads the content of a database BLOB in
+	chunks.
+
+	Wrapped in an :class:`io.TextIOWrapper` this can be passed to
+	:meth:`ll.ul4on.Decoder.load` so that an UL4ON dump can be decoded without
+	having the complete dump in memory (as :class:`bytes` and as :class:`str`).
+	"""
+
+	def __init__(self, lob):
+		self.lob = lob
+		self.size = lob.size()
+		self.offset = 0
+
+	def readable(self) -> bool:
+		return True
+
+	def seekable(self) -> bool:
+		# Required so that :meth:`io.TextIOWrapper.tell` works (which is used in
+		# error messages of the UL4ON decoder)
+		return True
+
+	def tell(self) -> int:
+		return self.offset
+
+	def seek(self, offset:int, whence:int=io.SEEK_SET) -> int:
+		if whence == io.SEEK_CUR:
+			offset += self.offset
+		elif whence == io.SEEK_END:
+			offset += self.size
+		self.offset = max(0, min(offset, self.size))
+		return self.offset
+
+	def readinto(self, buffer) -> int:
+		amount = min(len(buffer), self.size - self.offset)
+		if amount <= 0:
+			return 0
+		# LOB offsets are 1-based
+		data = self.lob.read(self.offset + 1, amount)
+		size = len(data)
+		buffer[:size] = data
+		self.offset += size
+		return size
+
+
+def _blobreader(lob, chunksize:int=1024*1024) -> io.TextIOWrapper:
+	"""
+	Return a text stream that decodes the UTF-8 content of the BLOB ``lob``
+	incrementally in chunks of ``chunksize`` bytes.
+	"""
+	return io.TextIOWrapper(io.BufferedReader(_BLOBStream(lob), chunksize), encoding="utf-8")
+
+
+###
+### Instrumentation
+###
+
+def _trace_summary(value, maxlen:int=80) -> str:
+	"""
+	Return a short description of the argument ``value`` for
+	:class:`HandlerTrace`.
+	"""
+	if isinstance(value, la.Base) and hasattr(value, "ul4onid"):
+		return f"<{value.__class__.__qualname__} {value.ul4onid}>"
+	elif isinstance(value, (list, tuple, set, dict)) and len(value) > 3:
+		return f"<{value.__class__.__qualname__} with {len(value):,} items>"
+	else:
+		result = repr(value)
+		if len(result) > maxlen:
+			result = result[:maxlen-3] + "..."
+		return result
+
+
+def _trace_sql(query) -> str:
+	"""
+	Return the SQL text of ``query`` (which might be a t-string) for
+	:class:`HandlerTrace`.
+	"""
+	if isinstance(query, str):
+		return query
+	return "".join(item if isinstance(item, str) else f"{{{item.expression}}}" for item in query)
+
+
+def _traced(function):
+	"""
+	Decorator for handler methods that should be recorded by the tracers of the
+	handler (see :meth:`Handler.trace`).
+	"""
+	@functools.wraps(function)
+	def wrapper(self, *args, **kwargs):
+		if not self._tracers:
+			return function(self, *args, **kwargs)
+		call = la.attrdict(
+			name=function.__name__,
+			args=", ".join(itertools.chain(
+				(_trace_summary(arg) for arg in args),
+				(f"{key}={_trace_summary(value)}" for (key, value) in kwargs.items()),
+			)),
+			sql=[],
+			elapsed=None,
+			dumpsize=0,
+			objects=0,
+			cache=None,
+			error=None,
+		)
+		outercall = self._trace_call
+		self._trace_call = call
+		start = time.perf_counter()
+		try:
+			return function(self, *args, **kwargs)
+		except BaseException as exc:
+			call.error = f"{exc.__class__.__qualname__}: {exc}"
+			raise
+		finally:
+			call.elapsed = time.perf_counter() - start
+			self._trace_call = outercall
+			for tracer in self._tracers:
+				tracer.add(call)
+	return wrapper
+
+
+class _TracingCursor:
+	"""
+	Wraps a database cursor and records the SQL of all executed statements in
+	the current call of a :class:`HandlerTrace`.
+	"""
+
+	def __init__(self, cursor, call):
+		self._cursor = cursor
+		self._call = call
+
+	def execute(self, query, *args, **kwargs):
+		self._call.sql.append(_trace_sql(query))
+		return self._cursor.execute(query, *args, **kwargs)
+
+	def executemany(self, query, *args, **kwargs):
+		self._call.sql.append(_trace_sql(query))
+		return self._cursor.executemany(query, *args, **kwargs)
+
+	def __getattr__(self, name):
+		return getattr(self._cursor, name)
+
+	def __iter__(self):
+		return iter(self._cursor)
+
+
+class HandlerTrace:
+	"""
+	A :class:`!HandlerTrace` collects information about the calls to a handler.
+
+	It's used like this::
+
+		with handler.trace() as t:
+			vt = handler.viewtemplate_data(app_id, template="export")
+			output = vt.renders(...)
+		for call in t.calls:
+			print(call.name, call.elapsed)
+
+	Each entry in :attr:`calls` is a :class:`~ll.la.attrdict` with the
+	following keys:
+
+	``name``
+		The name of the handler method (e.g. ``"fetch_records"`` or
+		``"_execute_incremental_ul4on_call"``).
+
+	``args``
+		A short description of the arguments as a string.
+
+	``sql``
+		A list with the SQL of all statements executed by this call (for
+		:class:`DBHandler`). Placeholders for t-string interpolations are shown
+		as ``{expression}``.
+
+	``elapsed``
+		The duration of the call in seconds (including nested calls).
+
+	``dumpsize``
+		The size of the UL4ON dumps that have been loaded by this call.
+
+	``objects``
+		The number of objects that have been added to the UL4ON registry.
+
+	``cache``
+		``"hit"`` or ``"miss"`` for calls that can use a cache (e.g. the
+		result cache for :meth:`DBHandler.count_records` or the UL4ON registry
+		for :meth:`DBHandler.record_sync_data`), :const:`None` otherwise.
+
+	``error``
+		The exception if the call failed (as a string), :const:`None`
+		otherwise.
+
+	Calls made during another recorded call are recorded as separate entries
+	(before the entry for the outer call).
+
+	If ``exporter`` is given, each call will be passed to its method
+	``export(call)`` when it has finished (e.g. for passing the data to a
+	metrics system).
+
+	A :class:`!HandlerTrace` can also be registered permanently via
+	:meth:`Handler.add_tracer`.
+	"""
+
+	def __init__(self, exporter=None):
+		self.exporter = exporter
+		self.calls = []
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__module__}.{self.__class__.__qualname__} calls={len(self.calls):,} at {id(self):#x}>"
+
+	def add(self, call:la.attrdict) -> None:
+		"""
+		Record the finished call ``call``.
+		"""
+		self.calls.append(call)
+		if self.exporter is not None:
+			self.exporter.export(call)
+
+	def clear(self) -> None:
+		"""
+		Forget all recorded calls.
+		"""
+		self.calls.clear()
+
+	def summary(self) -> dict[str, la.attrdict]:
+		"""
+		Return a dictionary that maps method names to the total number of calls,
+		the total time, number of SQL statements, dump size and number of
+		objects and the number of cache hits and misses for this method.
+		"""
+		result = {}
+		for call in self.calls:
+			entry = result.get(call.name)
+			if entry is None:
+				entry = result[call.name] = la.attrdict(calls=0, elapsed=0.0, sql=0, dumpsize=0, objects=0, hits=0, misses=0, errors=0)
+			entry["calls"] += 1
+			entry["elapsed"] += call.elapsed
+			entry["sql"] += len(call.sql)
+			entry["dumpsize"] += call.dumpsize
+			entry["objects"] += call.objects
+			if call.cache == "hit":
+				entry["hits"] += 1
+			elif call.cache == "miss":
+				entry["misses"] += 1
+			if call.error is not None:
+				entry["errors"] += 1
+		return result
+
+
 ###
 ### Handler classes
 ###
@@ -103,12 +353,59 @@ class Handler:
 	A :class:`Handler` object handles communication with a LivingApps system.
 	"""
 
-	def __init__(self):
+	# The :class:`concurrent.futures.Executor` used by :meth:`_run_async`
+	# (``None`` uses the default executor of the event loop)
+	executor = None
+
+	# The call currently recorded for the tracers of the handler (see :meth:`trace`)
+	_trace_call = None
+
+	def __init__(self, *, trusted=False, ul4on_limits=None):
+		"""
+		Create a new :class:`Handler`.
+
+		If ``trusted`` is true, UL4ON dumps received by this handler will be
+		decoded without type checks (see :attr:`trusted`).
+
+		``ul4on_limits`` can be used to limit the number of objects in the
+		UL4ON registry of this handler (see :attr:`ul4on_limits`).
+		"""
 		self.globals = None
 		registry = {
 			"de.livinglogic.livingapi.globals": self._loadglobals,
 		}
 		self.ul4on_decoder = ul4on.Decoder(registry)
+		self.trusted = trusted
+		self.ul4on_limits = dict(ul4on_limits) if ul4on_limits is not None else {}
+		# Serializes the calls in :meth:`_run_async` across threads and event loops
+		self._call_lock = threading.Lock()
+		# Maps event loops to the :class:`asyncio.Lock` used by :meth:`_run_async`
+		self._async_locks = {}
+		# Maps UL4ON type names to an :class:`~collections.OrderedDict` of the
+		# objects of this type (least recently used first)
+		self._ul4on_lru = {}
+		# Maps the ids of the objects in the backreference registry to their
+		# index (for the first ``_ul4on_slots_watermark`` slots)
+		self._ul4on_slots = {}
+		self._ul4on_slots_watermark = 0
+		# The registered :class:`HandlerTrace` objects
+		self._tracers = []
+
+	@property
+	def trusted(self) -> bool:
+		"""
+		Do we trust the UL4ON dumps we receive?
+
+		If this is true, attribute values from UL4ON dumps will be stored in the
+		LivingAPI objects without checking their type. Setting attributes from
+		Python or UL4 will still check the type. Set this to :const:`False` to
+		enable type checks for debugging.
+		"""
+		return self.ul4on_decoder.trusted
+
+	@trusted.setter
+	def trusted(self, value:bool) -> None:
+		self.ul4on_decoder.trusted = value
 
 	def reset(self) -> None:
 		"""
@@ -117,6 +414,255 @@ class Handler:
 		This reset the UL4ON decoder.
 		"""
 		self.ul4on_decoder.reset()
+		self._ul4on_lru.clear()
+		self._ul4on_slots.clear()
+		self._ul4on_slots_watermark = 0
+
+	def add_tracer(self, tracer:HandlerTrace) -> None:
+		"""
+		Register ``tracer``, so that all following calls of this handler will
+		be recorded by it.
+
+		``tracer`` must have a method ``add(call)`` (see :class:`HandlerTrace`).
+		"""
+		self._tracers.append(tracer)
+
+	def remove_tracer(self, tracer:HandlerTrace) -> None:
+		"""
+		Unregister ``tracer``.
+		"""
+		self._tracers.remove(tracer)
+
+	@contextlib.contextmanager
+	def trace(self, exporter=None) -> Generator[HandlerTrace, None, None]:
+		"""
+		Context manager that records the calls of this handler in the
+		``with`` block in a new :class:`HandlerTrace` object (which will be
+		returned).
+
+		``exporter`` will be passed to the :class:`HandlerTrace` constructor.
+		"""
+		tracer = HandlerTrace(exporter)
+		self.add_tracer(tracer)
+		try:
+			yield tracer
+		finally:
+			self.remove_tracer(tracer)
+
+	def _trace_note(self, **kwargs) -> None:
+		"""
+		Update the currently recorded call with ``kwargs`` (if there is one).
+		"""
+		if self._trace_call is not None:
+			self._trace_call.update(kwargs)
+
+	def _trace_dump(self, size:int, objects:int) -> None:
+		"""
+		Add the dump size ``size`` and the number of objects ``objects`` to the
+		currently recorded call (if there is one).
+		"""
+		call = self._trace_call
+		if call is not None:
+			call["dumpsize"] += size
+			call["objects"] += max(objects, 0)
+
+	async def _run_async(self, function:Callable, /, *args, **kwargs) -> Any:
+		"""
+		Call ``function(*args, **kwargs)`` in :attr:`executor` and return the
+		result.
+
+		As the database connection and the UL4ON decoder of a handler can only be
+		used by one thread at a time, all calls for one handler are serialized
+		(even if they come from different event loops). Calls for different
+		handlers can run concurrently.
+
+		If the awaiting task gets cancelled, the handler stays locked until
+		``function`` has finished in the executor.
+		"""
+		loop = asyncio.get_running_loop()
+		lock = self._async_locks.get(loop)
+		if lock is None:
+			for oldloop in [l for l in self._async_locks if l.is_closed()]:
+				del self._async_locks[oldloop]
+			lock = self._async_locks[loop] = asyncio.Lock()
+		async with lock:
+			future = loop.run_in_executor(self.executor, self._call_locked, function, args, kwargs)
+			try:
+				return await asyncio.shield(future)
+			except asyncio.CancelledError:
+				# ``function`` can't be stopped, so keep the lock until it's done
+				while not future.done():
+					try:
+						await asyncio.wait([future])
+					except asyncio.CancelledError:
+						pass
+				if not future.cancelled():
+					future.exception() # Mark the exception as retrieved
+				raise
+
+	def _call_locked(self, function:Callable, args:tuple, kwargs:dict) -> Any:
+		with self._call_lock:
+			return function(*args, **kwargs)
+
+	@property
+	def ul4on_limits(self) -> dict[str, int]:
+		"""
+		Maximum number of objects per UL4ON type name that will be kept in the
+		UL4ON registry of this handler.
+
+		For example ``{"de.livinglogic.livingapi.record": 10000}`` keeps at most
+		10000 records. When the limit is exceeded the least recently used objects
+		of this type will be removed from the registry (see
+		:meth:`release_objects`). Objects of types that aren't in
+		:attr:`!ul4on_limits` (like globals and app metadata) will never be
+		removed.
+		"""
+		return self._ul4on_limits
+
+	@ul4on_limits.setter
+	def ul4on_limits(self, value:dict[str, int]) -> None:
+		for (name, limit) in value.items():
+			if not isinstance(limit, int) or limit <= 0:
+				raise ValueError(f"limit for {name!r} must be a positive integer, got {limit!r}")
+		self._ul4on_limits = value
+
+	def _touch_ul4on_objects(self, globals:la.Globals, start:int, objects:Iterable[Any]=()) -> int:
+		"""
+		Mark objects in the UL4ON registry as recently used and remove the least
+		recently used ones if this exceeds :attr:`ul4on_limits`.
+
+		All objects in the backreference registry starting at index ``start``
+		(i.e. those that have been added by the last load) and the objects in
+		``objects`` (e.g. the records returned by :meth:`fetch_records`) will be
+		marked as recently used.
+
+		Return the number of objects that have been removed.
+		"""
+		limits = self.ul4on_limits
+		if not limits:
+			return 0
+		for obj in itertools.chain(self.ul4on_decoder._objects[start:], objects):
+			name = getattr(obj, "ul4onname", None)
+			if name in limits:
+				lru = self._ul4on_lru.get(name)
+				if lru is None:
+					lru = self._ul4on_lru[name] = collections.OrderedDict()
+				key = id(obj)
+				if key in lru:
+					lru.move_to_end(key)
+				else:
+					lru[key] = obj
+		evicted = []
+		for (name, lru) in self._ul4on_lru.items():
+			limit = limits.get(name)
+			if limit is not None and len(lru) > limit:
+				# Evict a quarter more than necessary, so that we don't have to sync
+				# the registry with the server after every call
+				for i in range(min(len(lru), len(lru) - limit + limit // 4)):
+					evicted.append(lru.popitem(last=False)[1])
+		if evicted:
+			self.release_objects(globals, evicted)
+		return len(evicted)
+
+	def release_objects(self, globals:la.Globals, objects:Iterable[Any], start:int | None = None) -> int:
+		"""
+		Remove the persistent objects ``objects`` (e.g. :class:`~ll.la.Record`
+		objects) from the UL4ON registry of this handler.
+
+		This is used by :meth:`~ll.la.App.iter_records` and for enforcing
+		:attr:`ul4on_limits` to keep the memory usage constant. Objects will be
+		removed from the registry of persistent objects and their slots in the
+		backreference registry will be released.
+
+		If ``start`` is not ``None`` all backreference slots starting at index
+		``start`` (i.e. the slots for all objects that have been loaded since
+		then) will be released too. Persistent objects in those slots (other than
+		``objects``) stay in the registry of persistent objects. Objects from
+		``objects`` that have already been in the backreference registry before
+		index ``start`` (e.g. records that have been loaded before and have been
+		loaded again) will be kept.
+
+		Released slots will be cleared (so that backreference indexes for other
+		objects don't change) and cleared slots at the end of the backreference
+		registry will be removed (see :meth:`_release_slots`).
+
+		Return the number of backreference slots that have been released.
+		"""
+		decoder = self.ul4on_decoder
+		registry = decoder._objects
+		slots = self._ul4on_slot_indexes()
+		indexes = set()
+		for obj in objects:
+			if start is not None:
+				index = slots.get(id(obj), None)
+				if index is not None and index < start and registry[index] is obj:
+					continue
+			decoder.forget_persistent_object(obj)
+			lru = self._ul4on_lru.get(getattr(obj, "ul4onname", None))
+			if lru is not None:
+				lru.pop(id(obj), None)
+			index = slots.pop(id(obj), None)
+			if index is not None and registry[index] is obj:
+				indexes.add(index)
+		if start is not None:
+			for index in range(start, len(registry)):
+				obj = registry[index]
+				if obj is not None:
+					if slots.get(id(obj), None) == index:
+						del slots[id(obj)]
+					indexes.add(index)
+		if indexes:
+			self._release_slots(globals, sorted(indexes))
+		return len(indexes)
+
+	def _ul4on_slot_indexes(self) -> dict[int, int]:
+		"""
+		Return a dictionary that maps the ids of the objects in the backreference
+		registry to their index (if an object is in the registry multiple times,
+		to the first index).
+
+		The dictionary is updated incrementally, i.e. only the slots that have
+		been added since the last call will be looked at.
+		"""
+		registry = self.ul4on_decoder._objects
+		slots = self._ul4on_slots
+		watermark = self._ul4on_slots_watermark
+		if watermark > len(registry):
+			# The registry has been reset behind our back
+			slots.clear()
+			watermark = 0
+		for index in range(watermark, len(registry)):
+			obj = registry[index]
+			if obj is not None:
+				oldindex = slots.get(id(obj), None)
+				if oldindex is None or oldindex >= index or registry[oldindex] is not obj:
+					slots[id(obj)] = index
+		self._ul4on_slots_watermark = len(registry)
+		return slots
+
+	def _release_slots(self, globals:la.Globals, indexes:list[int]) -> None:
+		"""
+		Clear the backreference slots ``indexes`` (which have been released by
+		:meth:`release_objects`).
+		"""
+		registry = self.ul4on_decoder._objects
+		for index in indexes:
+			registry[index] = None
+		self._truncate_ul4on_slots()
+
+	def _truncate_ul4on_slots(self) -> int:
+		"""
+		Remove cleared slots from the end of the backreference registry.
+
+		Return the new length of the registry.
+		"""
+		registry = self.ul4on_decoder._objects
+		length = len(registry)
+		while length and registry[length-1] is None:
+			length -= 1
+		del registry[length:]
+		self._ul4on_slots_watermark = min(self._ul4on_slots_watermark, length)
+		return length
 
 	def commit(self) -> None:
 		pass
@@ -165,6 +711,21 @@ class Handler:
 	def attachments_incremental_data(self, owner: la.Record | la.App | la.AppGroup):
 		return None
 
+	def incremental_data_many(self, globals:la.Globals, requests:list[tuple[la.App | la.AppGroup, str]]) -> list[Any]:
+		"""
+		Return the lazily loaded metadata for ``requests`` (used by
+		:meth:`~ll.la.Globals.prefetch`).
+
+		``requests`` is a list of ``(owner, name)`` tuples where ``owner`` is an
+		:class:`~ll.la.App` or :class:`~ll.la.AppGroup` and ``name`` is the name
+		of the attribute (e.g. ``"menus"`` or ``"apps"``). The result is a list
+		with the data for each request in the same order.
+
+		The base implementation returns :const:`None` for all requests (which
+		means that the data will be fetched when it is accessed).
+		"""
+		return [None] * len(requests)
+
 	def meta_data(self, *appids, records=False):
 		raise NotImplementedError
 
@@ -234,9 +795,69 @@ class Handler:
 	def save_record(self, record) -> None:
 		raise NotImplementedError
 
+	def save_records(self, records, batch_size:int = 100) -> list[bool | None]:
+		"""
+		Save all records in ``records``.
+
+		Subclasses can save the records in batches of ``batch_size`` records.
+		This base implementation simply calls :meth:`save_record` for each
+		record.
+
+		Return a list with the result of the save for each record (``True`` if
+		the record was saved, ``False`` if the record has errors and ``None`` if
+		the record has been deleted).
+		"""
+		return [self.save_record(record) for record in records]
+
+	def _record_saved(self, record, id) -> None:
+		"""
+		Update the bookkeeping attributes of ``record`` after it has been saved
+		successfully.
+
+		``id`` is the record id returned for a new record.
+		"""
+		app = record.app
+		if record.id is None:
+			record.id = id
+			record.createdat = datetime.datetime.now()
+			record.createdby = app.globals.user
+			record.updatecount = 0
+		else:
+			record.updatedat = datetime.datetime.now()
+			record.updatedby = app.globals.user
+			record.updatecount += 1
+		for field in record.fields.values():
+			field._dirty = False
+
 	def delete_record(self, record) -> None:
 		raise NotImplementedError
 
+	def delete_many(self, records, chunk_size:int = 1000) -> int:
+		"""
+		Delete all records in ``records`` (which may belong to different apps).
+
+		Subclasses can delete the records in chunks of ``chunk_size`` records.
+		This base implementation simply calls :meth:`delete_record` for each
+		record.
+
+		Return the number of records that have been deleted. If some records
+		couldn't be deleted, the remaining records will still be deleted and a
+		:class:`~ll.la.DeleteManyError` will be raised afterwards.
+		"""
+		count = 0
+		errors = []
+		for record in records:
+			if not record._deleted:
+				try:
+					self.delete_record(record)
+				except ValueError as exc:
+					errors.append((record, str(exc)))
+				else:
+					count += 1
+		if errors:
+			raise la.DeleteManyError(count, errors)
+		return count
+
 	def save_control(self, control) -> bool:
 		raise NotImplementedError
 
@@ -252,7 +873,7 @@ class Handler:
 	def save_file(self, file):
 		raise NotImplementedError
 
-	def save_parameter(self, parameter, recursive=True):
+	def save_parameter(self, parameter, recursive=True, bulk=False):
 		raise NotImplementedError
 
 	def save_attachment(self, attachment) -> None:
@@ -300,7 +921,10 @@ class Handler:
 		return globals
 
 	def _loaddump(self, dump):
+		start = len(self.ul4on_decoder._objects)
+		size = len(dump)
 		dump = self.ul4on_decoder.loads(dump)
+		self._trace_dump(size, len(self.ul4on_decoder._objects) - start)
 		if isinstance(dump, dict):
 			dump = la.attrdict(dump)
 			if "datasources" in dump:
@@ -321,7 +945,34 @@ class DBHandler(Handler):
 	)
 	""".strip()
 
-	def __init__(self, *, connection=None, connectstring=None, connection_postgres=None, connectstring_postgres=None, uploaddir=None, ide_account=None, ide_id=None, session_id=None):
+	# Process wide cache for the PL/SQL blocks generated by :meth:`fetch_records`
+	# (see :meth:`_fetch_records_query`)
+	fetch_records_cache = collections.OrderedDict()
+	fetch_records_cache_size = 256
+	fetch_records_cache_stats = la.attrdict(hits=0, misses=0)
+	_fetch_records_cache_lock = threading.Lock()
+
+	# Maximum number of record ids passed to the database in one call by
+	# :meth:`records_sync_data`
+	records_sync_chunksize = 500
+
+	# Maximum number of function calls that :meth:`incremental_data_many`
+	# combines into one PL/SQL block
+	incremental_data_chunksize = 50
+
+	# Maximum number of parameters saved with one PL/SQL block by
+	# :meth:`save_parameter` with ``bulk=True``
+	parameters_bulk_chunksize = 200
+
+	# Number of backreference slots released by :meth:`release_objects` after
+	# which the slots are cleared and the registry is synced with the database
+	ul4on_release_threshold = 10000
+
+	# Number of seconds :meth:`fetch_records` waits for a running background
+	# fetch from :meth:`prefetch_records` before querying the database itself
+	page_cache_timeout = 1.0
+
+	def __init__(self, *, connection=None, connectstring=None, connection_postgres=None, connectstring_postgres=None, uploaddir=None, ide_account=None, ide_id=None, session_id=None, trusted=True, ul4on_limits=None, result_cache_ttl=None, result_cache_size=1000, prefetch_pool=None, page_cache_size=8):
 		"""
 		Create a new :class:`DBHandler`.
 
@@ -341,9 +992,29 @@ class DBHandler(Handler):
 		account name (i.e. the email address) of the user or ``ide_id`` which
 		must be the users database id. If neither is given only public view
 		templates can be fetched.
+
+		Since UL4ON dumps come directly from the database, they are trusted by
+		default, i.e. they will be decoded without type checks. Pass
+		``trusted=False`` to enable type checks (see :attr:`Handler.trusted`).
+
+		For long running processes ``ul4on_limits`` can be used to limit the
+		number of records etc. that are kept in the UL4ON registry (see
+		:attr:`Handler.ul4on_limits`).
+
+		If ``result_cache_ttl`` is given (in seconds), the results of
+		:meth:`count_records` and :meth:`aggregate_records` will be cached for
+		that long. The cache holds at most ``result_cache_size`` results. The
+		cached results for an app will be dropped when records of the app are
+		saved or deleted via this handler (see :meth:`clear_result_cache`).
+
+		``prefetch_pool`` can be a :class:`DBHandlerPool`. If it is given,
+		:meth:`prefetch_records` fetches records in a background thread using
+		a handler from this pool. The records will be kept in a page cache
+		holding at most ``page_cache_size`` pages until :meth:`fetch_records`
+		is called with the same arguments (see :meth:`clear_page_cache`).
 		"""
 
-		super().__init__()
+		super().__init__(trusted=trusted, ul4on_limits=ul4on_limits)
 
 		self.requestid = uuid()
 		if connection is not None:
@@ -422,6 +1093,61 @@ class DBHandler(Handler):
 
 		self.session_id = session_id
 
+		# The backreferences that have been passed to the database by the last
+		# call to :meth:`_reinitialize_livingapi_db` (as a flat list of UL4ON
+		# type names and ids) and how many entries of the backreference registry
+		# they cover
+		self._ul4on_backrefs = []
+		self._ul4on_backrefs_watermark = 0
+		# Indexes of backreference slots that have been released, but not cleared yet
+		self._ul4on_released = []
+		self.ul4on_sync_stats = la.attrdict(
+			inits=0, # Number of calls to :meth:`_reinitialize_livingapi_db`
+			entries=0, # Total number of backreferences sent
+			new_entries=0, # Total number of backreferences added since the previous init
+			last_entries=0, # Number of backreferences sent by the last init
+			last_new_entries=0, # Number of backreferences added since the init before that
+		)
+		self.records_sync_stats = la.attrdict(
+			hits=0, # Number of records found in the UL4ON decoder
+			misses=0, # Number of records that had to be fetched from the database
+			calls=0, # Number of database calls
+		)
+
+		# Cache for the results of :meth:`count_records` and
+		# :meth:`aggregate_records`: Maps ``(app id, query, user id, language)``
+		# to ``(expiration time, result)`` (least recently used first)
+		self.result_cache_ttl = result_cache_ttl
+		self.result_cache_size = result_cache_size
+		self._result_cache = collections.OrderedDict()
+		self.result_cache_stats = la.attrdict(
+			hits=0, # Number of results returned from the cache
+			misses=0, # Number of results that had to be fetched from the database
+			expirations=0, # Number of entries that were dropped because they were too old
+			evictions=0, # Number of entries that were dropped because the cache was full
+			invalidations=0, # Number of entries that were dropped because records have changed
+		)
+
+		# Cache for pages of records fetched in the background by
+		# :meth:`prefetch_records`: Maps ``(app id, filter, sort, offset, limit,
+		# language)`` to a :class:`concurrent.futures.Future` (oldest first)
+		self.prefetch_pool = prefetch_pool
+		self.page_cache_size = page_cache_size
+		self._page_cache = collections.OrderedDict()
+		self._prefetch_executor = None
+		# Ids of apps that have uncommitted changes. Those can't be prefetched,
+		# since the prefetch connection wouldn't see the changes.
+		self._uncommitted_apps = set()
+		self.page_cache_stats = la.attrdict(
+			prefetches=0, # Number of pages that have been scheduled for fetching in the background
+			hits=0, # Number of pages returned from the page cache
+			misses=0, # Number of pages that weren't in the page cache
+			failures=0, # Number of background fetches that failed
+			timeouts=0, # Number of background fetches that didn't finish in time
+			evictions=0, # Number of pages that were dropped because the cache was full
+			invalidations=0, # Number of pages that were dropped because records have changed
+		)
+
 	def __repr__(self) -> str:
 		return f"<{self.__class__.__module__}.{self.__class__.__qualname__} connectstring={self.db.connectstring()!r} ide_id={self.ide_id!r} at {id(self):#x}>"
 
@@ -452,7 +1178,10 @@ class DBHandler(Handler):
 		return self._varchars
 
 	def cursor(self):
-		return self.db.cursor(readlobs=True)
+		cursor = self.db.cursor(readlobs=True)
+		if self._trace_call is not None:
+			cursor = _TracingCursor(cursor, self._trace_call)
+		return cursor
 
 	def cursor_pg(self, row_factory=None):
 		if row_factory is None:
@@ -466,8 +1195,12 @@ class DBHandler(Handler):
 			self.db.commit()
 		if self._db_pg is not None:
 			self.db_pg.commit()
+		self._uncommitted_apps.clear()
 
 	def rollback(self) -> None:
+		self.clear_result_cache()
+		self.clear_page_cache()
+		self._uncommitted_apps.clear()
 		if self.db is not None:
 			self.db.rollback()
 		if self.db_pg is not None:
@@ -475,6 +1208,11 @@ class DBHandler(Handler):
 
 	def reset(self) -> None:
 		super().reset()
+		self.clear_result_cache()
+		self.clear_page_cache()
+		self._ul4on_backrefs.clear()
+		self._ul4on_backrefs_watermark = 0
+		self._ul4on_released.clear()
 		self.proc_clear_all(self.cursor())
 
 	def seq(self) -> int:
@@ -545,68 +1283,133 @@ class DBHandler(Handler):
 			file.id = f"{r.p_upr_path}/{r.p_upl_id}"
 			file.internal_id = r.p_upl_id
 
+	@_traced
 	def file_content(self, file):
 		with url.Context():
 			u = self.uploaddir/file.storagefilename
 			return u.openread().read()
 
-	def _save_vsql_ast(self, vsqlexpr, required_datatype=None, cursor=None, vs_id_super=None, vs_order=None, vss_id=None, pos=None):
+	def _flatten_vsql_ast(self, vsqlexpr, required_datatype=None):
+		"""
+		Return the nodes of the vSQL expression :obj:`vsqlexpr` as a list of
+		dictionaries in pre-order.
+
+		The key ``super`` of each dictionary is the index of the parent node in
+		the list (or ``None`` for the root node). ``required_datatype`` is used
+		to validate the datatype of the root node.
+		"""
+		nodes = []
+
+		def flatten(vsqlexpr, super, order, pos):
+			datatype = vsqlexpr.datatype
+			error = vsqlexpr.error
+			if super is None:
+				# Validate target datatype (if the tree is valid so far)
+				if datatype is not None:
+					error = vsql.DataType.compatible_to(datatype, required_datatype)
+					if error is not None:
+						datatype = None
+			node = dict(
+				super=super,
+				order=order,
+				nodetype=vsqlexpr.nodetype.value,
+				value=vsqlexpr.nodevalue,
+				datatype=datatype.value if datatype is not None else None,
+				erroridentifier=error.value if error is not None else None,
+				start=pos,
+				stop=None,
+			)
+			index = len(nodes)
+			nodes.append(node)
+			# FieldRefAST has children in the implementation, but in the database it has not
+			if isinstance(vsqlexpr, vsql.FieldRefAST):
+				pos += len(vsqlexpr.source())
+			else:
+				order = 10
+				for child in vsqlexpr.content:
+					if isinstance(child, str):
+						pos += len(child)
+					else:
+						pos = flatten(child, index, order, pos)
+						order += 10
+			node["stop"] = pos
+			return pos
+
+		flatten(vsqlexpr, None, None, 0)
+		return nodes
+
+	def _save_vsql_ast(self, vsqlexpr, required_datatype=None, cursor=None):
 		"""
 		Save the vSQL expression :obj:`vsqlexpr`.
 
-		``cursor``, ``vs_id_super``, ``vs_order``, ``vss_id`` and ``pos`` are used
-		internally for recursive calls and should not be passed by the user.
+		All nodes of the AST are saved with one PL/SQL block (the nodes are
+		passed in pre-order as arrays, and references to the parent node are
+		passed as indexes into these arrays).
+
+		Return the id of the root node.
 		"""
 		if cursor is None:
 			cursor = self.cursor()
-		source = vsqlexpr.source()
-		sourcelen = len(source)
-		if pos is None:
-			pos = 0
-		finalpos = pos + sourcelen
-
-		datatype = vsqlexpr.datatype
-		error = vsqlexpr.error
-		if vss_id is None:
-			# Validate target datatype (if the tree is valid so far)
-			if datatype is not None:
-				error = vsql.DataType.compatible_to(datatype, required_datatype)
-				if error is not None:
-					datatype = None
-
-			r = self.proc_vsqlsource_insert(
-				cursor,
-				c_user=self.ide_id,
-				p_vss_source=source,
-			)
-			vss_id = r.p_vss_id
-		r = self.proc_vsql_insert(
-			cursor,
+		nodes = self._flatten_vsql_ast(vsqlexpr, required_datatype)
+
+		def column(name):
+			return self.varchars([None if node[name] is None else str(node[name]) for node in nodes])
+
+		vs_id = cursor.var(str)
+		cursor.execute(
+			"""
+				declare
+					type ids_type is table of varchar2(100) index by binary_integer;
+					v_supers varchars := :supers;
+					v_orders varchars := :orders;
+					v_nodetypes varchars := :nodetypes;
+					v_values varchars := :nodevalues;
+					v_datatypes varchars := :datatypes;
+					v_erroridentifiers varchars := :erroridentifiers;
+					v_starts varchars := :starts;
+					v_stops varchars := :stops;
+					v_vss_id varchar2(100);
+					v_ids ids_type;
+				begin
+					vsql_pkg.vsqlsource_insert(
+						c_user => :c_user,
+						p_vss_source => :source,
+						p_vss_id => v_vss_id
+					);
+					for i in 1..v_nodetypes.count loop
+						vsql_pkg.vsql_insert(
+							c_user => :c_user,
+							p_vs_id_super => case when v_supers(i) is not null then v_ids(to_number(v_supers(i)) + 1) end,
+							p_vs_order => to_number(v_orders(i)),
+							p_vs_nodetype => v_nodetypes(i),
+							p_vs_value => v_values(i),
+							p_vs_datatype => v_datatypes(i),
+							p_vs_erroridentifier => v_erroridentifiers(i),
+							p_vss_id => v_vss_id,
+							p_vs_start => to_number(v_starts(i)),
+							p_vs_stop => to_number(v_stops(i)),
+							p_vs_id => v_ids(i)
+						);
+					end loop;
+					:vs_id := v_ids(1);
+				end;
+			""",
 			c_user=self.ide_id,
-			p_vs_id_super=vs_id_super,
-			p_vs_order=vs_order,
-			p_vs_nodetype=vsqlexpr.nodetype.value,
-			p_vs_value=vsqlexpr.nodevalue,
-			p_vs_datatype=datatype.value if datatype is not None else None,
-			p_vs_erroridentifier=error.value if error is not None else None,
-			p_vss_id=vss_id,
-			p_vs_start=pos,
-			p_vs_stop=finalpos,
+			source=vsqlexpr.source(),
+			supers=column("super"),
+			orders=column("order"),
+			nodetypes=column("nodetype"),
+			nodevalues=column("value"),
+			datatypes=column("datatype"),
+			erroridentifiers=column("erroridentifier"),
+			starts=column("start"),
+			stops=column("stop"),
+			vs_id=vs_id,
 		)
-		vs_id = r.p_vs_id
-		# FieldRefAST has children in the implementation, but in the database it has not
-		if not isinstance(vsqlexpr, vsql.FieldRefAST):
-			order = 10
-			for child in vsqlexpr.content:
-				if isinstance(child, str):
-					pos += len(child)
-				else:
-					(_, pos) = self._save_vsql_ast(child, None, cursor, vs_id, order, vss_id, pos)
-					order += 10
-		return (vs_id, finalpos)
+		return vs_id.getvalue()
 
 	def save_vsql_ast(self, vsqlexpr, datatype=None, cursor=None):
-		return self._save_vsql_ast(vsqlexpr, datatype, cursor)[0]
+		return self._save_vsql_ast(vsqlexpr, datatype, cursor)
 
 	def save_vsql_source(self, cursor, source, function, datatype=None, **queryargs):
 		if not source:
@@ -828,6 +1631,41 @@ class DBHandler(Handler):
 			else:
 				self.proc_dataorder_delete(cursor, c_user=self.ide_id, p_do_id=do_id)
 
+	def _release_slots(self, globals:la.Globals, indexes:list[int]) -> None:
+		# The database still has backreferences to the objects, so we can only
+		# clear the slots when we tell the database that it can't use them any
+		# more. As this requires passing the complete backreference registry
+		# to the database, we collect released slots until there are
+		# :attr:`ul4on_release_threshold` of them.
+		released = self._ul4on_released
+		released.extend(indexes)
+		if len(released) >= self.ul4on_release_threshold:
+			self._flush_released_slots(globals)
+
+	def _flush_released_slots(self, globals:la.Globals) -> None:
+		"""
+		Clear all backreference slots that have been released since the last
+		call, remove cleared slots from the end of the backreference registry
+		and sync the registry with the database.
+		"""
+		released = self._ul4on_released
+		if not released:
+			return
+		registry = self.ul4on_decoder._objects
+		backrefs = self._ul4on_backrefs
+		watermark = self._ul4on_backrefs_watermark
+		for index in released:
+			registry[index] = None
+			if index < watermark:
+				backrefs[2*index] = "ignore"
+				backrefs[2*index+1] = None
+		released.clear()
+		length = self._truncate_ul4on_slots()
+		if watermark > length:
+			del backrefs[2*length:]
+			self._ul4on_backrefs_watermark = length
+		self._reinitialize_livingapi_db(self.cursor(), globals)
+
 	def _reinitialize_livingapi_db(self, cursor, globals):
 		"""
 		Reinitialize the server side state of the UL4ON codec machinery.
@@ -842,8 +1680,20 @@ class DBHandler(Handler):
 		is essential that the detail record won't be loaded again, as we want
 		to use the state of the record as it was recorded in
 		``emailqueue.eq_data``).
+
+		The entries for the backreferences are cached, so only the entries for
+		objects that have been added to the registry since the last call have
+		to be computed (:attr:`ul4on_sync_stats` contains the numbers).
+		However ``livingapi_pkg.init()`` replaces the complete server side
+		registry, so we always have to pass all entries.
 		"""
-		backrefs = []
+		objects = self.ul4on_decoder._objects
+		backrefs = self._ul4on_backrefs
+		watermark = self._ul4on_backrefs_watermark
+		if watermark > len(objects):
+			# The registry has been reset behind our back
+			backrefs.clear()
+			watermark = 0
 
 		# The backref registry might contain objects for which we can't sync
 		# backreferences to the database. This can happen when the dump hasn't
@@ -855,7 +1705,7 @@ class DBHandler(Handler):
 		# following backreference indexes would be off by one.
 		# For those fake backreferences we use the special type ``ignore``
 		# which is handled specifically by ``livingapi_pkg.init_ul4on()``
-		for obj in self.ul4on_decoder._objects:
+		for obj in itertools.islice(objects, watermark, None):
 			ul4onname = "ignore"
 			ul4onid = None
 			if isinstance(obj, str):
@@ -869,6 +1719,7 @@ class DBHandler(Handler):
 				# Ignore backreferences to ``Geo`` objects
 				if not isinstance(obj, la.Geo):
 					if obj.ul4onid is None:
+						del backrefs[2*watermark:]
 						raise TypeError(f"Can't sync backreference to non-persistent object of type {type(obj)!r}")
 					else:
 						ul4onname = obj.ul4onname
@@ -894,8 +1745,22 @@ class DBHandler(Handler):
 			args["p_dat_id"] = globals.record.id
 		if self.session_id is not None:
 			args["p_sessionid"] = self.session_id
-		self.proc_init(cursor, **args)
-
+		try:
+			self.proc_init(cursor, **args)
+		except BaseException:
+			# Forget the entries that haven't been synced
+			del backrefs[2*watermark:]
+			raise
+		new_entries = len(objects) - watermark
+		self._ul4on_backrefs_watermark = len(objects)
+		stats = self.ul4on_sync_stats
+		stats["inits"] += 1
+		stats["entries"] += len(objects)
+		stats["new_entries"] += new_entries
+		stats["last_entries"] = len(objects)
+		stats["last_new_entries"] = new_entries
+
+	@_traced
 	def _execute_incremental_ul4on_call(self, globals, call):
 		"""
 		Returns the deserialized UL4ON data from executing a database function
@@ -931,6 +1796,91 @@ class DBHandler(Handler):
 		dump = self._loaddump(dump)
 		return dump
 
+	def _incremental_call(self, owner, name):
+		"""
+		Return the database function and its arguments that return the
+		incremental UL4ON dump for the attribute ``name`` of ``owner``
+		(see :meth:`incremental_data_many`).
+		"""
+		match (owner, name):
+			case (la.App(), "menus"):
+				return ("livingapi_pkg.app_links_inc_ful4on", [self.ide_id, owner.id, "menuitem"])
+			case (la.App(), "panels"):
+				return ("livingapi_pkg.app_links_inc_ful4on", [self.ide_id, owner.id, "panel"])
+			case (la.App(), "views"):
+				return ("livingapi_pkg.app_views_inc_ful4on", [owner.id])
+			case (la.App(), "child_controls"):
+				return ("livingapi_pkg.app_childcontrols_inc_ful4on", [owner.id])
+			case (la.App(), "data_actions"):
+				return ("livingapi_pkg.app_dataactions_inc_ful4on", [owner.id])
+			case (la.App(), "ownparams"):
+				return ("livingapi_pkg.app_params_inc_ful4on", [owner.id])
+			case (la.App(), "attachments"):
+				return ("livingapi_pkg.app_attachments_inc_ful4on", [owner.id])
+			case (la.AppGroup(), "apps"):
+				return ("livingapi_pkg.appgroup_apps_inc_ful4on", [self.ide_id, owner.id])
+			case _:
+				raise ValueError(f"can't fetch {name!r} for {owner!r}")
+
+	def incremental_data_many(self, globals:la.Globals, requests:list[tuple[la.App | la.AppGroup, str]]) -> list[Any]:
+		calls = [self._incremental_call(owner, name) for (owner, name) in requests]
+		result = []
+		chunksize = self.incremental_data_chunksize
+		for start in range(0, len(calls), chunksize):
+			result.extend(self._execute_incremental_ul4on_calls(globals, calls[start:start+chunksize]))
+		return result
+
+	@_traced
+	def _execute_incremental_ul4on_calls(self, globals, calls):
+		"""
+		Execute multiple database functions that return incremental dumps (like
+		:meth:`_execute_incremental_ul4on_call`) in one PL/SQL block and return
+		the list of deserialized dumps.
+
+		``calls`` is a list of ``(function name, arguments)`` tuples. The dumps
+		will be loaded in the order of ``calls``, since later dumps might
+		contain backreferences to objects from earlier ones.
+		"""
+		statements = []
+		args = {}
+		for (i, (function, functionargs)) in enumerate(calls):
+			for (j, arg) in enumerate(functionargs):
+				args[f"arg{i}_{j}"] = arg
+			statements.append(f"\t\t\t\t:dump{i} := {function}({', '.join(f':arg{i}_{j}' for j in range(len(functionargs)))});\n")
+		query = f"""
+			begin
+{''.join(statements)}
+			end;
+		"""
+
+		c = self.cursor()
+		dumps = [c.var(orasql.BLOB) for call in calls]
+		for (i, dump) in enumerate(dumps):
+			args[f"dump{i}"] = dump
+		c.execute(query, **args)
+		if dumps[0].getvalue() is None:
+			# The UL4ON codec machinery hasn't been initialized
+			self._reinitialize_livingapi_db(c, globals)
+			c.execute(query, **args)
+
+		result = []
+		for ((function, functionargs), dump) in zip(calls, dumps):
+			dump = dump.getvalue()
+			if dump is None:
+				# The UL4ON codec machinery has been reset during the block,
+				# so fetch the rest separately
+				call = t"{function:q}("
+				for (j, arg) in enumerate(functionargs):
+					if j:
+						call += t", "
+					call += t"{arg}"
+				call += t")"
+				result.append(self._execute_incremental_ul4on_call(globals, call))
+			else:
+				result.append(self._loaddump(dump.read().decode("utf-8")))
+		return result
+
+	@_traced
 	def meta_data(self, *appids, records=False):
 		cursor = self.cursor()
 		cursor.execute(t"""
@@ -948,11 +1898,14 @@ class DBHandler(Handler):
 		dump = self._loaddump(dump)
 		return dump
 
+	@_traced
 	def record_sync_data(self, dat_id, force=False):
 		if not force:
 			result = self.ul4on_decoder.persistent_object(la.Record.ul4onname, dat_id)
 			if result is not None:
+				self._trace_note(cache="hit")
 				return result
+			self._trace_note(cache="miss")
 		c = self.cursor()
 		c.execute(t"""
 			select
@@ -968,32 +1921,54 @@ class DBHandler(Handler):
 		record = self._loaddump(dump)
 		return record
 
+	@_traced
 	def records_sync_data(self, dat_ids, force=False):
-		if force:
-			missing = set(dat_ids)
-		else:
-			missing = set()
-			for dat_id in dat_ids:
-				record = self.ul4on_decoder.persistent_object(la.Record.ul4onname, dat_id)
-				if record is None:
-					missing.add(dat_id)
-				else:
-					found[dat_id] = record
-		c = self.cursor()
-		c.execute(t"""
-			select
-				livingapi_pkg.records_sync_ful4on(
-					p_dat_ids=>{self.varchars(missing)},
-					p_force=>{int(force)}
-				)
-			from
-				dual
-		""")
-		r = c.fetchone()
-		dump = r[0].decode("utf-8")
-		records = self._loaddump(dump)
-		return records
+		"""
+		Return a dictionary that maps the record ids in ``dat_ids`` to
+		:class:`~ll.la.Record` objects.
+
+		Unless ``force`` is true, records that are already known to the UL4ON
+		decoder will be reused. All others will be fetched from the database in
+		chunks of :attr:`records_sync_chunksize` ids.
+
+		:attr:`records_sync_stats` contains the number of records that have been
+		reused and fetched.
+		"""
+		found = la.attrdict()
+		missing = []
+		for dat_id in dict.fromkeys(dat_ids):
+			record = None if force else self.ul4on_decoder.persistent_object(la.Record.ul4onname, dat_id)
+			if record is None:
+				missing.append(dat_id)
+			else:
+				found[dat_id] = record
+
+		stats = self.records_sync_stats
+		stats["hits"] += len(found)
+		stats["misses"] += len(missing)
+		self._trace_note(cache="miss" if missing else "hit")
 
+		chunksize = self.records_sync_chunksize
+		for start in range(0, len(missing), chunksize):
+			c = self.cursor()
+			c.execute(t"""
+				select
+					livingapi_pkg.records_sync_ful4on(
+						p_dat_ids=>{self.varchars(missing[start:start+chunksize])},
+						p_force=>{int(force)}
+					)
+				from
+					dual
+			""")
+			stats["calls"] += 1
+			r = c.fetchone()
+			dump = r[0].decode("utf-8")
+			records = self._loaddump(dump)
+			if records:
+				found.update(records)
+		return found
+
+	@_traced
 	def file_sync_data(self, file_path, force=False):
 		if not force:
 			result = self.ul4on_decoder.persistent_object(la.File.ul4onname, file_path)
@@ -1066,6 +2041,7 @@ class DBHandler(Handler):
 		# Since the database didn't reset its backref registry, we don't either
 		return dump
 
+	@_traced
 	def viewtemplate_data(self, *path, **params):
 		if not 1 <= len(path) <= 2:
 			raise ValueError(f"need one or two path components, got {len(path)}")
@@ -1164,12 +2140,14 @@ class DBHandler(Handler):
 			t"livingapi_pkg.app_viewtemplates_inc_ful4on({self.ide_id}, {app.id})",
 		)
 
+	@_traced
 	def save_record(self, record, recursive=True):
 		if record._deleted:
 			return None
 
 		record.clear_errors()
 		app = record.app
+		self._records_changed(app)
 		real = app.basetable in {"data_select", "data"}
 		if real:
 			proc = self.proc_data_insert if record.id is None else self.proc_data_update
@@ -1199,30 +2177,7 @@ class DBHandler(Handler):
 		except orasql.DatabaseError as exc:
 			error = exc.args[0]
 			if error.code == 20010:
-				parts = error.message.split("\x01")[1:-1]
-				if parts:
-					# An error message with the usual formatting from ``errmsg_pkg``.
-					controls_by_field = {c.field: c for c in record.app.controls.values()} # Maps the field name to the control
-					field = None
-					for (i, part) in enumerate(parts):
-						if i % 2:
-							if field:
-								if field not in controls_by_field:
-									record.add_error(f"{field}: {part}")
-								else:
-									control = controls_by_field[field]
-									identifier = control.identifier
-									if app.active_view is not None and identifier not in app.active_view.controls:
-										record.add_error(f"{identifier}: {part}")
-									else:
-										record.fields[identifier].add_error(part)
-							else:
-								record.add_error(part)
-						else:
-							field = part
-				else:
-					# An error message with strange formatting, use this as is.
-					record.add_error(error.message)
+				self._add_save_errors(record, error.message)
 				return False
 			else:
 				# Some other database exception
@@ -1233,32 +2188,185 @@ class DBHandler(Handler):
 			saved = False
 		else:
 			saved = True
-
-			if record.id is None:
-				record.id = result[f"p_{pk}"]
-				record.createdat = datetime.datetime.now()
-				record.createdby = app.globals.user
-				record.updatecount = 0
-			else:
-				record.updatedat = datetime.datetime.now()
-				record.updatedby = app.globals.user
-				record.updatecount += 1
-			for field in record.fields.values():
-				field._dirty = False
+			self._record_saved(record, result[f"p_{pk}"])
 
 		return saved
 
-	def delete_record(self, record):
-		if not record._deleted:
-			if record.id is None:
-				# Just record that the record has been deleted
-				# we don't need to call any db procedures
-				record._deleted = True
+	def _add_save_errors(self, record, message):
+		"""
+		Add the error message ``message`` (from an ``ORA-20010`` exception raised
+		while saving ``record``) to the record and its fields.
+		"""
+		app = record.app
+		parts = message.split("\x01")[1:-1]
+		if parts:
+			# An error message with the usual formatting from ``errmsg_pkg``.
+			controls_by_field = {c.fieldname: c for c in app.controls.values()} # Maps the field name to the control
+			field = None
+			for (i, part) in enumerate(parts):
+				if i % 2:
+					if field:
+						if field not in controls_by_field:
+							record.add_error(f"{field}: {part}")
+						else:
+							control = controls_by_field[field]
+							identifier = control.identifier
+							if app.active_view is not None and identifier not in app.active_view.controls:
+								record.add_error(f"{identifier}: {part}")
+							else:
+								record.fields[identifier].add_error(part)
+					else:
+						record.add_error(part)
+				else:
+					field = part
+		else:
+			# An error message with strange formatting, use this as is.
+			record.add_error(message)
+
+	@_traced
+	def save_records(self, records, batch_size:int = 100):
+		records = list(records)
+		results = [None] * len(records)
+
+		# Records of "real" apps are saved in batches (separated by app and by
+		# whether it's an insert or an update), all others are saved one by one.
+		batches = {}
+		for (i, record) in enumerate(records):
+			if record._deleted:
+				continue
+			app = record.app
+			if app.basetable in {"data_select", "data"}:
+				batches.setdefault((app.id, record.id is None), []).append(i)
 			else:
-				app = record.app
-				args = {
-					"c_user": self.ide_id,
-					"p_dat_id": record.id,
+				results[i] = self.save_record(record)
+
+		for ((appid, insert), indexes) in batches.items():
+			for start in range(0, len(indexes), batch_size):
+				batchindexes = indexes[start:start+batch_size]
+				batchresults = self._save_records_batch([records[i] for i in batchindexes], insert)
+				for (i, result) in zip(batchindexes, batchresults):
+					results[i] = result
+		return results
+
+	def _save_records_batch(self, records, insert):
+		"""
+		Save the records ``records`` (which all belong to the same "real" app and
+		are all new records if ``insert`` is true or all existing records
+		otherwise) with one array-bound PL/SQL block.
+		"""
+		app = records[0].app
+		mode = app.globals.mode
+		mode = mode.value if mode is not None else None
+		self._records_changed(app)
+
+		for record in records:
+			record.clear_errors()
+
+		# Every row must pass the same parameters, so for updates we pass all
+		# fields that are dirty in any of the records (and use the ``_changed``
+		# flag to tell the procedure which ones have really changed).
+		if insert:
+			controls = list(app.controls.values())
+		else:
+			dirty = {field.control.identifier for record in records for field in record._materialized_fields() if field._dirty}
+			controls = [control for control in app.controls.values() if control.identifier in dirty]
+
+		params = [
+			"c_user => :c_user",
+			"p_mode => :p_mode",
+			"p_dat_id => :p_dat_id",
+			"p_errormessage => :p_errormessage",
+		]
+		if insert:
+			params.append("p_tpl_uuid => :p_tpl_uuid")
+		for control in controls:
+			params.append(f"p_{control.fieldname} => :p_{control.fieldname}")
+			if not insert:
+				params.append(f"p_{control.fieldname}_changed => :p_{control.fieldname}_changed")
+		params = ",\n\t\t\t\t\t".join(params)
+
+		query = f"""
+			begin
+				savepoint livingapi_save_records;
+				livingapi_pkg.{"data_insert" if insert else "data_update"}(
+					{params}
+				);
+				:errorcode := null;
+				:errortext := null;
+			exception
+				when others then
+					rollback to livingapi_save_records;
+					:errorcode := sqlcode;
+					:errortext := dbms_utility.format_error_stack;
+			end;
+		"""
+
+		rows = []
+		for record in records:
+			row = {
+				"c_user": self.ide_id,
+				"p_mode": mode,
+			}
+			if insert:
+				row["p_tpl_uuid"] = app.id
+			else:
+				row["p_dat_id"] = record.id
+			for control in controls:
+				field = record.fields[control.identifier]
+				row[f"p_{control.fieldname}"] = field._asdbarg(self)
+				if not insert:
+					row[f"p_{control.fieldname}_changed"] = int(field._dirty)
+			rows.append(row)
+
+		c = self.cursor()
+		outvars = {
+			"p_errormessage": c.var(str, 4000, arraysize=len(rows)),
+			"errorcode": c.var(int, arraysize=len(rows)),
+			"errortext": c.var(str, 4000, arraysize=len(rows)),
+		}
+		if insert:
+			outvars["p_dat_id"] = c.var(str, 100, arraysize=len(rows))
+		c.setinputsizes(**outvars)
+		c.executemany(query, rows)
+
+		results = []
+		unexpected = []
+		for (i, record) in enumerate(records):
+			errorcode = outvars["errorcode"].getvalue(i)
+			if errorcode is not None:
+				if errorcode == -20010:
+					self._add_save_errors(record, outvars["errortext"].getvalue(i))
+				else:
+					unexpected.append(i)
+				results.append(False)
+			else:
+				errormessage = outvars["p_errormessage"].getvalue(i)
+				if errormessage:
+					record.add_error(errormessage)
+					results.append(False)
+				else:
+					self._record_saved(record, outvars["p_dat_id"].getvalue(i) if insert else None)
+					results.append(True)
+		# Some other database exception: Save these records on their own after
+		# we've updated the records that have been saved successfully, so that
+		# the exception is raised the same way as by :meth:`save_record`
+		for i in unexpected:
+			results[i] = self.save_record(records[i])
+		return results
+
+	@_traced
+	def delete_record(self, record):
+		if not record._deleted:
+			if record.id is None:
+				# Just record that the record has been deleted
+				# we don't need to call any db procedures
+				record._deleted = True
+			else:
+				app = record.app
+				self._records_changed(app)
+				args = {
+					"c_user": self.ide_id,
+					"p_dat_id": record.id,
 				}
 				if app.basetable in {"data_select", "data"}:
 					proc = self.proc_data_delete
@@ -1277,6 +2385,102 @@ class DBHandler(Handler):
 				if r.p_errormessage:
 					raise ValueError(r.p_errormessage)
 
+	@_traced
+	def delete_many(self, records, chunk_size:int = 1000):
+		count = 0
+		errors = []
+		dbrecords = []
+		for record in records:
+			if record._deleted:
+				continue
+			if record.id is None or record.app.basetable not in {"data_select", "data"}:
+				# Records that haven't been saved yet don't need a database call
+				# and records from apps with custom procedures are deleted one by one.
+				try:
+					self.delete_record(record)
+				except ValueError as exc:
+					errors.append((record, str(exc)))
+				else:
+					count += 1
+			else:
+				dbrecords.append(record)
+
+		# Each record is deleted in its own savepoint, so that a failing record
+		# doesn't prevent the others from being deleted
+		query = """
+			declare
+				v_dat_ids varchars := :dat_ids;
+				v_modes varchars := :modes;
+				v_deleted varchars := varchars();
+				v_error_ids varchars := varchars();
+				v_errors varchars := varchars();
+				v_errormessage varchar2(4000);
+			begin
+				for i in 1..v_dat_ids.count loop
+					begin
+						savepoint livingapi_delete_many;
+						livingapi_pkg.data_delete(
+							c_user => :ide_id_user,
+							p_errormessage => v_errormessage,
+							p_dat_id => v_dat_ids(i),
+							p_mode => v_modes(i)
+						);
+						if v_errormessage is null then
+							varchars_pkg.append(v_deleted, v_dat_ids(i));
+						else
+							varchars_pkg.append(v_error_ids, v_dat_ids(i));
+							varchars_pkg.append(v_errors, v_errormessage);
+						end if;
+					exception
+						when others then
+							rollback to livingapi_delete_many;
+							varchars_pkg.append(v_error_ids, v_dat_ids(i));
+							varchars_pkg.append(v_errors, substr(dbms_utility.format_error_stack, 1, 4000));
+					end;
+				end loop;
+
+				:deleted := v_deleted;
+				:error_ids := v_error_ids;
+				:errors := v_errors;
+			end;
+		"""
+
+		for app in {record.app.id: record.app for record in dbrecords}.values():
+			self._records_changed(app)
+
+		for start in range(0, len(dbrecords), chunk_size):
+			chunk = dbrecords[start:start+chunk_size]
+			modes = [record.app.globals.mode for record in chunk]
+			c = self.cursor()
+			deleted = c.var(self.varchars)
+			error_ids = c.var(self.varchars)
+			chunkerrors = c.var(self.varchars)
+			c.execute(
+				query,
+				ide_id_user=self.ide_id,
+				dat_ids=self.varchars([record.id for record in chunk]),
+				modes=self.varchars([mode.value if mode is not None else None for mode in modes]),
+				deleted=deleted,
+				error_ids=error_ids,
+				errors=chunkerrors,
+			)
+			deleted = set(deleted.getvalue().aslist())
+			chunkerrors = dict(zip(error_ids.getvalue().aslist(), chunkerrors.getvalue().aslist()))
+			for record in chunk:
+				if record.id in deleted:
+					# Mark all objects for this record as deleted (the one passed in
+					# and the one from the UL4ON decoder)
+					for r in (record, self.ul4on_decoder.persistent_object(la.Record.ul4onname, record.id)):
+						if r is not None:
+							r._deleted = True
+							r.id = None
+					count += 1
+				elif record.id in chunkerrors:
+					errors.append((record, chunkerrors[record.id]))
+		if errors:
+			raise la.DeleteManyError(count, errors)
+		return count
+
 	def save_control(self, control) -> bool:
 		c = self.cursor()
 		required = control.__dict__["required"] # Use the "raw" value
@@ -1373,104 +2577,131 @@ class DBHandler(Handler):
 			)
 			attachment._deleted = True
 
-	def save_parameter(self, parameter, recursive=True):
-		if not parameter._deleted:
-			c = self.cursor()
+	def _parameter_args(self, parameter):
+		"""
+		Return the arguments for ``APPPARAMETER_PKG.APPPARAMETER_SAVE_LA`` for
+		saving ``parameter``.
+		"""
+		p_ap_value_bool = None
+		p_ap_value_date = None
+		p_ap_value_datetime = None
+		p_ap_value_str = None
+		p_ap_value_html = None
+		p_ap_value_other = None
+		p_upl_id = None
+		p_tpl_uuid_value = None
+		p_ctl_id = None
+
+		if parameter.value is not None:
+			if parameter.type is parameter.Type.BOOL:
+				p_ap_value_bool = int(parameter.value)
+			elif parameter.type is parameter.Type.INT:
+				p_ap_value_other = str(parameter.value)
+			elif parameter.type is parameter.Type.NUMBER:
+				p_ap_value_other = str(parameter.value)
+			elif parameter.type is parameter.Type.STRING:
+				p_ap_value_str = parameter.value
+			elif parameter.type is parameter.Type.HTML:
+				p_ap_value_html = parameter.value
+			elif parameter.type is parameter.Type.COLOR:
+				p_ap_value_other = f"#{parameter.value.r():02x}{parameter.value.g():02x}{parameter.value.b():02x}{parameter.value.a():02x}"
+			elif parameter.type is parameter.Type.DATE:
+				p_ap_value_date = parameter.value
+			elif parameter.type is parameter.Type.DATETIME:
+				p_ap_value_datetime = parameter.value
+			elif parameter.type is parameter.Type.DATEDELTA:
+				p_ap_value_other = str(parameter.value.days)
+			elif parameter.type is parameter.Type.DATETIMEDELTA:
+				seconds = parameter.value.seconds
+				(minutes, seconds) = divmod(seconds, 60)
+				(hours, minutes) = divmod(minutes, 60)
+				p_ap_value_other = f"{parameter.value.days} days, {hours:02}:{minutes:02}:{seconds:02}"
+			elif parameter.type is parameter.Type.MONTHDELTA:
+				p_ap_value_other = str(parameter.value.months())
+			elif parameter.type is parameter.Type.UPLOAD:
+				if parameter.value.internal_id is None:
+					raise la.UnsavedObjectError(parameter.value)
+				p_upl_id = parameter.value.internal_id
+			elif parameter.type is parameter.Type.APP:
+				p_tpl_uuid_value = parameter.value.id
+			elif parameter.type is parameter.Type.CONTROL:
+				p_ctl_id = parameter.value.id
+
+		return dict(
+			c_user=self.ide_id,
+			c_lang="de", # FIXME
+			p_reqid=self.requestid,
+			p_ap_id=parameter.id,
+			p_tpl_uuid=parameter.app.id if parameter.app is not None else None,
+			p_ag_id=parameter.appgroup.id if parameter.appgroup is not None else None,
+			p_vt_id=None,
+			p_et_id=None,
+			p_ap_id_super=parameter.parent.id if parameter.parent is not None else None,
+			p_ap_order=parameter.order,
+			p_ap_identifier=parameter.identifier,
+			p_ap_type=parameter.type.value,
+			p_ap_description=parameter.description,
+			p_ap_value_bool=p_ap_value_bool,
+			p_ap_value_date=p_ap_value_date,
+			p_ap_value_datetime=p_ap_value_datetime,
+			p_ap_value_str=p_ap_value_str,
+			p_ap_value_html=p_ap_value_html,
+			p_ap_value_other=p_ap_value_other,
+			p_upl_id=p_upl_id,
+			p_tpl_uuid_value=p_tpl_uuid_value,
+			p_ctl_id=p_ctl_id,
+		)
 
-			p_ap_value_bool = None
-			p_ap_value_date = None
-			p_ap_value_datetime = None
-			p_ap_value_str = None
-			p_ap_value_html = None
-			p_ap_value_other = None
-			p_upl_id = None
-			p_tpl_uuid_value = None
-			p_ctl_id = None
-
-			if parameter.value is not None:
-				if parameter.type is parameter.Type.BOOL:
-					p_ap_value_bool = int(parameter.value)
-				elif parameter.type is parameter.Type.INT:
-					p_ap_value_other = str(parameter.value)
-				elif parameter.type is parameter.Type.NUMBER:
-					p_ap_value_other = str(parameter.value)
-				elif parameter.type is parameter.Type.STR:
-					p_ap_value_str = parameter.value
-				elif parameter.type is parameter.Type.HTML:
-					p_ap_value_html = parameter.value
-				elif parameter.type is parameter.Type.COLOR:
-					p_ap_value_other = f"#{parameter.value.r():02x}{parameter.value.g():02x}{parameter.value.b():02x}{parameter.value.a():02x}"
-				elif parameter.type is parameter.Type.DATE:
-					p_ap_value_date = parameter.value
-				elif parameter.type is parameter.Type.DATETIME:
-					p_ap_value_datetime = parameter.value
-				elif parameter.type is parameter.Type.DATEDELTA:
-					p_ap_value_other = str(parameter.value.days)
-				elif parameter.type is parameter.Type.DATETIMEDELTA:
-					seconds = parameter.value.seconds
-					(minutes, seconds) = divmod(seconds, 60)
-					(hours, minutes) = divmod(minutes, 60)
-					p_ap_value_other = f"{parameter.value.days} days, {hours:02}:{minutes:02}:{seconds:02}"
-				elif parameter.type is parameter.Type.MONTHDELTA:
-					p_ap_value_other = str(parameter.value.months())
-				elif parameter.type is parameter.Type.UPLOAD:
-					if parameter.value.internal_id is None:
-						raise la.UnsavedObjectError(parameter.value)
-					p_upl_id = parameter.value.internal_id
-				elif parameter.type is parameter.Type.APP:
-					p_tpl_uuid_value = parameter.value.id
-				elif parameter.type is parameter.Type.CONTROL:
-					p_ctl_id = parameter.value.id
+	def _parameter_error(self, message):
+		"""
+		Return a :exc:`ValueError` for the error message ``message`` (from an
+		``ORA-20010`` exception raised while saving a parameter).
+		"""
+		parts = message.split("\x01")[1:-1]
+		if parts:
+			# An error message with the usual formatting from ``errmsg_pkg``.
+			return ValueError("\n".join(parts[1::2]))
+		else:
+			# An error message with strange formatting, use it as it is.
+			return ValueError(message)
+
+	def _parameter_saved(self, parameter, id):
+		if parameter.id is None:
+			parameter.id = id
+			parameter.createdat = datetime.datetime.now()
+			parameter.createdby = parameter.globals.user
+		else:
+			parameter.updatedat = datetime.datetime.now()
+			parameter.updatedby = parameter.globals.user
+		parameter._dirty = False
+		parameter._new = False
 
+	def save_parameter(self, parameter, recursive=True, bulk=False):
+		"""
+		Save the parameter ``parameter``.
+
+		If ``recursive`` is true the children of ``LIST`` and ``DICT``
+		parameters will be saved too.
+
+		If ``bulk`` is true (and ``recursive`` is true) only new or changed
+		parameters in the tree will be saved and this is done via
+		:meth:`_save_parameters_bulk`.
+		"""
+		if recursive and bulk:
+			self._save_parameters_bulk(parameter)
+		elif not parameter._deleted:
+			c = self.cursor()
 			try:
-				result = self.proc_appparameter_save(
-					c,
-					c_user=self.ide_id,
-					c_lang="de", # FIXME
-					p_reqid=self.requestid,
-					p_ap_id=parameter.id,
-					p_tpl_uuid=parameter.app.id if parameter.app is not None else None,
-					p_ag_id=parameter.appgroup.id if parameter.appgroup is not None else None,
-					p_vt_id=None,
-					p_et_id=None,
-					p_ap_id_super=parameter.parent.id if parameter.parent is not None else None,
-					p_ap_order=parameter.order,
-					p_ap_identifier=parameter.identifier,
-					p_ap_type=parameter.type.value,
-					p_ap_description=parameter.description,
-					p_ap_value_bool=p_ap_value_bool,
-					p_ap_value_date=p_ap_value_date,
-					p_ap_value_datetime=p_ap_value_datetime,
-					p_ap_value_str=p_ap_value_str,
-					p_ap_value_html=p_ap_value_html,
-					p_ap_value_other=p_ap_value_other,
-					p_upl_id=p_upl_id,
-					p_tpl_uuid_value=p_tpl_uuid_value,
-					p_ctl_id=p_ctl_id,
-				)
+				result = self.proc_appparameter_save(c, **self._parameter_args(parameter))
 			except orasql.DatabaseError as exc:
 				error = exc.args[0]
 				if error.code == 20010:
-					parts = error.message.split("\x01")[1:-1]
-					if parts:
-						# An error message with the usual formatting from ``errmsg_pkg``.
-						raise ValueError("\n".join(parts[1::2])) from None
-					else:
-						# An error message with strange formatting, use it as it is.
-						raise ValueError(error.message) from None
+					raise self._parameter_error(error.message) from None
 				else:
 					# Some other database exception
 					raise
 
-			if parameter.id is None:
-				parameter.id = result.p_ap_id
-				parameter.createdat = datetime.datetime.now()
-				parameter.createdby = parameter.globals.user
-			else:
-				parameter.updatedat = datetime.datetime.now()
-				parameter.updatedby = parameter.globals.user
-			parameter._dirty = False
-			parameter._new = False
+			self._parameter_saved(parameter, result.p_ap_id)
 			if recursive:
 				if parameter.type is parameter.Type.LIST:
 					for child in parameter.value:
@@ -1479,6 +2710,117 @@ class DBHandler(Handler):
 					for child in parameter.value.values():
 						self.save_parameter(child, True)
 
+	def _save_parameters_bulk(self, parameter):
+		"""
+		Save all new or changed parameters in the parameter tree ``parameter``.
+
+		The tree is flattened in pre-order and the parameters are saved with one
+		PL/SQL block (in chunks of :attr:`parameters_bulk_chunksize`
+		parameters). The ids of the saved parameters are collected in a local
+		index table, so the children of new parameters get the id of their parent
+		from there. If saving any parameter in a chunk fails, all changes done by
+		the chunk are rolled back.
+		"""
+		# Flatten the tree (in pre-order, so parents are saved before their children)
+		nodes = []
+
+		def flatten(parameter):
+			if parameter._deleted:
+				return
+			if parameter._new or parameter._dirty or parameter.id is None:
+				nodes.append(parameter)
+			if parameter.type is parameter.Type.LIST:
+				children = parameter.value or ()
+			elif parameter.type is parameter.Type.DICT:
+				children = parameter.value.values() if parameter.value else ()
+			else:
+				children = ()
+			for child in children:
+				flatten(child)
+
+		flatten(parameter)
+
+		chunksize = self.parameters_bulk_chunksize
+		for start in range(0, len(nodes), chunksize):
+			self._save_parameters_chunk(nodes[start:start+chunksize])
+
+	def _save_parameters_chunk(self, parameters):
+		"""
+		Save the parameters ``parameters`` (in pre-order) with one PL/SQL block.
+
+		The arguments for each parameter are passed as separate bind variables
+		(``:p{i}_...``). For parameters whose parent is saved by the same block,
+		the parent id is taken from the local index table ``v_ids``.
+		"""
+		c = self.cursor()
+		# Maps ``id(parameter)`` to the index in the index table (starting at 1)
+		indexes = {id(parameter): i for (i, parameter) in enumerate(parameters, 1)}
+		args = dict(c_user=self.ide_id, c_lang="de", p_reqid=self.requestid) # FIXME: ``c_lang``
+		ids = {}
+		calls = []
+		for (i, parameter) in enumerate(parameters, 1):
+			rowargs = self._parameter_args(parameter)
+			for name in ("c_user", "c_lang", "p_reqid"):
+				del rowargs[name]
+			superindex = indexes.get(id(parameter.parent)) if parameter.parent is not None else None
+			if superindex is not None:
+				del rowargs["p_ap_id_super"]
+			callargs = []
+			for (name, value) in rowargs.items():
+				if name == "p_ap_id":
+					continue
+				bindname = f"p{i}_{name.removeprefix('p_')}"
+				args[bindname] = value
+				callargs.append(f"{name} => :{bindname}")
+			if superindex is not None:
+				callargs.append(f"p_ap_id_super => v_ids({superindex})")
+			ids[i] = args[f"id{i}"] = c.var(str, 100)
+			ids[i].setvalue(0, parameter.id)
+			calls.append(f"""
+				v_index := {i};
+				v_ids({i}) := :id{i};
+				appparameter_pkg.appparameter_save_la(
+					c_user => :c_user,
+					c_lang => :c_lang,
+					p_reqid => :p_reqid,
+					p_ap_id => v_ids({i}),
+					{", ".join(callargs)}
+				);
+				:id{i} := v_ids({i});
+			""")
+		errorindex = args["errorindex"] = c.var(int)
+		errorcode = args["errorcode"] = c.var(int)
+		errortext = args["errortext"] = c.var(str, 4000)
+		c.execute(
+			f"""
+				declare
+					type ids_type is table of varchar2(100) index by binary_integer;
+					v_ids ids_type;
+					v_index integer;
+				begin
+					savepoint livingapi_save_parameters;
+					{"".join(calls)}
+					:errorindex := null;
+				exception
+					when others then
+						rollback to livingapi_save_parameters;
+						:errorindex := v_index;
+						:errorcode := sqlcode;
+						:errortext := dbms_utility.format_error_stack;
+				end;
+			""",
+			**args,
+		)
+
+		if errorindex.getvalue() is not None:
+			parameter = parameters[errorindex.getvalue() - 1]
+			if errorcode.getvalue() == -20010:
+				raise self._parameter_error(errortext.getvalue())
+			else:
+				raise RuntimeError(f"Saving parameter {parameter!r} failed: {errortext.getvalue()}")
+		for (i, parameter) in enumerate(parameters, 1):
+			self._parameter_saved(parameter, ids[i].getvalue())
+
 	def delete_parameter(self, parameter):
 		if not parameter._deleted:
 			c = self.cursor()
@@ -1517,6 +2859,8 @@ class DBHandler(Handler):
 	def _executeaction(self, record, actionidentifier, sync=False):
 		if record.id is None:
 			raise la.UnsavedObjectError(record)
+		# The action might change any records of the app
+		self._records_changed(record.app)
 		c = self.cursor()
 		r = self.proc_dataaction_execute(
 			c,
@@ -1611,56 +2955,66 @@ class DBHandler(Handler):
 			)
 		return self.emailtemplate_params[et_id]
 
+	def _librarytemplates_query(self, type : str):
+		if type is None:
+			return t"""
+				select
+					lt_identifier,
+					utv_source
+				from
+					templatelibrary.librarytemplate_select
+				where
+					tmt_key is null
+			"""
+		else:
+			return t"""
+				select
+					lt_identifier,
+					utv_source
+				from
+					templatelibrary.librarytemplate_select
+				where
+					tmt_key = {type}
+			"""
+
+	def _librarytemplates(self, type : str, rows) -> la.attrdict:
+		templates = la.attrdict()
+		for r in rows:
+			(identifier, source) = r
+			namespace = f"templatelibrary.{type}" if type else f"templatelibrary"
+			template = ul4c.Template(source, name=identifier, namespace=namespace)
+			templates[template.name] = template
+		return templates
+
+	_libraryparams_query = "select templatelibrary.libraryparameters_ful4on()"
+
+	def _libraryparams(self, dump:str) -> la.attrdict:
+		# Don't reuse the decoder for the dumps from Oracle, this is an independent one
+		# Note that we ignore the problem of persistent objects, since none of the
+		# persistent objects in this dump are in the other dump
+		dump = ul4on.loads(dump)
+		if isinstance(dump, dict):
+			dump = la.attrdict(dump)
+		return la.attrdict(dump)
+
 	def fetch_librarytemplates(self, type : str):
 		if type not in self.librarytemplates:
 			c = self.cursor_pg(row_factory=rows.tuple_row)
-			if type is None:
-				c.execute(t"""
-					select
-						lt_identifier,
-						utv_source
-					from
-						templatelibrary.librarytemplate_select
-					where
-						tmt_key is null
-				""")
-			else:
-				c.execute(t"""
-					select
-						lt_identifier,
-						utv_source
-					from
-						templatelibrary.librarytemplate_select
-					where
-						tmt_key = {type}
-				""")
-
-			templates = la.attrdict()
-			for r in c:
-				(identifier, source) = r
-				namespace = f"templatelibrary.{type}" if type else f"templatelibrary"
-				template = ul4c.Template(source, name=identifier, namespace=namespace)
-				templates[template.name] = template
-			self.librarytemplates[type] = templates
+			c.execute(self._librarytemplates_query(type))
+			self.librarytemplates[type] = self._librarytemplates(type, c)
 		return self.librarytemplates[type]
 
 	def fetch_libraryparams(self):
 		if self.libraryparams is None:
 			c = self.cursor_pg(row_factory=rows.tuple_row)
-			c.execute("select templatelibrary.libraryparameters_ful4on()")
+			c.execute(self._libraryparams_query)
 			r = c.fetchone()
-			dump = r[0]
-			# Don't reuse the decoder for the dumps from Oracle, this is an independent one
-			# Note that we ignore the problem of persistent objects, since none of the
-			# persistent objects in this dump are in the other dump
-			dump = ul4on.loads(dump)
-			if isinstance(dump, dict):
-				dump = la.attrdict(dump)
-			self.libraryparams = la.attrdict(dump)
+			self.libraryparams = self._libraryparams(r[0])
 		return self.libraryparams
 
+	@_traced
 	def count_records(self, app, filter):
-		q = vsql.Query(
+		q = la.VSQLQuery(
 			f"Count records of app {app.name}",
 			user=vsql.Field("user", vsql.DataType.STR, "v_globals.ide_id_user", "g.ide_id_user = {d}.ide_id", refgroup=la.User.vsqlgroup),
 			r=app.vsqlfield_records("r", "g.tpl_id_app"),
@@ -1683,12 +3037,223 @@ class DBHandler(Handler):
 
 		query = f"{self.query_prefix}\n{q.sqlsource()}"
 
-		c = self.cursor()
-		c.execute(query, ide_id_user=self.ide_id, tpl_id_app=app.internal_id, dat_id_detail=None, lang=app.globals.lang)
-		return c.fetchone()[0]
+		key = (app.id, query, self.ide_id, app.globals.lang)
+		(found, result) = self._result_cache_get(key)
+		if not found:
+			c = self.cursor()
+			c.execute(query, ide_id_user=self.ide_id, tpl_id_app=app.internal_id, dat_id_detail=None, lang=app.globals.lang)
+			result = c.fetchone()[0]
+			self._result_cache_put(key, result)
+		return result
+
+	def _result_cache_get(self, key):
+		"""
+		Return ``(True, result)`` if the result cache contains an entry for
+		``key`` that isn't too old, else ``(False, None)``.
+		"""
+		if self.result_cache_ttl is None:
+			return (False, None)
+		cache = self._result_cache
+		stats = self.result_cache_stats
+		entry = cache.get(key)
+		if entry is not None:
+			(expires, result) = entry
+			if expires > time.monotonic():
+				cache.move_to_end(key)
+				stats["hits"] += 1
+				self._trace_note(cache="hit")
+				# Return a copy, so the caller can't modify the cached value
+				return (True, [list(row) for row in result] if isinstance(result, list) else result)
+			del cache[key]
+			stats["expirations"] += 1
+		stats["misses"] += 1
+		self._trace_note(cache="miss")
+		return (False, None)
+
+	def _result_cache_put(self, key, result):
+		if self.result_cache_ttl is None:
+			return
+		cache = self._result_cache
+		cache[key] = (time.monotonic() + self.result_cache_ttl, [list(row) for row in result] if isinstance(result, list) else result)
+		cache.move_to_end(key)
+		while len(cache) > self.result_cache_size:
+			cache.popitem(last=False)
+			self.result_cache_stats["evictions"] += 1
+
+	def clear_result_cache(self, app=None) -> None:
+		"""
+		Remove the cached results of :meth:`count_records` and
+		:meth:`aggregate_records` for the app ``app`` (or for all apps if
+		``app`` is :const:`None`) from the result cache.
+
+		This is done automatically when records are saved or deleted via this
+		handler. Note that results for other apps whose filters reference the
+		changed records (e.g. via applookup fields) will only expire via
+		:attr:`result_cache_ttl`.
+		"""
+		cache = self._result_cache
+		if app is None:
+			keys = list(cache)
+		else:
+			keys = [key for key in cache if key[0] == app.id]
+		for key in keys:
+			del cache[key]
+		self.result_cache_stats["invalidations"] += len(keys)
+
+	def _records_changed(self, app) -> None:
+		"""
+		Drop everything cached for records of the app ``app``, since they are
+		about to be changed.
+		"""
+		self.clear_result_cache(app)
+		self.clear_page_cache(app)
+		self._uncommitted_apps.add(app.id)
+
+	def clear_page_cache(self, app=None) -> None:
+		"""
+		Remove the pages prefetched by :meth:`prefetch_records` for the app
+		``app`` (or for all apps if ``app`` is :const:`None`) from the page cache.
+
+		Background fetches that are still running will be abandoned.
+		"""
+		cache = self._page_cache
+		if app is None:
+			keys = list(cache)
+		else:
+			keys = [key for key in cache if key[0] == app.id]
+		for key in keys:
+			cache.pop(key).cancel()
+		self.page_cache_stats["invalidations"] += len(keys)
 
+	def _page_cache_key(self, app, filter, sort, offset, limit):
+		return (app.id, tuple(filter), tuple(sort), offset or 0, limit, app.globals.lang)
+
+	def prefetch_records(self, app, filter:list[str], sort:list[str], offset=0, limit=None) -> bool:
+		"""
+		Start fetching the records of ``app`` in a background thread, so that a
+		following call to :meth:`fetch_records` with the same arguments can
+		return them without a database round trip.
+
+		This uses a separate connection from :attr:`prefetch_pool`. Nothing will
+		be done if there's no :attr:`prefetch_pool`, if the page has already
+		been prefetched or if there are uncommitted changes to records of
+		``app`` (since the separate connection wouldn't see them).
+
+		Return whether a background fetch has been started.
+		"""
+		if self.prefetch_pool is None or app.id in self._uncommitted_apps:
+			return False
+		key = self._page_cache_key(app, filter, sort, offset, limit)
+		cache = self._page_cache
+		if key in cache:
+			return False
+		if self._prefetch_executor is None:
+			self._prefetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="la-prefetch")
+		cache[key] = self._prefetch_executor.submit(self._prefetch_records, app, list(filter), list(sort), offset, limit)
+		self.page_cache_stats["prefetches"] += 1
+		while len(cache) > self.page_cache_size:
+			cache.popitem(last=False)[1].cancel()
+			self.page_cache_stats["evictions"] += 1
+		return True
+
+	def _prefetch_records(self, app, filter, sort, offset, limit):
+		"""
+		Fetch records for :meth:`prefetch_records` (this runs in the background
+		thread).
+
+		Return the records and the total number of matching records. The records
+		still belong to the UL4ON registry of the pooled handler and must be
+		passed through :meth:`_adopt_ul4on_object` before use.
+		"""
+		handler = self.prefetch_pool.acquire(ide_id=self.ide_id, session_id=self.session_id)
+		try:
+			return handler.fetch_records(app, filter, sort, offset, limit, total=True)
+		finally:
+			# Our transaction only reads, so we can always roll back
+			self.prefetch_pool.release(handler, commit=False)
+
+	def _page_cache_pop(self, app, filter, sort, offset, limit):
+		"""
+		Return the prefetched records and total for the specified page (or
+		:const:`None` if the page hasn't been prefetched or the background fetch
+		failed).
+
+		If the background fetch is still running, this waits for it to finish
+		for at most :attr:`page_cache_timeout` seconds (it might be waiting for a
+		connection from an exhausted :attr:`prefetch_pool`).
+		"""
+		future = self._page_cache.pop(self._page_cache_key(app, filter, sort, offset, limit), None)
+		stats = self.page_cache_stats
+		if future is None:
+			stats["misses"] += 1
+			self._trace_note(cache="miss")
+			return None
+		try:
+			(records, total) = future.result(timeout=self.page_cache_timeout)
+		except concurrent.futures.TimeoutError:
+			future.cancel()
+			stats["timeouts"] += 1
+			self._trace_note(cache="miss")
+			return None
+		except Exception:
+			stats["failures"] += 1
+			self._trace_note(cache="miss")
+			return None
+		stats["hits"] += 1
+		self._trace_note(cache="hit")
+		start = len(self.ul4on_decoder._objects)
+		memo = {}
+		records = {id: self._adopt_ul4on_object(record, memo) for (id, record) in records.items()}
+		self._touch_ul4on_objects(app.globals, start, records.values())
+		return (records, total)
+
+	def _adopt_ul4on_object(self, obj, memo):
+		"""
+		Return the object that should be used in place of ``obj``, which has
+		been loaded by the UL4ON decoder of a different handler.
+
+		Persistent objects that our decoder already knows will be replaced by
+		our version. For records the content of the prefetched record will be
+		copied over (like an UL4ON load would do). Unknown persistent objects
+		will be added to the registry of persistent objects of our decoder (after
+		adopting the objects they reference).
+		"""
+		if isinstance(obj, list):
+			return [self._adopt_ul4on_object(item, memo) for item in obj]
+		elif isinstance(obj, dict):
+			return obj.__class__((key, self._adopt_ul4on_object(value, memo)) for (key, value) in obj.items())
+		name = getattr(obj, "ul4onname", None)
+		if name is None or obj.ul4onid is None:
+			return obj
+		try:
+			return memo[id(obj)]
+		except KeyError:
+			pass
+		decoder = self.ul4on_decoder
+		existing = decoder.persistent_object(name, obj.ul4onid)
+		isrecord = isinstance(obj, la.Record)
+		if existing is not None and not isrecord:
+			memo[id(obj)] = existing
+			return existing
+		target = existing if existing is not None else obj
+		memo[id(obj)] = target
+		if isrecord:
+			lookupdata = self._adopt_ul4on_object(obj._sparse_lookupdata, memo)
+		attrplan = getattr(obj, "_attrplan", None)
+		if attrplan is not None:
+			for attr in attrplan.ul4onset:
+				attr.ul4onset(target, self._adopt_ul4on_object(attr.ul4onget(obj), memo))
+		if isrecord:
+			target._sparse_lookupdata = lookupdata
+			target.ul4onload_end(decoder)
+		if existing is None:
+			decoder.store_persistent_object(target)
+		return target
+
+	@_traced
 	def delete_records(self, app, filter):
-		q = vsql.Query(
+		self._records_changed(app)
+		q = la.VSQLQuery(
 			f"Delete records of app {app.name}",
 			user=vsql.Field("user", vsql.DataType.STR, "v_globals.ide_id_user", "g.ide_id_user = {d}.ide_id", refgroup=la.User.vsqlgroup),
 			r=app.vsqlfield_records("r", "g.tpl_id_app"),
@@ -1768,8 +3333,37 @@ class DBHandler(Handler):
 				record.id = None
 		return len(dat_ids)
 
-	def fetch_records(self, app, filter:list[str], sort:list[str], offset=0, limit=None):
-		q = vsql.Query(
+	def _fetch_records_query(self, app, filter:list[str], sort:list[str], offset:bool, limit:bool, total:bool=False) -> str:
+		"""
+		Return the PL/SQL block used by :meth:`fetch_records`.
+
+		``offset`` and ``limit`` specify whether the block uses the bind
+		variables ``:offset`` and ``:limit``. If ``total`` is true the block
+		returns the total number of matching records in the bind variable
+		``:total``. The block only depends on the app structure, ``filter``,
+		``sort``, ``offset``, ``limit`` and ``total``, so it will be cached in
+		:attr:`fetch_records_cache`. Since the text stays the same for different
+		offsets, limits and users the database can reuse the cursor.
+		"""
+		key = (
+			app.id,
+			tuple((control.id, control.identifier, control.fieldname, control.__class__) for control in app.controls.values()),
+			tuple(filter),
+			tuple(sort),
+			offset,
+			limit,
+			total,
+		)
+		cache = self.fetch_records_cache
+		with self._fetch_records_cache_lock:
+			query = cache.get(key)
+			if query is not None:
+				cache.move_to_end(key)
+				self.fetch_records_cache_stats["hits"] += 1
+				return query
+			self.fetch_records_cache_stats["misses"] += 1
+
+		q = la.VSQLQuery(
 			f"Fetch records of app {app.name} ({app.id})",
 			user=vsql.Field("user", vsql.DataType.STR, "v_globals.ide_id_user", "g.ide_id_user = {d}.ide_id", refgroup=la.User.vsqlgroup),
 			r=app.vsqlfield_records("r", "g.tpl_id_app"),
@@ -1794,27 +3388,27 @@ class DBHandler(Handler):
 		for control in app.controls.values():
 			q.select_vsql(f"r.v_{control.identifier}", None, control.fieldname)
 
+		# The number of records without offset and limit
+		if total:
+			q.select_sql("count(*) over ()", None, "total")
+
 		# Apply user specified filter
 		for f in filter:
 			if f:
 				q.where_vsql(f)
 
-		# Add offset specified by the user
-		if offset is not None and offset > 0:
-			q.offset(offset)
+		# Add offset specified by the user (as a PL/SQL variable, so it's a bind variable in the query)
+		if offset:
+			q.offset("v_offset")
 
 		# Add limit specified by the user
-		if limit is not None:
-			q.limit(limit)
+		if limit:
+			q.limit("v_limit")
 
 		# Add sort expressions specified by the user
 		for s in sort:
 			q.orderby_vsql(s)
 
-		c = self.cursor()
-
-		dat_ids = c.var(self.varchars)
-
 		field_statements = []
 		for control in app.controls.values():
 			field_statements.append(f"\t\t\t{control.sql_fetch_statement()}\n")
@@ -1826,6 +3420,9 @@ class DBHandler(Handler):
 				v_reqid varchar2(30) := :req_id;
 				v_tpl_uuid template.tpl_uuid%type := :tpl_uuid;
 				v_tpl_id template.tpl_id%type := :tpl_id;
+				{"v_offset integer := :offset;" if offset else ""}
+				{"v_limit integer := :limit;" if limit else ""}
+				{"v_total integer := null;" if total else ""}
 				v_result blob;
 			begin
 				livingapi_pkg.records_inc_init;
@@ -1842,6 +3439,7 @@ class DBHandler(Handler):
 					)
 					{q.sqlsource()}
 				) loop
+					{"v_total := row.total;" if total else ""}
 					if livingapi_pkg.records_inc_begin_record(
 						row.dat_id,
 						row.tpl_id,
@@ -1857,10 +3455,41 @@ class DBHandler(Handler):
 				end loop;
 				livingapi_pkg.records_inc_finish(v_result);
 				:dump := v_result;
+				{":total := v_total;" if total else ""}
 			end;
 		"""
 
+		with self._fetch_records_cache_lock:
+			cache[key] = query
+			while len(cache) > self.fetch_records_cache_size:
+				cache.popitem(last=False)
+		return query
+
+	@_traced
+	def fetch_records(self, app, filter:list[str], sort:list[str], offset=0, limit=None, total=False):
+		"""
+		Fetch the records of ``app`` matching ``filter``.
+
+		Return a dictionary mapping record ids to records, or if ``total`` is
+		true, a tuple with this dictionary and the number of matching records
+		ignoring ``offset`` and ``limit``. This total is computed by the same
+		query. It is :const:`None` if the database can't provide it because
+		the page is empty and ``offset`` is non-zero.
+		"""
+		if self.prefetch_pool is not None:
+			result = self._page_cache_pop(app, filter, sort, offset, limit)
+			if result is not None:
+				return result if total else result[0]
+
+		use_offset = offset is not None and offset > 0
+		use_limit = limit is not None
+		query = self._fetch_records_query(app, filter, sort, use_offset, use_limit, total)
+
+		c = self.cursor()
+
 		dump = c.var(orasql.BLOB)
+		if total:
+			totalvar = c.var(int)
 
 		args = dict(
 			ide_id_user=self.ide_id,
@@ -1869,6 +3498,12 @@ class DBHandler(Handler):
 			tpl_uuid=app.id,
 			tpl_id=app.internal_id,
 		)
+		if use_offset:
+			args["offset"] = offset
+		if use_limit:
+			args["limit"] = limit
+		if total:
+			args["total"] = totalvar
 		c.execute(
 			query,
 			dump=dump,
@@ -1881,11 +3516,31 @@ class DBHandler(Handler):
 			dump = c.var(orasql.BLOB)
 			c.execute(query, dump=dump, **args)
 			dump = dump.getvalue()
-		dump = dump.read().decode("utf-8")
-		return self.ul4on_decoder.loads(dump)
+		start = len(self.ul4on_decoder._objects)
+		stream = _blobreader(dump)
+		records = self.ul4on_decoder.load(stream)
+		# Reuse the LOB size fetched by the stream (``dump.size()`` would be another database round trip)
+		self._trace_dump(stream.buffer.raw.size, len(self.ul4on_decoder._objects) - start)
+		self._touch_ul4on_objects(app.globals, start, records.values())
+		if total:
+			return (records, self._fetched_total(records, offset, totalvar.getvalue()))
+		return records
+
+	@staticmethod
+	def _fetched_total(records, offset, total):
+		"""
+		Return the total number of records from the analytic count ``total``
+		returned by a fetch query.
+
+		If the query didn't return any rows, the total is only known if there
+		was no offset.
+		"""
+		if total is None and not records and not offset:
+			total = 0
+		return total
 
 	def vsqlquery4fetch(self, app, filter, fields, record):
-		q = vsql.Query(
+		q = la.VSQLQuery(
 			f"Fetch records of app {app.name} ({app.id})",
 			user=vsql.Field("user", vsql.DataType.STR, "v_globals.ide_id_user", "g.ide_id_user = {d}.ide_id", refgroup=la.User.vsqlgroup),
 			r=app.vsqlfield_records("r", vsql.sql(app.internal_id)),
@@ -1919,7 +3574,7 @@ class DBHandler(Handler):
 		return q
 
 	def vsqlquery4count(self, app, filter, record):
-		q = vsql.Query(
+		q = la.VSQLQuery(
 			f"Fetch records of app {app.name} ({app.id})",
 			user=vsql.Field("user", vsql.DataType.STR, "v_globals.ide_id_user", "g.ide_id_user = {d}.ide_id", refgroup=la.User.vsqlgroup),
 			r=app.vsqlfield_records("r", vsql.sql(app.internal_id)),
@@ -1942,9 +3597,15 @@ class DBHandler(Handler):
 				q.where_vsql(f)
 		return q
 
-	def fetch_records_from_apps(self, globals:la.Globals, filter:dict[la.App, list[str]], sort:list[str], offset:int|None=0, limit:int|None=None, record:la.Record | None=None) -> dict[str, la.Record]:
+	@_traced
+	def fetch_records_from_apps(self, globals:la.Globals, filter:dict[la.App, list[str]], sort:list[str], offset:int|None=0, limit:int|None=None, record:la.Record | None=None, total:bool=False) -> dict[str, la.Record] | tuple[dict[str, la.Record], int | None]:
+		"""
+		Fetch the records matching ``filter`` from multiple apps.
+
+		``total`` has the same meaning as for :meth:`fetch_records`.
+		"""
 		if not filter:
-			return {}
+			return ({}, 0) if total else {}
 
 		record_app = record.app if record is not None else None
 
@@ -1957,7 +3618,7 @@ class DBHandler(Handler):
 		)
 		inner_q = f"(\n{inner_q}\t\t\t\t)"
 
-		q = vsql.Query(
+		q = la.VSQLQuery(
 			"Fetch records from multiple apps",
 			user=vsql.Field(
 				"user",
@@ -1994,6 +3655,10 @@ class DBHandler(Handler):
 			# have been put into the inner queries
 			q.select_sql(f"t2.{fieldname}", None, fieldname)
 
+		# The number of records without offset and limit
+		if total:
+			q.select_sql("count(*) over ()", None, "total")
+
 		# Add sort expressions specified by the user
 		for s in sort:
 			q.orderby_vsql(s)
@@ -2020,6 +3685,7 @@ class DBHandler(Handler):
 			v_reqid varchar2(30) := :req_id;
 			v_tpl_uuid varchar2(30) := null;
 			v_dat_id_detail varchar2(30) := :dat_id_detail;
+			{"v_total integer := null;" if total else ""}
 			v_result blob;
 		begin
 			-- Do nothing (and thus return `null`) if the UL4ON machinery
@@ -2039,6 +3705,7 @@ class DBHandler(Handler):
 					)
 					{q.sqlsource()}
 				) loop
+					{"v_total := row.total;" if total else ""}
 					if livingapi_pkg.records_inc_begin_record(
 						row.dat_id,
 						row.tpl_id,
@@ -2055,6 +3722,7 @@ class DBHandler(Handler):
 				livingapi_pkg.records_inc_finish(v_result);
 			end if;
 			:dump := v_result;
+			{":total := v_total;" if total else ""}
 		end;
 		"""
 
@@ -2062,18 +3730,29 @@ class DBHandler(Handler):
 
 		dump = c.var(orasql.BLOB)
 
-		c.execute(
-			sql,
+		args = dict(
 			ide_id_user=self.ide_id,
 			lang=globals.lang,
 			req_id=self.requestid,
 			dat_id_detail=record.id if record is not None else None,
 			dump=dump,
 		)
+		if total:
+			args["total"] = totalvar = c.var(int)
+		c.execute(sql, **args)
 
-		dump = dump.getvalue().read().decode("utf-8")
-		return self.ul4on_decoder.loads(dump)
+		start = len(self.ul4on_decoder._objects)
+		dump = dump.getvalue()
+		stream = _blobreader(dump)
+		records = self.ul4on_decoder.load(stream)
+		# Reuse the LOB size fetched by the stream (``dump.size()`` would be another database round trip)
+		self._trace_dump(stream.buffer.raw.size, len(self.ul4on_decoder._objects) - start)
+		self._touch_ul4on_objects(globals, start, records.values())
+		if total:
+			return (records, self._fetched_total(records, offset, totalvar.getvalue()))
+		return records
 
+	@_traced
 	def count_records_from_apps(self, globals:la.Globals, filter:dict[la.App, list[str]], record:la.Record | None=None) -> int:
 		if not filter:
 			return 0
@@ -2112,8 +3791,9 @@ class DBHandler(Handler):
 		return c.fetchone()[0]
 
 
+	@_traced
 	def aggregate_records(self, app, filter:list[str], value:list[str]):
-		q = vsql.Query(
+		q = la.VSQLQuery(
 			f"Aggregate records of app {app.name} ({app.id})",
 			user=vsql.Field("user", vsql.DataType.STR, "v_globals.ide_id_user", "g.ide_id_user = {d}.ide_id", refgroup=la.User.vsqlgroup),
 			r=app.vsqlfield_records("r", "g.tpl_id_app"),
@@ -2136,18 +3816,240 @@ class DBHandler(Handler):
 			if v:
 				q.aggregate_vsql(v)
 
-		c = self.cursor()
-
 		query = f"{self.query_prefix}\n{q.sqlsource()}"
 
-		c = self.cursor()
-		c.execute(query, ide_id_user=self.ide_id, tpl_id_app=app.internal_id, dat_id_detail=None, lang=app.globals.lang)
-		return [list(r) for r in c]
+		key = (app.id, query, self.ide_id, app.globals.lang)
+		(found, result) = self._result_cache_get(key)
+		if not found:
+			c = self.cursor()
+			c.execute(query, ide_id_user=self.ide_id, tpl_id_app=app.internal_id, dat_id_detail=None, lang=app.globals.lang)
+			result = [list(r) for r in c]
+			self._result_cache_put(key, result)
+		return result
+
+
+class DBHandlerPool:
+	"""
+	A :class:`!DBHandlerPool` hands out :class:`DBHandler` objects that use
+	pooled database connections.
+
+	Usage looks like this::
+
+		pool = DBHandlerPool(connectstring=..., connectstring_postgres=..., maxsize=10)
+
+		with pool.handler(ide_account="user@example.org") as handler:
+			vt = handler.viewtemplate_data(...)
+
+	When the ``with`` block is left the handler will be reset (which clears the
+	UL4ON state on the client and in the database session), the transaction
+	will be committed (or rolled back, if an exception happened) and the
+	connections will be returned to the pool. Connections that fail during
+	this will be closed and won't be reused.
+	"""
+
+	def __init__(self, *, connectstring=None, connectstring_postgres=None, connect=None, connect_postgres=None, maxsize=10, timeout=None, handlerclass=None, **handlerargs):
+		"""
+		Create a new :class:`!DBHandlerPool`.
+
+		Oracle connections will be created by calling ``connect`` (without
+		arguments) or if ``connect`` is :const:`None` by connecting to
+		``connectstring``. The same applies to Postgres connections with
+		``connect_postgres`` and ``connectstring_postgres``. If neither is given
+		for Postgres, the handlers will have no Postgres connection.
+
+		At most ``maxsize`` connections will be opened. If all of them are in
+		use :meth:`acquire` waits for at most ``timeout`` seconds
+		(:const:`None` means wait forever) for a connection to be returned and
+		raises :exc:`TimeoutError` otherwise.
+
+		``handlerclass`` is the class of the handlers (:class:`DBHandler` by
+		default). ``handlerargs`` will be passed to the handler constructor
+		(e.g. ``uploaddir``).
+		"""
+		if connect is None:
+			if connectstring is None:
+				raise ValueError("Specify connectstring or connect")
+			def connect():
+				if orasql is None:
+					raise ImportError(orasql_required_message)
+				return orasql.connect(connectstring, readlobs=True)
+		elif connectstring is not None:
+			raise ValueError("Specify connectstring or connect, but not both")
+		if connect_postgres is None:
+			if connectstring_postgres is not None:
+				def connect_postgres():
+					if psycopg is None:
+						raise ImportError(psycopg_required_message)
+					return psycopg.connect(connectstring_postgres)
+		elif connectstring_postgres is not None:
+			raise ValueError("Specify connectstring_postgres or connect_postgres, but not both")
+		if not isinstance(maxsize, int) or maxsize <= 0:
+			raise ValueError(f"maxsize must be a positive integer, got {maxsize!r}")
+
+		self._connect = connect
+		self._connect_postgres = connect_postgres
+		self.maxsize = maxsize
+		self.timeout = timeout
+		self.handlerclass = handlerclass if handlerclass is not None else DBHandler
+		self.handlerargs = handlerargs
+
+		self._lock = threading.Condition()
+		# Connections (as pairs of Oracle and Postgres connections) that are not in use
+		self._idle = []
+		# Number of open connections (idle and in use)
+		self._size = 0
+		self.stats = la.attrdict(
+			acquires=0, # Number of handlers handed out
+			hits=0, # Number of times an idle connection could be reused
+			misses=0, # Number of times a new connection had to be created
+			waits=0, # Number of times we had to wait for a connection
+			waittime=0.0, # Total time spent waiting (in seconds)
+			timeouts=0, # Number of times waiting for a connection timed out
+			discards=0, # Number of connections closed because they failed
+		)
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__module__}.{self.__class__.__qualname__} size={self._size} idle={len(self._idle)} maxsize={self.maxsize} at {id(self):#x}>"
+
+	@property
+	def size(self) -> int:
+		"""
+		The number of open connections (idle and in use).
+		"""
+		return self._size
+
+	@property
+	def idle(self) -> int:
+		"""
+		The number of open connections that are not in use.
+		"""
+		return len(self._idle)
+
+	def _getconnections(self):
+		with self._lock:
+			self.stats["acquires"] += 1
+			if self._idle:
+				self.stats["hits"] += 1
+				return self._idle.pop()
+			if self._size >= self.maxsize:
+				self.stats["waits"] += 1
+				start = time.monotonic()
+				if not self._lock.wait_for(lambda: self._idle or self._size < self.maxsize, timeout=self.timeout):
+					self.stats["waittime"] += time.monotonic() - start
+					self.stats["timeouts"] += 1
+					raise TimeoutError(f"no database connection available after {self.timeout} seconds")
+				self.stats["waittime"] += time.monotonic() - start
+				if self._idle:
+					self.stats["hits"] += 1
+					return self._idle.pop()
+			self.stats["misses"] += 1
+			# Reserve the slot, so that we can connect without holding the lock
+			self._size += 1
+		db = None
+		try:
+			db = self._connect()
+			db_pg = self._connect_postgres() if self._connect_postgres is not None else None
+		except BaseException:
+			# Don't leak the Oracle connection if connecting to Postgres failed
+			if db is not None:
+				try:
+					db.close()
+				except Exception:
+					pass
+			with self._lock:
+				self._size -= 1
+				self._lock.notify()
+			raise
+		return (db, db_pg)
+
+	def acquire(self, **kwargs) -> DBHandler:
+		"""
+		Return a handler that uses a connection from the pool.
+
+		``kwargs`` will be passed to the handler constructor (in addition to
+		``handlerargs`` from the constructor), e.g. ``ide_account`` or
+		``session_id``.
+
+		The handler must be returned to the pool by calling :meth:`release`.
+		"""
+		(db, db_pg) = self._getconnections()
+		try:
+			return self.handlerclass(connection=db, connection_postgres=db_pg, **{**self.handlerargs, **kwargs})
+		except BaseException:
+			self._putconnections(db, db_pg)
+			raise
+
+	def release(self, handler:DBHandler, commit:bool=True) -> None:
+		"""
+		Reset ``handler`` and return its connections to the pool.
+
+		If ``commit`` is true, the transaction will be commited, else it will be
+		rolled back.
+		"""
+		db = handler._db
+		db_pg = handler._db_pg
+		try:
+			handler.reset()
+			if commit:
+				handler.commit()
+			else:
+				db.rollback()
+				if db_pg is not None:
+					db_pg.rollback()
+		except Exception:
+			self._discardconnections(db, db_pg)
+			raise
+		self._putconnections(db, db_pg)
+
+	def _putconnections(self, db, db_pg):
+		with self._lock:
+			self._idle.append((db, db_pg))
+			self._lock.notify()
+
+	def _discardconnections(self, db, db_pg):
+		for connection in (db, db_pg):
+			if connection is not None:
+				try:
+					connection.close()
+				except Exception:
+					pass
+		with self._lock:
+			self._size -= 1
+			self.stats["discards"] += 1
+			self._lock.notify()
+
+	@contextlib.contextmanager
+	def handler(self, **kwargs) -> Generator[DBHandler, None, None]:
+		"""
+		Context manager that returns a handler via :meth:`acquire` and
+		releases it via :meth:`release` when the ``with`` block is left.
+		"""
+		handler = self.acquire(**kwargs)
+		try:
+			yield handler
+		except BaseException:
+			self.release(handler, commit=False)
+			raise
+		else:
+			self.release(handler, commit=True)
+
+	def close(self) -> None:
+		"""
+		Close all idle connections.
+		"""
+		with self._lock:
+			idle = self._idle
+			self._idle = []
+			self._size -= len(idle)
+		for (db, db_pg) in idle:
+			for connection in (db, db_pg):
+				if connection is not None:
+					connection.close()
 
 
 class HTTPHandler(Handler):
-	def __init__(self, url, username=None, password=None, auth_token=None):
-		super().__init__()
+	def __init__(self, url, username=None, password=None, auth_token=None, trusted=True):
+		super().__init__(trusted=trusted)
 		if not url.endswith("/"):
 			url += "/"
 		url += "gateway/"
@@ -2211,6 +4113,7 @@ class HTTPHandler(Handler):
 			file.mimetype = result["mimetype"]
 			file.internal_id = result["upl_id"]
 
+	@_traced
 	def file_content(self, file):
 		kwargs = {}
 		self._add_auth_token(kwargs)
@@ -2226,6 +4129,7 @@ class HTTPHandler(Handler):
 			return {}
 		raise NotImplementedError("Can't sync records via {self!r}")
 
+	@_traced
 	def viewtemplate_data(self, *path, **params):
 		if not 1 <= len(path) <= 2:
 			raise ValueError(f"need one or two path components, got {len(path)}")
@@ -2254,14 +4158,15 @@ class HTTPHandler(Handler):
 		dump = self._loaddump(dump)
 		return dump
 
-	def save_record(self, record, recursive=True):
-		record.clear_errors()
+	def _recorddata(self, record):
 		fields = {field.control.identifier: field._asjson(self) for field in record.fields.values() if record.id is None or field.is_dirty()}
-		app = record.app
 		recorddata = {"fields": fields}
 		if record.id is not None:
 			recorddata["id"] = record.id
-		data = dict(id=app.id, data=[recorddata])
+		return recorddata
+
+	def _post_appdd(self, app, recorddata):
+		data = dict(id=app.id, data=recorddata)
 		kwargs = {
 			"data": json.dumps({"appdd": data}),
 			"headers": {
@@ -2275,7 +4180,9 @@ class HTTPHandler(Handler):
 		)
 		if r.status_code >= 300 and r.status_code != 422:
 			r.raise_for_status()
-		result = json.loads(r.text)
+		return json.loads(r.text)
+
+	def _apply_save_result(self, record, result):
 		status = result["status"]
 		if status != "ok":
 			errors_added = False
@@ -2291,19 +4198,43 @@ class HTTPHandler(Handler):
 				record.add_error(f"Response status {status!r}")
 			return False
 		else:
-			if record.id is None:
-				record.id = result["id"]
-				record.createdat = datetime.datetime.now()
-				record.createdby = app.globals.user
-				record.updatecount = 0
-			else:
-				record.updatedat = datetime.datetime.now()
-				record.updatedby = app.globals.user
-				record.updatecount += 1
-			for field in record.fields.values():
-				field._dirty = False
+			self._record_saved(record, result.get("id"))
 			return True
 
+	@_traced
+	def save_record(self, record, recursive=True):
+		record.clear_errors()
+		result = self._post_appdd(record.app, [self._recorddata(record)])
+		return self._apply_save_result(record, result)
+
+	@_traced
+	def save_records(self, records, batch_size:int = 100):
+		records = list(records)
+		results = [None] * len(records)
+
+		batches = {}
+		for (i, record) in enumerate(records):
+			if not record._deleted:
+				batches.setdefault(record.app.id, []).append(i)
+
+		for indexes in batches.values():
+			for start in range(0, len(indexes), batch_size):
+				batchindexes = indexes[start:start+batch_size]
+				batchrecords = [records[i] for i in batchindexes]
+				for record in batchrecords:
+					record.clear_errors()
+				result = self._post_appdd(batchrecords[0].app, [self._recorddata(record) for record in batchrecords])
+				# For multiple records the response contains one result per record
+				# (in the same format as the result for a single record)
+				if isinstance(result, dict):
+					result = result.get("data", [result] if len(batchrecords) == 1 else None)
+				if not isinstance(result, list) or len(result) != len(batchrecords):
+					raise TypeError(f"Unexpected response {result!r}")
+				for (i, record, recordresult) in zip(batchindexes, batchrecords, result):
+					results[i] = self._apply_save_result(record, recordresult)
+		return results
+
+	@_traced
 	def delete_record(self, record):
 		kwargs = {}
 		self._add_auth_token(kwargs)
@@ -2329,6 +4260,7 @@ class HTTPHandler(Handler):
 		)
 		r.raise_for_status()
 
+	@_traced
 	def record_sync_data(self, dat_id, force=False):
 		result = self.ul4on_decoder.persistent_object(la.Record.ul4onname, dat_id)
 		if result is not None and not force:
@@ -2336,6 +4268,156 @@ class HTTPHandler(Handler):
 		raise NotImplementedError
 
 
+def _async_method(name):
+	async def method(self, *args, **kwargs):
+		return await self.handler._run_async(getattr(self.handler, name), *args, **kwargs)
+	method.__name__ = name
+	method.__qualname__ = f"AsyncHandler.{name}"
+	method.__doc__ = f"Asynchronous version of :meth:`Handler.{name}`."
+	return method
+
+
+class AsyncHandler:
+	"""
+	An :class:`AsyncHandler` provides the API of a :class:`Handler` as
+	coroutines, e.g.::
+
+		handler = la.AsyncDBHandler(connectstring=..., ide_account=...)
+		vt = await handler.viewtemplate_data(app_id, template="export")
+		records = await handler.fetch_records(app, ["r.v_active"], [])
+
+	The methods of the wrapped synchronous handler :attr:`handler` are called
+	in an executor (see :meth:`Handler._run_async`). The LivingAPI objects are
+	the same as for the synchronous handler, and they provide asynchronous
+	versions of the methods that talk to the handler (e.g.
+	:meth:`~ll.la.Record.asave`).
+
+	Calls for one handler are serialized. To run independent requests
+	concurrently, use one :class:`AsyncHandler` per request (e.g. for handlers
+	from a :class:`DBHandlerPool`).
+	"""
+
+	def __init__(self, handler:Handler, executor=None):
+		self.handler = handler
+		if executor is not None:
+			handler.executor = executor
+
+	def __repr__(self) -> str:
+		return f"<{self.__class__.__module__}.{self.__class__.__qualname__} handler={self.handler!r} at {id(self):#x}>"
+
+	async def run(self, function:Callable, /, *args, **kwargs) -> Any:
+		"""
+		Call ``function(*args, **kwargs)`` (which may use the handler) in the
+		executor and return the result.
+		"""
+		return await self.handler._run_async(function, *args, **kwargs)
+
+	commit = _async_method("commit")
+	rollback = _async_method("rollback")
+	reset = _async_method("reset")
+	get = _async_method("get")
+	viewtemplate_data = _async_method("viewtemplate_data")
+	meta_data = _async_method("meta_data")
+	fetch_records = _async_method("fetch_records")
+	fetch_records_from_apps = _async_method("fetch_records_from_apps")
+	count_records = _async_method("count_records")
+	aggregate_records = _async_method("aggregate_records")
+	record_sync_data = _async_method("record_sync_data")
+	records_sync_data = _async_method("records_sync_data")
+	save_record = _async_method("save_record")
+	save_records = _async_method("save_records")
+	delete_record = _async_method("delete_record")
+	delete_many = _async_method("delete_many")
+	delete_records = _async_method("delete_records")
+	file_content = _async_method("file_content")
+	save_file = _async_method("save_file")
+	save_parameter = _async_method("save_parameter")
+
+
+class AsyncDBHandler(AsyncHandler):
+	"""
+	An :class:`AsyncHandler` for a :class:`DBHandler`.
+
+	All keyword arguments except ``executor`` are passed to :class:`DBHandler`.
+
+	The queries for the template library in Postgres
+	(:meth:`fetch_librarytemplates` and :meth:`fetch_libraryparams`) use a
+	:class:`psycopg.AsyncConnection` and don't block the executor. This
+	connection is opened from ``connectstring_postgres``, or can be passed as
+	``connection_postgres`` (an :class:`psycopg.AsyncConnection` is not passed
+	to the :class:`DBHandler`). Without either one, the queries are executed
+	by the synchronous handler.
+	"""
+
+	def __init__(self, *, executor=None, **kwargs):
+		connection = kwargs.get("connection_postgres")
+		if psycopg is not None and isinstance(connection, psycopg.AsyncConnection):
+			del kwargs["connection_postgres"]
+			self._db_pg = connection
+		else:
+			self._db_pg = kwargs.get("connectstring_postgres")
+		super().__init__(DBHandler(**kwargs), executor)
+
+	async def db_pg(self) -> "psycopg.AsyncConnection | None":
+		"""
+		Return the asynchronous Postgres connection (or ``None`` if there is none).
+		"""
+		if isinstance(self._db_pg, str):
+			if psycopg is None:
+				raise ImportError(psycopg_required_message)
+			self._db_pg = await psycopg.AsyncConnection.connect(self._db_pg, autocommit=True)
+		return self._db_pg
+
+	async def aclose(self) -> None:
+		"""
+		Close the asynchronous Postgres connection.
+		"""
+		if self._db_pg is not None and not isinstance(self._db_pg, str):
+			await self._db_pg.close()
+			self._db_pg = None
+
+	async def fetch_librarytemplates(self, type:str) -> la.attrdict:
+		"""
+		Asynchronous version of :meth:`DBHandler.fetch_librarytemplates`.
+		"""
+		handler = self.handler
+		if type not in handler.librarytemplates:
+			db = await self.db_pg()
+			if db is None:
+				return await handler._run_async(handler.fetch_librarytemplates, type)
+			async with db.cursor(row_factory=rows.tuple_row) as c:
+				await c.execute(handler._librarytemplates_query(type))
+				result = await c.fetchall()
+			handler.librarytemplates[type] = handler._librarytemplates(type, result)
+		return handler.librarytemplates[type]
+
+	async def fetch_libraryparams(self) -> la.attrdict:
+		"""
+		Asynchronous version of :meth:`DBHandler.fetch_libraryparams`.
+		"""
+		handler = self.handler
+		if handler.libraryparams is None:
+			db = await self.db_pg()
+			if db is None:
+				return await handler._run_async(handler.fetch_libraryparams)
+			async with db.cursor(row_factory=rows.tuple_row) as c:
+				await c.execute(handler._libraryparams_query)
+				r = await c.fetchone()
+			handler.libraryparams = handler._libraryparams(r[0])
+		return handler.libraryparams
+
+
+class AsyncHTTPHandler(AsyncHandler):
+	"""
+	An :class:`AsyncHandler` for a :class:`HTTPHandler`.
+
+	All arguments except ``executor`` are passed to :class:`HTTPHandler`.
+	"""
+
+	def __init__(self, url, username=None, password=None, auth_token=None, trusted=True, *, executor=None):
+		super().__init__(HTTPHandler(url, username=username, password=password, auth_token=auth_token, trusted=trusted), executor)
+
+
 class FileHandler(Handler):
 	controltypes = {}
 	for c in la.Control.__subclasses__():
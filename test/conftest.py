@@ -1,4 +1,4 @@
-import sys, os, datetime, subprocess, textwrap, pathlib, filelock
+import sys, os, re, datetime, subprocess, textwrap, pathlib, filelock
 
 import pytest
 
@@ -293,6 +293,182 @@ class JavaDB(LocalTemplateHandler):
 			raise exc
 
 
+###
+### Fake database objects (for tests that don't require a database)
+###
+
+class FakeLOB:
+	def __init__(self, data):
+		self.data = data
+		self.sizecalls = 0
+
+	def size(self):
+		self.sizecalls += 1
+		return len(self.data)
+
+	def read(self, offset=1, amount=None):
+		if amount is None:
+			return self.data[offset-1:]
+		return self.data[offset-1:offset-1+amount]
+
+
+class FakeVar:
+	def __init__(self, type):
+		self.value = None
+
+	def getvalue(self):
+		return self.value
+
+	def setvalue(self, pos, value):
+		self.value = value
+
+
+class FakeCollection(list):
+	"""
+	A fake Oracle collection (e.g. of the type ``LL.VARCHARS``).
+	"""
+
+	def aslist(self):
+		return list(self)
+
+
+class FakeCursor:
+	def __init__(self, connection):
+		self.connection = connection
+
+	def var(self, type, *args, **kwargs):
+		return FakeVar(type)
+
+	def execute(self, query, **kwargs):
+		self.connection.queries.append(query)
+		# Each output variable named ``dump...`` gets a dump of a list
+		# containing the name of the variable
+		for (key, value) in kwargs.items():
+			if key.startswith("dump") and isinstance(value, FakeVar):
+				value.value = FakeLOB(ul4on.dumps([key]).encode("utf-8"))
+
+	def fetchone(self):
+		return self.connection.row
+
+
+class FakeConnection:
+	"""
+	A fake database connection.
+
+	Executed queries will be recorded in :attr:`queries`, ``fetchone()`` returns
+	:attr:`row`.
+	"""
+
+	def __init__(self, name=None, row=None):
+		self.name = name
+		self.row = row
+		self.queries = []
+		self.commits = 0
+		self.rollbacks = 0
+		self.closed = False
+
+	def cursor(self, readlobs=False):
+		return FakeCursor(self)
+
+	def gettype(self, name):
+		return FakeCollection
+
+	def commit(self):
+		self.commits += 1
+
+	def rollback(self):
+		self.rollbacks += 1
+
+	def close(self):
+		self.closed = True
+
+
+class FakeDBHandler(la.DBHandler):
+	fail_reset = False
+
+	def reset(self):
+		# Skip ``proc_clear_all()``, since we have no real database connection
+		la.Handler.reset(self)
+		if self.fail_reset:
+			raise RuntimeError("broken connection")
+
+
+class FakeRecordHandler(la.Handler):
+	"""
+	A handler whose ``fetch_records()`` "loads" the records ``r000``, ``r001``,
+	... (sorted by id) into the UL4ON registry, like loading an UL4ON dump
+	would.
+
+	``values`` will be called with the record number and must return the field
+	values of the record. Keyset filters for the sort order ``r.id`` (as used by
+	``iter_records()``) are supported. The filters passed to ``fetch_records()``
+	are recorded in :attr:`filters`.
+	"""
+
+	def __init__(self, count, values=lambda i: {"int": i}):
+		super().__init__()
+		self.count = count
+		self.values = values
+		self.filters = []
+
+	def fetch_records(self, app, filter, sort, offset=0, limit=None):
+		self.filters.append(filter)
+		start = offset or 0
+		if len(filter) > 1:
+			start = int(re.search(r"r\.id > 'r(\d+)'", filter[-1]).group(1)) + 1
+		stop = self.count if limit is None else min(start + limit, self.count)
+		decoder = self.ul4on_decoder
+		records = {}
+		for i in range(start, stop):
+			# Like the UL4ON decoder reuse records that are already known
+			record = decoder.persistent_object(la.Record.ul4onname, f"r{i:03}")
+			if record is None:
+				record = la.Record(id=f"r{i:03}", app=app)
+			record._values_ul4onset(la.attrdict(self.values(i)))
+			record._new = False
+			decoder.store_persistent_object(record)
+			# Each record and its values take up backreference slots
+			decoder._objects.extend([record, f"value {i}"])
+			records[record.id] = record
+		return records
+
+
+def make_fake_controls():
+	"""
+	Return controls for the fields ``lookup`` (with the lookup item ``"a"``),
+	``multi`` (with the lookup items ``"b"`` and ``"c"``), ``date`` and ``int``.
+	"""
+	lookup = la.LookupSelectControl(id="c1", identifier="lookup", fieldname="c_1")
+	lookup.lookupdata = {"a": la.LookupItem(id="i1", control=lookup, key="a", label="A")}
+	multi = la.MultipleLookupSelectControl(id="c2", identifier="multi", fieldname="c_2")
+	multi.lookupdata = {key: la.LookupItem(id=f"i_{key}", control=multi, key=key, label=key.upper()) for key in "bc"}
+	date = la.DateControl(id="c3", identifier="date", fieldname="c_3")
+	int = la.IntControl(id="c4", identifier="int", fieldname="c_4")
+	return {control.identifier: control for control in (lookup, multi, date, int)}
+
+
+def make_fake_app(handler=None, controls=None, **kwargs):
+	"""
+	Return an app with the controls ``controls`` (or without any controls).
+
+	If ``handler`` is ``None``, the app uses a :class:`la.DBHandler` with a
+	:class:`FakeConnection` (``kwargs`` will be passed to the
+	:class:`la.DBHandler` constructor).
+	"""
+	if handler is None:
+		handler = la.DBHandler(connection=FakeConnection(), **kwargs)
+	globals = la.Globals()
+	globals.handler = handler
+	app = la.App(id="app", name="App")
+	app.globals = globals
+	controls = controls or {}
+	for control in controls.values():
+		control.app = app
+	app.controls = controls
+	globals.app = app
+	return app
+
+
 ###
 ### Test fixtures
 ###
@@ -0,0 +1,174 @@
+"""
+Tests for :class:`ll.la.AsyncHandler`.
+
+These tests use a fake handler, so they don't require a database.
+"""
+
+import time, asyncio, threading
+
+from conftest import *
+
+
+class FakeHandler(la.Handler):
+	def __init__(self):
+		super().__init__()
+		self.running = 0
+		self.maxrunning = 0
+		self.threads = set()
+		self.saved = []
+
+	def count_records(self, app, filter):
+		self.running += 1
+		self.maxrunning = max(self.maxrunning, self.running)
+		self.threads.add(threading.get_ident())
+		time.sleep(0.05)
+		self.running -= 1
+		return len(filter)
+
+	def save_record(self, record):
+		self.saved.append(record)
+		return True
+
+
+def test_async_result():
+	handler = la.AsyncHandler(FakeHandler())
+
+	async def main():
+		return await handler.count_records(None, ["r.v_foo", "r.v_bar"])
+
+	assert asyncio.run(main()) == 2
+	assert threading.get_ident() not in handler.handler.threads
+
+
+def test_async_serialized():
+	handler = la.AsyncHandler(FakeHandler())
+
+	async def main():
+		return await asyncio.gather(*(handler.count_records(None, []) for i in range(3)))
+
+	assert asyncio.run(main()) == [0, 0, 0]
+	assert handler.handler.maxrunning == 1
+
+
+def test_async_concurrent():
+	# Each call waits until all three calls are running, so this only finishes
+	# if the calls for different handlers overlap
+	barrier = threading.Barrier(3, timeout=10)
+
+	class BarrierHandler(FakeHandler):
+		def count_records(self, app, filter):
+			barrier.wait()
+			return len(filter)
+
+	handlers = [la.AsyncHandler(BarrierHandler()) for i in range(3)]
+
+	async def main():
+		return await asyncio.gather(*(handler.count_records(None, []) for handler in handlers))
+
+	assert asyncio.run(main()) == [0, 0, 0]
+
+
+def test_async_cancel():
+	class BlockingHandler(FakeHandler):
+		def __init__(self):
+			super().__init__()
+			self.started = threading.Event()
+			self.finish = threading.Event()
+			self.calls = []
+
+		def count_records(self, app, filter):
+			self.calls.append(("start", len(filter)))
+			self.started.set()
+			self.finish.wait(10)
+			self.calls.append(("end", len(filter)))
+			return len(filter)
+
+	handler = la.AsyncHandler(BlockingHandler())
+
+	async def main():
+		first = asyncio.create_task(handler.count_records(None, []))
+		await asyncio.to_thread(handler.handler.started.wait, 10)
+		first.cancel()
+		second = asyncio.create_task(handler.count_records(None, ["r.v_foo"]))
+		await asyncio.sleep(0.05)
+		# The first call is still running, so the handler must still be locked
+		assert not first.done()
+		assert not second.done()
+		handler.handler.finish.set()
+		with pytest.raises(asyncio.CancelledError):
+			await first
+		return await second
+
+	assert asyncio.run(main()) == 1
+	assert handler.handler.calls == [("start", 0), ("end", 0), ("start", 1), ("end", 1)]
+
+
+def test_async_loops():
+	handler = la.AsyncHandler(FakeHandler())
+	errors = []
+
+	def run():
+		async def main():
+			await asyncio.gather(*(handler.count_records(None, []) for i in range(2)))
+		try:
+			asyncio.run(main())
+		except Exception as exc:
+			errors.append(exc)
+
+	threads = [threading.Thread(target=run) for i in range(2)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert errors == []
+	assert handler.handler.maxrunning == 1
+
+
+def test_async_libraryparams():
+	pytest.importorskip("psycopg")
+
+	class FakeAsyncCursor:
+		def __init__(self, connection):
+			self.connection = connection
+
+		async def __aenter__(self):
+			return self
+
+		async def __aexit__(self, *exc):
+			pass
+
+		async def execute(self, query):
+			self.connection.queries.append(query)
+
+		async def fetchone(self):
+			return (ul4on.dumps({"foo": 42}),)
+
+	class FakeAsyncConnection:
+		def __init__(self):
+			self.queries = []
+
+		def cursor(self, row_factory=None):
+			return FakeAsyncCursor(self)
+
+	handler = la.AsyncDBHandler(connection=FakeConnection())
+	handler._db_pg = FakeAsyncConnection()
+
+	async def main():
+		await handler.fetch_libraryparams()
+		return await handler.fetch_libraryparams()
+
+	assert asyncio.run(main()) == {"foo": 42}
+	assert handler.handler.libraryparams == {"foo": 42}
+	# The second call uses the cached parameters
+	assert len(handler._db_pg.queries) == 1
+
+
+def test_record_asave():
+	handler = FakeHandler()
+	app = make_fake_app(handler)
+	record = la.Record(app=app)
+
+	assert asyncio.run(record.asave(force=True)) is True
+	assert handler.saved == [record]
+	assert not record._new
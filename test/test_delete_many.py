@@ -0,0 +1,69 @@
+"""
+Tests for :meth:`ll.la.DBHandler.delete_many`.
+
+These tests use a fake database connection, so they don't require a database.
+"""
+
+from conftest import *
+
+
+class DeleteCursor(FakeCursor):
+	def execute(self, query, **kwargs):
+		super().execute(query, **kwargs)
+		# Delete all records except the ones in ``connection.failing``
+		ids = kwargs["dat_ids"].aslist()
+		failing = [id for id in ids if id in self.connection.failing]
+		self.connection.chunks.append(ids)
+		kwargs["deleted"].value = FakeCollection(id for id in ids if id not in failing)
+		kwargs["error_ids"].value = FakeCollection(failing)
+		kwargs["errors"].value = FakeCollection(f"can't delete {id}" for id in failing)
+
+
+class DeleteConnection(FakeConnection):
+	def __init__(self, failing=()):
+		super().__init__()
+		self.failing = set(failing)
+		self.chunks = []
+
+	def cursor(self, readlobs=False):
+		return DeleteCursor(self)
+
+
+def make_records(connection, count=5):
+	app = make_fake_app(la.DBHandler(connection=connection))
+	app.basetable = "data"
+	records = []
+	for i in range(count):
+		record = la.Record(id=f"r{i}", app=app)
+		record._new = False
+		records.append(record)
+	return (app.globals.handler, records)
+
+
+def test_delete_many():
+	(handler, records) = make_records(DeleteConnection())
+	# The object for the record in the UL4ON decoder
+	copy = la.Record(id="r1", app=records[1].app)
+	handler.ul4on_decoder.store_persistent_object(copy)
+
+	assert handler.delete_many(records, chunk_size=2) == 5
+
+	assert handler.db.chunks == [["r0", "r1"], ["r2", "r3"], ["r4"]]
+	# Each record is deleted in its own savepoint
+	assert "rollback to livingapi_delete_many" in handler.db.queries[0]
+	assert all(record._deleted and record.id is None for record in records)
+	assert copy._deleted and copy.id is None
+
+
+def test_delete_many_errors():
+	(handler, records) = make_records(DeleteConnection(failing={"r1", "r3"}))
+
+	with pytest.raises(la.DeleteManyError) as excinfo:
+		handler.delete_many(records, chunk_size=2)
+
+	# The other records have been deleted anyway
+	assert excinfo.value.count == 3
+	assert excinfo.value.errors == [(records[1], "can't delete r1"), (records[3], "can't delete r3")]
+	assert [record._deleted for record in records] == [True, False, True, False, True]
+	assert records[1].id == "r1"
+	assert len(handler.db.chunks) == 3
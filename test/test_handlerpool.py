@@ -0,0 +1,132 @@
+"""
+Tests for :class:`ll.la.DBHandlerPool`.
+
+These tests use fake connection objects, so they don't require a database.
+"""
+
+import threading
+
+from conftest import *
+
+
+def make_pool(**kwargs):
+	counter = iter(range(1000))
+	return la.DBHandlerPool(
+		connect=lambda: FakeConnection(name=f"ora{next(counter)}"),
+		connect_postgres=lambda: FakeConnection(name="pg"),
+		handlerclass=FakeDBHandler,
+		**kwargs,
+	)
+
+
+def test_pool_reuse():
+	pool = make_pool(maxsize=2)
+
+	with pool.handler(ide_id="user") as handler:
+		db = handler.db
+		assert isinstance(handler, FakeDBHandler)
+		assert handler.ide_id == "user"
+		assert isinstance(handler.db_pg, FakeConnection)
+
+	assert db.commits == 1
+	assert pool.size == 1
+	assert pool.idle == 1
+
+	with pool.handler() as handler:
+		assert handler.db is db
+
+	assert pool.stats.acquires == 2
+	assert pool.stats.misses == 1
+	assert pool.stats.hits == 1
+
+
+def test_pool_rollback_on_exception():
+	pool = make_pool()
+
+	with pytest.raises(ValueError):
+		with pool.handler() as handler:
+			db = handler.db
+			raise ValueError
+
+	assert db.rollbacks == 1
+	assert db.commits == 0
+	assert pool.idle == 1
+
+
+def test_pool_discard_broken_connection():
+	pool = make_pool()
+
+	handler = pool.acquire()
+	handler.fail_reset = True
+	with pytest.raises(RuntimeError):
+		pool.release(handler)
+
+	assert handler.db.closed
+	assert pool.size == 0
+	assert pool.idle == 0
+	assert pool.stats.discards == 1
+
+
+def test_pool_timeout():
+	pool = make_pool(maxsize=1, timeout=0.01)
+
+	handler = pool.acquire()
+	with pytest.raises(TimeoutError):
+		pool.acquire()
+	pool.release(handler)
+
+	assert pool.stats.waits == 1
+	assert pool.stats.timeouts == 1
+
+
+def test_pool_wait():
+	pool = make_pool(maxsize=1, timeout=5)
+
+	handler = pool.acquire()
+	db = handler.db
+	timer = threading.Timer(0.05, pool.release, (handler,))
+	timer.start()
+
+	handler2 = pool.acquire()
+	assert handler2.db is db
+	pool.release(handler2)
+	timer.join()
+
+	assert pool.size == 1
+	assert pool.stats.waits == 1
+	assert pool.stats.waittime > 0
+
+
+def test_pool_close():
+	pool = make_pool()
+
+	handler = pool.acquire()
+	db = handler.db
+	pool.release(handler)
+	pool.close()
+
+	assert db.closed
+	assert pool.size == 0
+
+
+def test_pool_connect_postgres_fails():
+	connections = []
+
+	def connect():
+		connection = FakeConnection(name="ora")
+		connections.append(connection)
+		return connection
+
+	def connect_postgres():
+		raise RuntimeError("can't connect")
+
+	pool = la.DBHandlerPool(connect=connect, connect_postgres=connect_postgres, handlerclass=FakeDBHandler)
+
+	with pytest.raises(RuntimeError):
+		pool.acquire()
+
+	# The Oracle connection has been closed and the slot has been freed
+	(db,) = connections
+	assert db.closed
+	assert pool.size == 0
+	assert pool.idle == 0
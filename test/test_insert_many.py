@@ -0,0 +1,142 @@
+"""
+Tests for creating many records at once via :meth:`ll.la.App.insert_many`.
+
+These tests don't require a database or a LivingApps server.
+"""
+
+import datetime
+
+import pytest
+
+from conftest import *
+
+
+def make_control(controltype, required):
+	control = controltype(id="c", identifier="field", fieldname="c_1")
+	if issubclass(controltype, la.LookupControl):
+		control.lookupdata = {key: la.LookupItem(id=f"i_{key}", control=control, key=key, label=key.upper()) for key in "abc"}
+	control.required = required
+	make_fake_app(controls={"field": control})
+	return control
+
+
+# Values for each control type that either are handled by the fast path of the
+# converter or must fall back to :meth:`Field._set_value`. ``"lookupitem"`` will
+# be replaced by the lookup item ``"a"``.
+converter_values = {
+	la.BoolControl: [True, False, None, "", "no", "yes", 1, 0],
+	la.IntControl: [42, 0, True, None, "", "17", "x", 4.5],
+	la.NumberControl: [4.5, 42, 0, True, None, "", "1,5", "x", []],
+	la.TextControl: ["foo", "", None, "x" * 5000, 42],
+	la.URLControl: ["https://www.example.org/", "foo", None],
+	la.DateControl: [datetime.date(2024, 3, 4), datetime.datetime(2024, 3, 4, 12, 30), None, "", "2024-03-04", "nope", 42],
+	la.DatetimeMinuteControl: [datetime.date(2024, 3, 4), datetime.datetime(2024, 3, 4, 12, 30, 45), None, "2024-03-04 12:30"],
+	la.LookupSelectControl: ["a", "", None, "x", 42, "lookupitem"],
+	la.MultipleLookupSelectControl: [["a", "b"], ["a"], [], None, "", "a", ["x"], ["a", None], ["a", "a"], "lookupitem"],
+}
+
+
+@pytest.mark.parametrize("required", [False, True])
+@pytest.mark.parametrize(
+	"controltype, value",
+	[(controltype, value) for (controltype, values) in converter_values.items() for value in values],
+)
+def test_converter(controltype, value, required):
+	control = make_control(controltype, required)
+	if value == "lookupitem":
+		value = control.lookupdata.a
+	record = la.Record(id=None, app=control.app)
+
+	# What setting the field value does ...
+	expected = control.fieldtype(control, record, None)
+	expected.value = value
+
+	# ... must be the same as what the converter does for a new field
+	convert = control.fieldtype._make_converter(control)
+	field = control.fieldtype(control, record, None)
+	field.errors.clear()
+	convert(field, value)
+
+	assert field.value == expected.value
+	assert type(field.value) is type(expected.value)
+	if isinstance(expected.value, la.LookupItem):
+		assert field.value is expected.value
+	elif isinstance(expected.value, list):
+		assert all(v1 is v2 for (v1, v2) in zip(field.value, expected.value))
+	assert field.errors == expected.errors
+
+
+class FakeSaveHandler(la.Handler):
+	"""
+	A handler that "saves" records by assigning new ids and rejects records
+	with the ``int`` value 13. The number of records passed to each call of
+	:meth:`save_records` is recorded in :attr:`batches`.
+	"""
+
+	def __init__(self):
+		super().__init__()
+		self.batches = []
+		self.count = 0
+
+	def save_records(self, records, batch_size=100):
+		self.batches.append(len(records))
+		return super().save_records(records, batch_size)
+
+	def save_record(self, record):
+		record.clear_errors()
+		if record.fields.int.value == 13:
+			record.add_error("unlucky")
+			return False
+		self._record_saved(record, f"new{self.count}")
+		self.count += 1
+		return True
+
+
+def test_insert_many():
+	handler = FakeSaveHandler()
+	app = make_fake_app(handler, controls=make_fake_controls())
+
+	results = app.insert_many(
+		[
+			{"int": 1, "lookup": "a"},
+			{"int": "x"},
+			{"date": datetime.datetime(2024, 3, 4, 12, 30), "multi": ["b"]},
+			{"int": 13},
+			{},
+		],
+		batch_size=2,
+	)
+
+	# Rows that fail validation are not passed to the handler
+	assert handler.batches == [1, 2, 1]
+
+	assert len(results) == 5
+	(r0, r1, r2, r3, r4) = results
+
+	assert isinstance(r0, la.Record)
+	assert r0.id == "new0"
+	assert r0.fields.int.value == 1
+	assert r0.fields.lookup.value is app.controls.lookup.lookupdata.a
+	assert not r0.fields.int.is_dirty()
+
+	# For rejected rows we get the errors instead of the record
+	assert len(r1) == 1
+	assert "number format" in r1[0]
+
+	assert r2.id == "new1"
+	assert r2.fields.date.value == datetime.date(2024, 3, 4)
+	assert [item.key for item in r2.fields.multi.value] == ["b"]
+	assert r2.fields.multi.value[0] is app.controls.multi.lookupdata.b
+
+	# Errors from saving the record are returned too
+	assert r3 == ["unlucky"]
+
+	assert r4.id == "new2"
+	assert r4.fields.int.value is None
+
+
+def test_insert_many_unknown_key():
+	app = make_fake_app(FakeSaveHandler(), controls=make_fake_controls())
+
+	with pytest.raises(TypeError):
+		app.insert_many([{"int": 1, "nope": 2}])
@@ -0,0 +1,122 @@
+"""
+Tests for :meth:`ll.la.App.iter_records`.
+
+These tests use a fake handler, so they don't require a database.
+"""
+
+import datetime
+
+from conftest import *
+
+
+def test_keyset_sort():
+	assert la._keyset_sort(["r.v_int desc", "r.createdat nulls first"]) == [
+		("r.v_int", "int", True, True),
+		("r.createdat", None, False, True),
+		("r.id", None, False, True),
+	]
+	assert la._keyset_sort(["r.v_int + 1"]) is None
+
+
+def test_keyset_filter():
+	app = make_fake_app(controls=make_fake_controls())
+	record = la.Record(id="r1", app=app, createdat=datetime.datetime(2024, 3, 4, 12, 30))
+	record._values_ul4onset(la.attrdict(int=42, lookup="a"))
+
+	keys = la._keyset_sort(["r.v_int desc"])
+	assert la._keyset_filter(keys, record) == "(r.v_int < 42) or (r.v_int == 42 and r.id > 'r1')"
+
+	keys = la._keyset_sort(["r.v_lookup", "r.createdat"])
+	assert la._keyset_filter(keys, record) == "((r.v_lookup > 'a' or r.v_lookup is None)) or (r.v_lookup == 'a' and (r.createdat > @(2024-03-04T12:30) or r.createdat is None)) or (r.v_lookup == 'a' and r.createdat == @(2024-03-04T12:30) and r.id > 'r1')"
+
+	keys = la._keyset_sort(["r.v_date nulls first"])
+	assert la._keyset_filter(keys, record) == "(r.v_date is not None) or (r.v_date is None and r.id > 'r1')"
+
+	# Microseconds can't be used in vSQL
+	record.createdat = datetime.datetime(2024, 3, 4, 12, 30, 0, 1)
+	assert la._keyset_filter(la._keyset_sort(["r.createdat"]), record) is None
+
+
+def test_iter_records():
+	handler = FakeRecordHandler(25)
+	app = make_fake_app(handler)
+	decoder = handler.ul4on_decoder
+	decoder._objects.append(app)
+	decoder.store_persistent_object(app)
+
+	ids = []
+	for record in app.iter_records("True", batch_size=10):
+		ids.append(record.id)
+		# Only the current batch is in the registry
+		assert len(decoder._objects) <= 1 + 2 * 10
+
+	assert ids == [f"r{i:03}" for i in range(25)]
+	assert handler.filters == [["True"], ["True", "(r.id > 'r009')"], ["True", "(r.id > 'r019')"]]
+	# Everything that has been loaded with the records has been released
+	assert decoder._objects == [app]
+	assert decoder.persistent_object(la.Record.ul4onname, "r000") is None
+	assert decoder.persistent_object(la.App.ul4onname, "app") is app
+
+
+def test_iter_records_known_record():
+	handler = FakeRecordHandler(25)
+	app = make_fake_app(handler)
+	decoder = handler.ul4on_decoder
+	decoder._objects.append(app)
+	decoder.store_persistent_object(app)
+	# A record that has been loaded before (e.g. ``globals.record``)
+	known = la.Record(id="r012", app=app)
+	decoder._objects.append(known)
+	decoder.store_persistent_object(known)
+
+	records = {record.id: record for record in app.iter_records("True", batch_size=10)}
+
+	assert records["r012"] is known
+	# The record is still in both registries
+	assert decoder._objects == [app, known]
+	assert decoder.persistent_object(la.Record.ul4onname, "r012") is known
+	assert decoder.persistent_object(la.Record.ul4onname, "r011") is None
+
+
+def test_release_objects():
+	handler = la.Handler()
+	decoder = handler.ul4on_decoder
+	records = [la.Record(id=f"r{i}") for i in range(3)]
+	decoder._objects.extend(records)
+
+	# Clearing a slot in the middle keeps the indexes of the other slots
+	assert handler.release_objects(None, records[1:2]) == 1
+	assert decoder._objects == [records[0], None, records[2]]
+
+	# Cleared slots at the end are removed
+	assert handler.release_objects(None, records[2:]) == 1
+	assert decoder._objects == [records[0]]
+
+	# Objects added after the slots have been removed get new indexes
+	decoder._objects.append(records[1])
+	assert handler.release_objects(None, records[1:2]) == 1
+	assert decoder._objects == [records[0]]
+
+
+def test_release_objects_dbhandler():
+	class SyncDBHandler(FakeDBHandler):
+		ul4on_release_threshold = 4
+		syncs = 0
+
+		def _reinitialize_livingapi_db(self, cursor, globals):
+			self.syncs += 1
+
+	handler = SyncDBHandler(connection=FakeConnection())
+	decoder = handler.ul4on_decoder
+	records = [la.Record(id=f"r{i}") for i in range(6)]
+	decoder._objects.extend(records)
+
+	# The slots will only be cleared when the threshold is reached
+	handler.release_objects(None, records[3:5])
+	assert handler.syncs == 0
+	assert decoder._objects == records
+	handler.release_objects(None, records[5:])
+	assert handler.syncs == 0
+	handler.release_objects(None, records[:1])
+	assert handler.syncs == 1
+	assert decoder._objects == [None, *records[1:3]]
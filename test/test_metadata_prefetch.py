@@ -0,0 +1,45 @@
+"""
+Tests for :meth:`ll.la.Globals.prefetch` and :meth:`ll.la.App.prefetch`.
+
+These tests use a fake database connection, so they don't require a database.
+"""
+
+from conftest import *
+
+
+def make_app():
+	app = make_fake_app(ide_id="user")
+	# Pretend that there are no app groups
+	app.globals._groups = la.attrdict()
+	return app
+
+
+def test_app_prefetch():
+	app = make_app()
+	queries = app.globals.handler.db.queries
+
+	app.prefetch("menus", "panels", "views")
+	assert len(queries) == 1
+	assert app.menus == ["dump0"]
+	assert app.panels == ["dump1"]
+	assert app.views == ["dump2"]
+
+	# Metadata that has been fetched already will not be fetched again
+	app.prefetch("menus", "panels", "views")
+	assert len(queries) == 1
+
+
+def test_globals_prefetch():
+	app = make_app()
+	globals = app.globals
+	app2 = la.App(id="app2", name="App 2")
+	app2.globals = globals
+	group = la.AppGroup(id="group", name="Group")
+	group.globals = globals
+	group._apps = la.attrdict(app2=app2)
+	globals._groups = la.attrdict(group=group)
+
+	globals.prefetch("menus", "panels")
+	assert len(globals.handler.db.queries) == 1
+	assert app.menus == ["dump0"]
+	assert app2.panels == ["dump3"]
@@ -0,0 +1,52 @@
+"""
+Tests for saving parameters via :meth:`ll.la.DBHandler.save_parameter`.
+
+These tests use a fake database connection, so they don't require a database.
+"""
+
+from conftest import *
+
+
+class ParameterCursor(FakeCursor):
+	def execute(self, query, **kwargs):
+		super().execute(query, **kwargs)
+		# The database assigns ids to new parameters
+		for (key, value) in kwargs.items():
+			if re.fullmatch(r"id\d+", key) and value.value is None:
+				value.value = f"new_{key}"
+
+
+class ParameterConnection(FakeConnection):
+	def cursor(self, readlobs=False):
+		return ParameterCursor(self)
+
+
+def test_save_parameter_bulk():
+	app = make_fake_app(la.DBHandler(connection=ParameterConnection()))
+	handler = app.globals.handler
+	Type = la.AppParameter.Type
+
+	root = la.MutableAppParameter(owner=app, type=Type.DICT, identifier="root")
+	name = la.MutableAppParameter(owner=app, parent=root, type=Type.STRING, identifier="name", value="foo")
+	items = la.MutableAppParameter(owner=app, parent=root, type=Type.LIST, identifier="items")
+	item = la.MutableAppParameter(owner=app, parent=items, type=Type.INT, order=10, value=42)
+	root.__dict__["value"] = dict(name=name, items=items)
+	items.__dict__["value"] = [item]
+
+	handler.save_parameter(root, bulk=True)
+
+	# A new tree is saved with one call
+	(query,) = handler.db.queries
+	assert query.count("appparameter_pkg.appparameter_save_la(") == 4
+	assert query.count("p_ap_id_super => v_ids(1)") == 2
+	assert query.count("p_ap_id_super => v_ids(3)") == 1
+	assert [root.id, name.id, items.id, item.id] == ["new_id1", "new_id2", "new_id3", "new_id4"]
+	assert not any(p._new or p._dirty for p in (root, name, items, item))
+
+	# Only changed parameters will be saved, their parent is passed as a bind variable
+	item.value = 43
+	handler.save_parameter(root, bulk=True)
+	query = handler.db.queries[-1]
+	assert query.count("appparameter_pkg.appparameter_save_la(") == 1
+	assert "p_ap_id_super => :p1_ap_id_super" in query
+	assert item.id == "new_id4"
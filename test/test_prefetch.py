@@ -0,0 +1,118 @@
+"""
+Tests for prefetching record pages via :meth:`ll.la.DBHandler.prefetch_records`.
+
+These tests use fake handlers and connections, so they don't require a
+database.
+"""
+
+import threading
+
+from conftest import *
+
+
+class PrefetchDBHandler(FakeDBHandler):
+	calls = []
+
+	def fetch_records(self, app, filter, sort, offset=0, limit=None, total=False):
+		# Return new objects for the app and records, like a separate UL4ON
+		# decoder would
+		self.calls.append((threading.current_thread().name, offset, limit))
+		app = la.App(id=app.id, name=app.name)
+		records = {}
+		for i in range(offset, offset + limit):
+			record = la.Record(id=f"r{i}", app=app)
+			record.values = {}
+			records[record.id] = record
+		return (records, 25) if total else records
+
+
+def make_app():
+	pool = la.DBHandlerPool(connect=FakeConnection, handlerclass=PrefetchDBHandler)
+	app = make_fake_app(prefetch_pool=pool)
+	app.globals.handler.ul4on_decoder.store_persistent_object(app)
+	return (app.globals.handler, app)
+
+
+def test_prefetch_next_page():
+	PrefetchDBHandler.calls = []
+	(handler, app) = make_app()
+
+	assert handler.prefetch_records(app, ["True"], [], 0, 10)
+	page = app.fetch_recordpage("True", offset=0, limit=10, prefetch="next")
+	assert len(page.records) == 10
+	assert handler.page_cache_stats.hits == 1
+
+	page = app.fetch_recordpage("True", offset=10, limit=10, fetch_total=True)
+	records = page.records
+	assert handler.page_cache_stats.hits == 2
+	assert page.total == 25
+	assert records["r10"].app is app
+	assert handler.ul4on_decoder.persistent_object(la.Record.ul4onname, "r10") is records["r10"]
+	assert all(name.startswith("la-prefetch") for (name, offset, limit) in PrefetchDBHandler.calls)
+
+
+def test_prefetch_existing_record():
+	(handler, app) = make_app()
+	record = la.Record(id="r0", app=app)
+	handler.ul4on_decoder.store_persistent_object(record)
+
+	handler.prefetch_records(app, ["True"], [], 0, 10)
+	assert app.fetch_records("True", offset=0, limit=10)["r0"] is record
+
+
+def test_prefetch_invalidate():
+	(handler, app) = make_app()
+
+	handler.prefetch_records(app, ["True"], [], 0, 10)
+	handler._records_changed(app)
+	assert not handler._page_cache
+	assert handler.page_cache_stats.invalidations == 1
+
+	# Uncommitted changes wouldn't be visible to the prefetch connection
+	assert not handler.prefetch_records(app, ["True"], [], 0, 10)
+	handler._uncommitted_apps.clear()
+	assert handler.prefetch_records(app, ["True"], [], 0, 10)
+
+
+def test_prefetch_executeaction():
+	(handler, app) = make_app()
+	handler.proc_dataaction_execute = lambda c, **kwargs: la.attrdict(p_errormessage=None)
+	record = la.Record(id="r0", app=app)
+
+	handler.prefetch_records(app, ["True"], [], 0, 10)
+	handler._executeaction(record, "action")
+	assert not handler._page_cache
+	assert app.id in handler._uncommitted_apps
+
+
+def test_prefetch_adopt_nested():
+	(handler, app) = make_app()
+	archive = la.File(id="f1")
+	handler.ul4on_decoder.store_persistent_object(archive)
+
+	# A new file, that references a copy of a file we already know
+	file = la.File(id="f2")
+	file.archive = la.File(id="f1")
+	assert handler._adopt_ul4on_object(file, {}) is file
+	assert file.archive is archive
+	assert handler.ul4on_decoder.persistent_object(la.File.ul4onname, "f2") is file
+
+
+def test_prefetch_timeout():
+	(handler, app) = make_app()
+	handler.page_cache_timeout = 0.01
+	release = threading.Event()
+
+	def blocked(*args):
+		# Simulate waiting for a connection from an exhausted pool
+		release.wait(10)
+		raise RuntimeError("pool exhausted")
+
+	handler._prefetch_records = blocked
+	handler.prefetch_records(app, ["True"], [], 0, 10)
+	try:
+		assert handler._page_cache_pop(app, ["True"], [], 0, 10) is None
+	finally:
+		release.set()
+	assert handler.page_cache_stats.timeouts == 1
+	assert handler.page_cache_stats.hits == 0
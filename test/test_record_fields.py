@@ -0,0 +1,86 @@
+"""
+Tests for :class:`ll.la.Record` objects whose :class:`ll.la.Field` objects
+are created lazily.
+
+These tests don't require a database.
+"""
+
+import datetime
+
+from conftest import *
+
+
+def make_record(**values):
+	app = make_fake_app(controls=make_fake_controls())
+	record = la.Record(id="r", app=app)
+	# This is what loading the record from an UL4ON dump does
+	record._values_ul4onset(la.attrdict(values))
+	record._new = False
+	return record
+
+
+def test_values_before_fields():
+	record = make_record(lookup="a", multi=["b", "c"], date=datetime.datetime(2024, 3, 4, 12, 30), int=42)
+
+	values = record.values
+	for identifier in ("lookup", "multi", "date", "int"):
+		assert values[identifier] == record.fields[identifier].value
+	assert values.lookup is record.app.controls.lookup.lookupdata.a
+	assert [item.key for item in values.multi] == ["b", "c"]
+	assert values.date == datetime.date(2024, 3, 4)
+
+
+def test_values_missing():
+	record = make_record()
+
+	assert record.values.lookup is None
+	assert record.values.multi == []
+	assert record.values.date is None
+	assert record.v_multi == []
+
+
+def test_values_partially_materialized():
+	record = make_record(lookup="a", multi=["b"], date=datetime.datetime(2024, 3, 4, 12, 30))
+
+	assert record.fields.lookup.value is record.app.controls.lookup.lookupdata.a
+	assert record.values.multi == record.fields.multi.value
+	assert record.values.date == datetime.date(2024, 3, 4)
+
+	dump = record._values_ul4onget()
+	assert dump["lookup"] is record.values.lookup
+	assert dump["multi"] == record.values.multi
+	# Fields that haven't been created are dumped as they have been loaded
+	assert dump["date"] == datetime.datetime(2024, 3, 4, 12, 30)
+	assert "int" not in dump
+
+
+def test_values_dont_materialize():
+	record = make_record(lookup="a", multi=["b", "c"], date=datetime.datetime(2024, 3, 4, 12, 30), int=42)
+
+	assert record.values.int == 42
+	assert record.values.multi == [record.app.controls.multi.lookupdata.b, record.app.controls.multi.lookupdata.c]
+	for identifier in ("lookup", "multi", "date", "int"):
+		assert not record.fields.is_materialized(identifier)
+
+
+def test_values_unconvertible():
+	# Values that can't be converted without a field create the field
+	record = make_record(lookup="x", int="42")
+
+	assert record.values.lookup is None
+	assert record.values.int == 42
+	assert record.fields.is_materialized("lookup")
+	assert record.fields.is_materialized("int")
+	assert not record.fields.is_materialized("date")
+	assert record.fields.lookup.has_errors()
+
+
+def test_values_dump_partially_materialized():
+	record = make_record(lookup="a", multi=["b"], int=42)
+
+	record.fields.int.value = None
+	record.fields.date.value = datetime.date(2024, 3, 4)
+	dump = record._values_ul4onget()
+	assert dump == {"lookup": "a", "multi": ["b"], "date": datetime.date(2024, 3, 4)}
+	assert not record.fields.is_materialized("lookup")
+	assert not record.fields.is_materialized("multi")
@@ -0,0 +1,101 @@
+"""
+Tests for :class:`ll.la.RecordBatch`.
+
+These tests use a fake handler, so they don't require a database.
+"""
+
+import array, datetime
+
+from conftest import *
+
+
+def values(i):
+	return dict(
+		lookup="a" if i % 2 else None,
+		multi=["b", "c"] if i % 3 else None,
+		date=datetime.datetime(2024, 3, i + 1, 12, 30),
+		int=i,
+	)
+
+
+def make_app(count=5):
+	handler = FakeRecordHandler(count, values)
+	app = make_fake_app(handler, controls=make_fake_controls())
+	handler.ul4on_decoder._objects.append(app)
+	handler.ul4on_decoder.store_persistent_object(app)
+	return app
+
+
+def test_columns():
+	app = make_app()
+	batch = app.fetch_records("True", batch=True)
+
+	assert len(batch) == 5
+	assert batch.ids == ["r000", "r001", "r002", "r003", "r004"]
+	lookupitem = app.controls.lookup.lookupdata.a
+	assert batch.column("lookup") == [None, lookupitem, None, lookupitem, None]
+	assert batch.column("multi")[:2] == [[], list(app.controls.multi.lookupdata.values())]
+	assert batch.column("date")[0] == datetime.date(2024, 3, 1)
+	column = batch.column("int")
+	assert isinstance(column, array.array)
+	assert list(column) == [0, 1, 2, 3, 4]
+
+
+def test_registry():
+	app = make_app()
+	decoder = app.globals.handler.ul4on_decoder
+
+	batch = app.fetch_records("True", batch=True)
+	# The records that have been used for creating the batch have been released
+	assert decoder._objects == [app]
+	assert decoder.persistent_object(la.Record.ul4onname, "r001") is None
+
+	record = batch[1]
+	assert batch[1] is record
+	assert decoder.persistent_object(la.Record.ul4onname, "r001") is record
+	for identifier in app.controls:
+		assert record.values[identifier] == record.fields[identifier].value == batch.column(identifier)[1]
+
+	# Records that are in the registry are reused
+	existing = la.Record(id="r002", app=app)
+	decoder.store_persistent_object(existing)
+	assert batch[2] is existing
+
+
+def test_registry_known_record():
+	app = make_app()
+	decoder = app.globals.handler.ul4on_decoder
+	known = la.Record(id="r003", app=app)
+	decoder._objects.append(known)
+	decoder.store_persistent_object(known)
+
+	batch = app.fetch_records("True", batch=True)
+	# Records that have been in the registry before the fetch are kept
+	assert decoder._objects == [app, known]
+	assert decoder.persistent_object(la.Record.ul4onname, "r003") is known
+	assert batch[3] is known
+
+
+def test_take():
+	app = make_app()
+	batch = app.fetch_records("True", batch=True)
+
+	big = batch.where(v > 2 for v in batch.column("int"))
+	assert big.ids == ["r003", "r004"]
+	assert isinstance(big.column("int"), array.array)
+	assert [record.id for record in batch[1:3]] == ["r001", "r002"]
+	assert list(batch.records()) == batch.ids
+
+
+def test_fields_not_materialized():
+	app = make_app()
+	records = app.globals.handler.fetch_records(app, ["True"], [])
+
+	batch = la.RecordBatch.from_records(records.values())
+	assert batch.column("multi")[1] == list(app.controls.multi.lookupdata.values())
+	# Building the columns doesn't create any :class:`Field` objects (or
+	# :attr:`Record.values` dictionaries)
+	for record in records.values():
+		assert record.__dict__["values"] is None
+		for identifier in app.controls:
+			assert not record.fields.is_materialized(identifier)
@@ -0,0 +1,108 @@
+"""
+Tests for :meth:`ll.la.DBHandler.records_sync_data`.
+
+These tests use a fake database connection, so they don't require a database.
+"""
+
+from conftest import *
+
+
+class SyncCursor(FakeCursor):
+	def fetchone(self):
+		# Return the ids of the last chunk, :meth:`SyncDBHandler._loaddump` will
+		# turn them into records
+		return (ul4on.dumps(list(self.connection.chunks[-1])).encode("utf-8"),)
+
+
+class SyncConnection(FakeConnection):
+	"""
+	A fake database connection that records the ids passed to each call of
+	``records_sync_ful4on()`` in :attr:`chunks`.
+	"""
+
+	def __init__(self):
+		super().__init__()
+		self.chunks = []
+
+	def cursor(self, readlobs=False):
+		return SyncCursor(self)
+
+	def gettype(self, name):
+		return self.varchars
+
+	def varchars(self, ids):
+		ids = FakeCollection(ids)
+		self.chunks.append(ids)
+		return ids
+
+
+class SyncDBHandler(la.DBHandler):
+	def _loaddump(self, dump):
+		# "Load" the records like loading the dump returned by
+		# ``records_sync_ful4on()`` would, i.e. reuse records that are already known
+		decoder = self.ul4on_decoder
+		records = la.attrdict()
+		for id in ul4on.loads(dump):
+			record = decoder.persistent_object(la.Record.ul4onname, id)
+			if record is None:
+				record = la.Record(id=id, app=None)
+				decoder.store_persistent_object(record)
+			records[id] = record
+		return records
+
+
+def make_handler(*ids):
+	"""
+	Return a handler that fetches two records per database call and already
+	knows the records ``ids``.
+	"""
+	handler = SyncDBHandler(connection=SyncConnection())
+	handler.records_sync_chunksize = 2
+	for id in ids:
+		handler.ul4on_decoder.store_persistent_object(la.Record(id=id, app=None))
+	return handler
+
+
+def test_records_sync_data():
+	handler = make_handler("r1", "r3")
+	r1 = handler.ul4on_decoder.persistent_object(la.Record.ul4onname, "r1")
+	r3 = handler.ul4on_decoder.persistent_object(la.Record.ul4onname, "r3")
+
+	records = handler.records_sync_data(["r1", "r2", "r3", "r4", "r5", "r2", "r6"])
+
+	# Only the missing ids are fetched (without duplicates and in chunks)
+	assert handler.db.chunks == [["r2", "r4"], ["r5", "r6"]]
+	assert len(handler.db.queries) == 2
+	assert handler.records_sync_stats == {"hits": 2, "misses": 4, "calls": 2}
+
+	# Cached and fetched records are merged
+	assert sorted(records) == ["r1", "r2", "r3", "r4", "r5", "r6"]
+	assert records.r1 is r1
+	assert records.r3 is r3
+	assert all(record.id == id for (id, record) in records.items())
+
+	# Now all records are known
+	assert handler.records_sync_data(["r2", "r6"]) == {"r2": records.r2, "r6": records.r6}
+	assert len(handler.db.queries) == 2
+	assert handler.records_sync_stats == {"hits": 4, "misses": 4, "calls": 2}
+
+
+def test_records_sync_data_force():
+	handler = make_handler("r1", "r3")
+	r1 = handler.ul4on_decoder.persistent_object(la.Record.ul4onname, "r1")
+
+	records = handler.records_sync_data(["r1", "r2", "r3"], force=True)
+
+	# Known records are fetched too
+	assert handler.db.chunks == [["r1", "r2"], ["r3"]]
+	assert handler.records_sync_stats == {"hits": 0, "misses": 3, "calls": 2}
+	assert sorted(records) == ["r1", "r2", "r3"]
+	assert records.r1 is r1
+
+
+def test_records_sync_data_empty():
+	handler = make_handler("r1")
+
+	assert handler.records_sync_data([]) == {}
+	assert handler.records_sync_data(["r1"]).r1.id == "r1"
+	assert handler.db.queries == []
@@ -0,0 +1,180 @@
+"""
+Tests for caching the results of :meth:`ll.la.DBHandler.count_records` and
+:meth:`ll.la.DBHandler.aggregate_records`.
+
+These tests use a fake database connection, so they don't require a database.
+"""
+
+import time
+
+import pytest
+
+from conftest import *
+
+
+class CacheVar(FakeVar):
+	"""
+	An output variable that reports no errors and no deleted records.
+	"""
+
+	def getvalue(self, pos=None):
+		return FakeCollection() if pos is None else None
+
+
+class CacheCursor(FakeCursor):
+	def var(self, type, *args, **kwargs):
+		return CacheVar(type)
+
+	def setinputsizes(self, **vars):
+		pass
+
+	def executemany(self, query, rows):
+		self.connection.queries.append(query)
+
+	def __iter__(self):
+		return iter(self.connection.rows)
+
+
+class CacheConnection(FakeConnection):
+	def __init__(self):
+		super().__init__(row=(42,))
+		self.rows = [(17, "foo")]
+
+	def cursor(self, readlobs=False):
+		return CacheCursor(self)
+
+
+def make_app(**kwargs):
+	app = make_fake_app(la.DBHandler(connection=CacheConnection(), **kwargs), controls=make_fake_controls())
+	app.basetable = "data"
+	return (app.globals.handler, app)
+
+
+def make_record(app):
+	record = la.Record(id="r1", app=app, updatecount=0)
+	record._new = False
+	record.fields.int.value = 1
+	return record
+
+
+@pytest.fixture()
+def now(monkeypatch):
+	"""
+	Let :func:`time.monotonic` return the first item of the returned list.
+	"""
+	now = [1000.0]
+	monkeypatch.setattr(time, "monotonic", lambda: now[0])
+	return now
+
+
+def test_uncached():
+	(handler, app) = make_app()
+
+	assert handler.count_records(app, []) == 42
+	assert handler.count_records(app, []) == 42
+	assert len(handler.db.queries) == 2
+	assert handler.result_cache_stats.misses == 0
+
+
+def test_count_records():
+	(handler, app) = make_app(result_cache_ttl=60)
+
+	assert handler.count_records(app, ["r.v_int > 1"]) == 42
+	assert handler.count_records(app, ["r.v_int > 1"]) == 42
+	assert len(handler.db.queries) == 1
+	assert handler.result_cache_stats.misses == 1
+	assert handler.result_cache_stats.hits == 1
+
+	# A different filter is a different query
+	handler.count_records(app, ["r.v_int > 2"])
+	assert len(handler.db.queries) == 2
+	assert handler.result_cache_stats.misses == 2
+
+
+def test_aggregate_records():
+	(handler, app) = make_app(result_cache_ttl=60)
+
+	result = handler.aggregate_records(app, [], ["count()", "group(r.v_lookup)"])
+	assert result == [[17, "foo"]]
+	# Modifying the result doesn't modify the cached result
+	result[0].append("bar")
+	assert handler.aggregate_records(app, [], ["count()", "group(r.v_lookup)"]) == [[17, "foo"]]
+	assert len(handler.db.queries) == 1
+	assert handler.result_cache_stats.hits == 1
+
+
+def test_ttl(now):
+	(handler, app) = make_app(result_cache_ttl=60)
+
+	handler.count_records(app, [])
+	now[0] += 59
+	handler.count_records(app, [])
+	assert len(handler.db.queries) == 1
+	assert handler.result_cache_stats.expirations == 0
+
+	now[0] += 2
+	handler.count_records(app, [])
+	assert len(handler.db.queries) == 2
+	assert handler.result_cache_stats.expirations == 1
+	assert handler.result_cache_stats.misses == 2
+	assert handler.result_cache_stats.hits == 1
+
+
+def test_size():
+	(handler, app) = make_app(result_cache_ttl=60, result_cache_size=2)
+
+	handler.count_records(app, ["r.v_int > 1"])
+	handler.count_records(app, ["r.v_int > 2"])
+	# This makes ``r.v_int > 2`` the least recently used entry
+	handler.count_records(app, ["r.v_int > 1"])
+	handler.count_records(app, ["r.v_int > 3"])
+	assert handler.result_cache_stats.evictions == 1
+	assert len(handler.db.queries) == 3
+
+	handler.count_records(app, ["r.v_int > 1"])
+	assert len(handler.db.queries) == 3
+	handler.count_records(app, ["r.v_int > 2"])
+	assert len(handler.db.queries) == 4
+	assert handler.result_cache_stats.evictions == 2
+
+
+def save_record(handler, app):
+	handler.proc_data_update = lambda c, **args: la.attrdict(p_errormessage=None, p_dat_id=args["p_dat_id"])
+	assert handler.save_record(make_record(app))
+
+
+def save_records(handler, app):
+	assert handler.save_records([make_record(app)]) == [True]
+
+
+def delete_record(handler, app):
+	handler.proc_data_delete = lambda c, **args: la.attrdict(p_errormessage=None)
+	handler.delete_record(make_record(app))
+
+
+def delete_records(handler, app):
+	handler.delete_records(app, ["r.v_int > 1"])
+
+
+@pytest.mark.parametrize("change", [save_record, save_records, delete_record, delete_records])
+def test_invalidation(change):
+	(handler, app) = make_app(result_cache_ttl=60)
+	other = la.App(id="other", name="Other")
+	other.globals = app.globals
+	other.controls = {}
+
+	handler.count_records(app, [])
+	handler.aggregate_records(app, [], ["count()"])
+	handler.count_records(other, [])
+	assert handler.result_cache_stats.misses == 3
+
+	change(handler, app)
+	assert handler.result_cache_stats.invalidations == 2
+
+	# The results for the app have to be fetched again ...
+	handler.count_records(app, [])
+	handler.aggregate_records(app, [], ["count()"])
+	assert handler.result_cache_stats.misses == 5
+	# ... but the result for the other app is still cached
+	handler.count_records(other, [])
+	assert handler.result_cache_stats.hits == 1
@@ -0,0 +1,152 @@
+"""
+Tests for saving many records at once via :meth:`ll.la.App.save_records`.
+
+These tests use a fake database connection and a fake HTTP session, so they
+don't require a database or a LivingApps server.
+"""
+
+import json
+
+from ll import orasql
+
+from conftest import *
+
+
+class ArrayVar(FakeVar):
+	def __init__(self, type, arraysize):
+		super().__init__(type)
+		self.value = [None] * arraysize
+
+	def getvalue(self, pos=0):
+		return self.value[pos]
+
+	def setvalue(self, pos, value):
+		self.value[pos] = value
+
+
+class SaveCursor(FakeCursor):
+	def var(self, type, size=None, arraysize=None):
+		return ArrayVar(type, arraysize) if arraysize is not None else FakeVar(type)
+
+	def setinputsizes(self, **vars):
+		self.outvars = vars
+
+	def executemany(self, query, rows):
+		self.connection.queries.append(query)
+		self.connection.rows.extend(rows)
+		# ``connection.results`` maps record ids to the output variables for the row
+		for (i, row) in enumerate(rows):
+			for (name, value) in self.connection.results.get(row["p_dat_id"], {}).items():
+				self.outvars[name].setvalue(i, value)
+
+
+class SaveConnection(FakeConnection):
+	def __init__(self, results):
+		super().__init__()
+		self.results = results
+		self.rows = []
+
+	def cursor(self, readlobs=False):
+		return SaveCursor(self)
+
+
+class FakeError:
+	def __init__(self, code, message):
+		self.code = code
+		self.message = message
+
+
+def make_records(handler, count=4):
+	app = make_fake_app(handler, controls=make_fake_controls())
+	app.basetable = "data"
+	records = []
+	for i in range(count):
+		record = la.Record(id=f"r{i}", app=app, updatecount=0)
+		record._new = False
+		record.fields.int.value = i
+		records.append(record)
+	return (app, records)
+
+
+def test_save_records_db():
+	handler = la.DBHandler(connection=SaveConnection({
+		"r1": {"errorcode": -20010, "errortext": "ORA-20010: \x01c_4\x01too big\x01\x01broken\x01\nORA-06512: at line 5"},
+		"r2": {"p_errormessage": "not allowed"},
+	}))
+	(app, records) = make_records(handler, 3)
+
+	assert app.save_records(records, force=True) == [True, False, False]
+
+	# All records are saved with one call that only passes the changed field
+	(query,) = handler.db.queries
+	assert "livingapi_pkg.data_update(" in query
+	assert [row["p_c_4"] for row in handler.db.rows] == [0, 1, 2]
+	assert [row["p_c_4_changed"] for row in handler.db.rows] == [1, 1, 1]
+	assert "p_c_1" not in handler.db.rows[0]
+
+	assert not records[0].fields.int.is_dirty()
+	assert records[0].updatecount == 1
+	# Errors are assigned to the record and fields like for a single save
+	assert records[1].fields.int.errors == ["too big"]
+	assert records[1].errors == ["broken"]
+	assert records[1].fields.int.is_dirty()
+	assert records[2].errors == ["not allowed"]
+
+
+def test_save_records_db_unexpected():
+	handler = la.DBHandler(connection=SaveConnection({
+		"r1": {"errorcode": -1, "errortext": "ORA-00001: unique constraint violated"},
+	}))
+	(app, records) = make_records(handler, 3)
+	error = orasql.DatabaseError(FakeError(1, "ORA-00001: unique constraint violated"))
+	saved = []
+
+	def proc(c, **args):
+		saved.append(args["p_dat_id"])
+		raise error
+
+	handler.proc_data_update = proc
+
+	# The record is saved again on its own, so we get the same exception as for a single save
+	with pytest.raises(orasql.DatabaseError) as excinfo:
+		app.save_records(records, force=True)
+	assert excinfo.value is error
+	assert saved == ["r1"]
+	# The other records have been saved
+	assert not records[0].fields.int.is_dirty()
+	assert not records[2].fields.int.is_dirty()
+
+
+class FakeResponse:
+	def __init__(self, status_code, data):
+		self.status_code = status_code
+		self.text = json.dumps(data)
+
+
+class FakeSession:
+	def __init__(self, response):
+		self.response = response
+		self.posts = []
+
+	def post(self, url, **kwargs):
+		self.posts.append((url, json.loads(kwargs["data"])))
+		return self.response
+
+
+def test_save_records_http():
+	handler = la.HTTPHandler("https://example.org")
+	handler.session = FakeSession(FakeResponse(422, {"data": [
+		{"status": "ok"},
+		{"status": "error", "fielderrors": {"int": ["too big"]}},
+		{"status": "error", "globalerrors": ["broken"]},
+	]}))
+	(app, records) = make_records(handler, 3)
+
+	assert app.save_records(records, force=True) == [True, False, False]
+
+	(url, data) = handler.session.posts[0]
+	assert url == "https://example.org/gateway/v1/appdd/app.json"
+	assert data["appdd"]["data"] == [{"id": f"r{i}", "fields": {"int": i}} for i in range(3)]
+	assert records[0].updatecount == 1
+	assert records[1].fields.int.errors == ["too big"]
+	assert records[2].errors == ["broken"]
@@ -0,0 +1,67 @@
+"""
+Tests for :meth:`ll.la.Handler.trace`.
+
+These tests use a fake database connection, so they don't require a database.
+"""
+
+from conftest import *
+
+
+class Exporter:
+	def __init__(self):
+		self.exported = []
+
+	def export(self, call):
+		self.exported.append(call)
+
+
+def test_trace():
+	app = make_fake_app(result_cache_ttl=60)
+	handler = app.globals.handler
+	handler.db.row = (42,)
+	exporter = Exporter()
+
+	with handler.trace(exporter) as t:
+		assert app.count_records("True") == 42
+		assert app.count_records("True") == 42
+
+	assert [call.name for call in t.calls] == ["count_records", "count_records"]
+	assert [call.cache for call in t.calls] == ["miss", "hit"]
+	assert len(t.calls[0].sql) == 1
+	assert "count(*)" in t.calls[0].sql[0]
+	assert t.calls[1].sql == []
+	assert all(call.elapsed >= 0 for call in t.calls)
+	assert exporter.exported == t.calls
+
+	summary = t.summary()["count_records"]
+	assert summary.calls == 2
+	assert summary.hits == 1
+	assert summary.misses == 1
+
+	# Calls after the ``with`` block will not be recorded
+	app.count_records("False")
+	assert len(t.calls) == 2
+
+
+class RecordsCursor(FakeCursor):
+	def execute(self, query, **kwargs):
+		super().execute(query, **kwargs)
+		# Return an empty dict of records
+		kwargs["dump"].value = self.connection.lob = FakeLOB(ul4on.dumps({}).encode("utf-8"))
+
+
+class RecordsConnection(FakeConnection):
+	def cursor(self, readlobs=False):
+		return RecordsCursor(self)
+
+
+def test_trace_dumpsize():
+	db = RecordsConnection()
+	app = make_fake_app(la.DBHandler(connection=db))
+	handler = app.globals.handler
+
+	with handler.trace() as t:
+		assert app.fetch_records("True") == {}
+	# The size is only fetched once (for reading the dump)
+	assert db.lob.sizecalls == 1
+	assert t.calls[0].dumpsize == len(db.lob.data)
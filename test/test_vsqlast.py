@@ -0,0 +1,103 @@
+"""
+Tests for flattening vSQL ASTs via :meth:`ll.la.DBHandler._flatten_vsql_ast`.
+
+These tests use a fake database connection, so they don't require a database.
+"""
+
+import pytest
+
+from ll import vsql
+
+from conftest import *
+
+
+def recursive_nodes(vsqlexpr, required_datatype=None):
+	"""
+	Return the nodes that the old recursive implementation of
+	:meth:`ll.la.DBHandler._save_vsql_ast` saved (in the order it saved them and
+	with the index of the parent node instead of its id).
+	"""
+	nodes = []
+
+	def save(vsqlexpr, required_datatype, vs_id_super, vs_order, root, pos):
+		source = vsqlexpr.source()
+		finalpos = pos + len(source)
+
+		datatype = vsqlexpr.datatype
+		error = vsqlexpr.error
+		if root:
+			if datatype is not None:
+				error = vsql.DataType.compatible_to(datatype, required_datatype)
+				if error is not None:
+					datatype = None
+		vs_id = len(nodes)
+		nodes.append(dict(
+			super=vs_id_super,
+			order=vs_order,
+			nodetype=vsqlexpr.nodetype.value,
+			value=vsqlexpr.nodevalue,
+			datatype=datatype.value if datatype is not None else None,
+			erroridentifier=error.value if error is not None else None,
+			start=pos,
+			stop=finalpos,
+		))
+		if not isinstance(vsqlexpr, vsql.FieldRefAST):
+			order = 10
+			for child in vsqlexpr.content:
+				if isinstance(child, str):
+					pos += len(child)
+				else:
+					pos = save(child, None, vs_id, order, False, pos)
+					order += 10
+		return finalpos
+
+	save(vsqlexpr, required_datatype, None, None, True, 0)
+	return nodes
+
+
+def compile(source):
+	app = make_fake_app(controls=make_fake_controls())
+	return vsql.AST.fromsource(source, r=app.vsqlfield_records("r", "g.tpl_id_app"))
+
+
+@pytest.mark.parametrize("source, datatype", [
+	("r.v_int + len(r.v_lookup.key) * 2 > 1 and (r.v_date is None or not r.v_int)", vsql.DataType.BOOL),
+	("[r.v_int, r.v_int * (1 + 2)][0]", vsql.DataType.INT),
+	("r.v_int", vsql.DataType.STR), # Incompatible datatype
+	("r.v_nope", None), # Unknown field
+])
+def test_flatten_vsql_ast(source, datatype):
+	handler = la.DBHandler(connection=FakeConnection())
+	vsqlexpr = compile(source)
+
+	nodes = handler._flatten_vsql_ast(vsqlexpr, datatype)
+
+	assert nodes == recursive_nodes(vsqlexpr, datatype)
+
+
+def test_flatten_vsql_ast_structure():
+	handler = la.DBHandler(connection=FakeConnection())
+	source = "(r.v_int + 1) * len(r.v_lookup.key)"
+	vsqlexpr = compile(source)
+
+	nodes = handler._flatten_vsql_ast(vsqlexpr, vsql.DataType.INT)
+
+	# Each node covers its source and is preceded by its parent
+	for (i, node) in enumerate(nodes):
+		if i:
+			assert node["super"] < i
+		else:
+			assert node["super"] is None
+			assert node["order"] is None
+			assert (node["start"], node["stop"]) == (0, len(source))
+
+	# The children of a node are numbered 10, 20, ...
+	children = [node["order"] for node in nodes if node["super"] == 0]
+	assert children == [10, 20]
+
+	# Field references are stored as one node without children
+	fieldrefs = [i for (i, node) in enumerate(nodes) if node["nodetype"] == vsql.NodeType.FIELD.value]
+	assert fieldrefs
+	for i in fieldrefs:
+		assert not any(node["super"] == i for node in nodes)
+	assert [source[node["start"]:node["stop"]] for node in nodes if node["nodetype"] == vsql.NodeType.FIELD.value] == ["r.v_int", "r.v_lookup"]
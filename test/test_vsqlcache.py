@@ -0,0 +1,57 @@
+"""
+Tests for :class:`ll.la.VSQLCache`.
+
+These tests don't require a database.
+"""
+
+from conftest import *
+
+
+def test_compile_cached():
+	cache = la.VSQLCache()
+	app = make_fake_app(controls=make_fake_controls())
+	r = app.vsqlfield_records("r", "row")
+
+	ast = cache.compile("r.v_int > 1", r=r)
+	assert cache.compile("r.v_int > 1", r=r) is ast
+	assert cache.compile("r.v_int > 2", r=r) is not ast
+	assert cache.stats.hits == 1
+	assert cache.stats.misses == 2
+	assert len(cache) == 2
+
+
+def test_compile_evict():
+	cache = la.VSQLCache(maxsize=2)
+
+	ast = cache.compile("1")
+	cache.compile("2")
+	assert cache.compile("1") is ast
+	# This evicts ``"2"``, because ``"1"`` has been used more recently
+	cache.compile("3")
+	assert cache.stats.evictions == 1
+	assert cache.compile("1") is ast
+	assert cache.stats.misses == 3
+
+
+def test_controls_invalidate():
+	app = make_fake_app(controls=make_fake_controls())
+	other = make_fake_app(controls=make_fake_controls())
+	vsqlfield = app.vsqlfield_records("r", "row")
+	other_vsqlfield = other.vsqlfield_records("r", "row")
+
+	ast = la.vsqlcache.compile("r.v_int > 1", r=vsqlfield)
+	other_ast = la.vsqlcache.compile("r.v_int > 1", r=other_vsqlfield)
+	invalidations = la.vsqlcache.stats.invalidations
+
+	# Setting the controls drops the cached expressions for the app (but not
+	# for other apps) and creates a new vSQL group for the records
+	controls = make_fake_controls()
+	del controls["int"]
+	app.controls = controls
+	assert la.vsqlcache.stats.invalidations == invalidations + 1
+	assert app.vsqlgroup_records is not vsqlfield.refgroup
+	assert "v_int" not in app.vsqlgroup_records.fields
+	assert la.vsqlcache.compile("r.v_int > 1", r=other_vsqlfield) is other_ast
+
+	ast2 = la.vsqlcache.compile("r.v_date is None", r=app.vsqlfield_records("r", "row"))
+	assert ast2 is not ast